@@ -5,24 +5,136 @@ Fitur: Instagram, Guest Posting, Edit Posts, XPath Bot Login
 
 import os
 import json
+import atexit
 import sqlite3
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, session, redirect, url_for, stream_with_context
 from werkzeug.security import generate_password_hash, check_password_hash
 import secrets
 
 # Import custom modules
-from bot.social_bot import SocialMediaBot
+from bot.social_bot import SocialMediaBot, create_chrome_driver
+from bot.driver_pool import DriverPool
+from bot.selector_cache import SelectorCache
+from bot.session_store import SessionStore
+from bot.text_input import INPUT_MODES
 from services.openai_service import OpenAIService
-from database.db_manager import DatabaseManager
+from services.response_cache import ResponseCache
+from services.ai_executor import RequestExecutor
+from services.generation_backends import BackendRouter, LocalBackend, OpenAIBackend, OPERATIONS
+from services.job_queue import AutomationWorkerPool
+from services.scheduler import PublishScheduler
+from services.scraper import BatchScraper
+from services.http_cache import HttpCache
+from services.wordpress_ingester import WordPressIngester
+from database.db_manager import DatabaseManager, next_page_cursor
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', secrets.token_hex(32))
 
 # Initialize services
 db_manager = DatabaseManager()
-openai_service = OpenAIService()
-social_bot = SocialMediaBot()
+response_cache = ResponseCache(
+    db_manager,
+    max_entries=int(os.environ.get('AI_CACHE_MAX_ENTRIES', 1000)),
+    ttl_seconds=float(os.environ.get('AI_CACHE_TTL', 7 * 24 * 3600))
+)
+ai_executor = RequestExecutor(
+    max_in_flight=int(os.environ.get('AI_MAX_IN_FLIGHT', 8)),
+    requests_per_minute=int(os.environ.get('AI_REQUESTS_PER_MINUTE', 3500)),
+    tokens_per_minute=int(os.environ.get('AI_TOKENS_PER_MINUTE', 90000)),
+    max_retries=int(os.environ.get('AI_MAX_RETRIES', 5))
+)
+generation_router = BackendRouter([
+    OpenAIBackend(os.environ.get('OPENAI_API_KEY'), os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'), ai_executor),
+    LocalBackend(
+        base_url=os.environ.get('LOCAL_LLM_BASE_URL', ''),
+        model=os.environ.get('LOCAL_LLM_MODEL', 'local'),
+        api_key=os.environ.get('LOCAL_LLM_API_KEY', 'local'),
+        timeout=float(os.environ.get('LOCAL_LLM_TIMEOUT', 120))
+    )
+], db_manager=db_manager, default=os.environ.get('GENERATION_BACKEND', 'openai'))
+openai_service = OpenAIService(
+    response_cache=response_cache,
+    model=os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'),
+    executor=ai_executor,
+    db_manager=db_manager,
+    router=generation_router
+)
+driver_pool_size = int(os.environ.get('DRIVER_POOL_SIZE', 2))
+driver_pool = DriverPool(
+    create_chrome_driver,
+    max_size=driver_pool_size,
+    max_uses=int(os.environ.get('DRIVER_MAX_USES', 50)),
+    idle_timeout=float(os.environ.get('DRIVER_IDLE_TIMEOUT', 300))
+)
+text_input_mode = os.environ.get('TEXT_INPUT_MODE', 'auto')
+selector_cache = SelectorCache(db_manager)
+selector_mode = os.environ.get('SELECTOR_LOOKUP_MODE', 'union')
+session_store = SessionStore(db_manager)
+http_cache = HttpCache(db_manager)
+content_scraper = BatchScraper(
+    db_manager,
+    max_workers=int(os.environ.get('SCRAPER_WORKERS', 16)),
+    per_host=int(os.environ.get('SCRAPER_PER_HOST', 4)),
+    http_cache=http_cache,
+    parser=os.environ.get('SCRAPER_PARSER', 'auto'),
+    strained=os.environ.get('SCRAPER_STRAINER', 'true').lower() == 'true'
+)
+wordpress_ingester = WordPressIngester(db_manager, session=content_scraper.session)
+
+def create_social_bot() -> SocialMediaBot:
+    """SocialMediaBot yang berbagi driver pool, selector cache, dan session store
+    
+    Bot menyimpan driver/lease yang sedang dipakai, jadi setiap request dan worker membuat bot sendiri.
+    """
+    return SocialMediaBot(
+        driver_pool=driver_pool,
+        input_mode=text_input_mode,
+        selector_cache=selector_cache,
+        selector_mode=selector_mode,
+        session_store=session_store,
+        scraper=content_scraper
+    )
+
+publish_scheduler = PublishScheduler(db_manager)
+# Setiap worker butuh satu driver; worker di atas ukuran pool hanya menunggu lease sampai timeout
+automation_worker_count = int(os.environ.get('AUTOMATION_WORKERS', driver_pool_size))
+if automation_worker_count > driver_pool_size:
+    print(f"⚠️  AUTOMATION_WORKERS={automation_worker_count} exceeds DRIVER_POOL_SIZE={driver_pool_size}, "
+          f"using {driver_pool_size} workers")
+    automation_worker_count = driver_pool_size
+automation_workers = AutomationWorkerPool(
+    db_manager,
+    bot_factory=create_social_bot,
+    num_workers=automation_worker_count,
+    scheduler=publish_scheduler,
+    # Post per session (satu login); juga dibatasi burst platform di scheduler_platform_limits
+    batch_size=int(os.environ.get('AUTOMATION_BATCH_SIZE', 10)),
+    batch_tabs=int(os.environ.get('AUTOMATION_BATCH_TABS', 1))
+)
+atexit.register(driver_pool.shutdown)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_SCRAPE_URLS = int(os.environ.get('MAX_SCRAPE_URLS', 500))
+MAX_GENERATE_REQUESTS = int(os.environ.get('MAX_GENERATE_REQUESTS', 100))
+
+def get_page_args(default_limit: int = None):
+    """Ambil parameter pagination (limit, cursor) dari query string
+    
+    Tanpa ?limit semua baris dikembalikan seperti sebelumnya (halaman dan JS yang belum membaca
+    next_cursor); pagination dipakai jika client mengirim limit.
+    """
+    limit = request.args.get('limit', type=int) or default_limit
+    if limit:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return limit, request.args.get('cursor') or None
+
+@app.teardown_appcontext
+def release_db_connection(exception=None):
+    """Kembalikan koneksi database ke pool; thread request berikutnya tidak perlu membuka koneksi baru"""
+    db_manager.release_connection()
 
 # Routes
 @app.route('/')
@@ -39,8 +151,10 @@ def dashboard():
 @app.route('/accounts')
 def accounts():
     """Social media accounts management"""
-    accounts = db_manager.get_all_accounts()
-    return render_template('accounts.html', accounts=accounts)
+    limit, cursor = get_page_args()
+    accounts = db_manager.get_all_accounts(limit=limit, cursor=cursor)
+    return render_template('accounts.html', accounts=accounts,
+                           next_cursor=next_page_cursor(accounts, limit))
 
 @app.route('/guest-posting')
 def guest_posting():
@@ -51,14 +165,18 @@ def guest_posting():
 @app.route('/posts')
 def posts():
     """Posts management and editing"""
-    posts = db_manager.get_all_posts()
-    return render_template('posts.html', posts=posts)
+    limit, cursor = get_page_args()
+    posts = db_manager.get_all_posts(limit=limit, cursor=cursor)
+    return render_template('posts.html', posts=posts,
+                           next_cursor=next_page_cursor(posts, limit))
 
 @app.route('/content')
 def content():
     """Content management"""
-    content_list = db_manager.get_content()
-    return render_template('content.html', content=content_list)
+    limit, cursor = get_page_args()
+    content_list = db_manager.get_content(limit=limit, cursor=cursor)
+    return render_template('content.html', content=content_list,
+                           next_cursor=next_page_cursor(content_list, limit, sort_key='scraped_at'))
 
 @app.route('/automation')
 def automation():
@@ -68,7 +186,7 @@ def automation():
 @app.route('/settings')
 def settings():
     """Application settings"""
-    return render_template('settings.html')
+    return render_template('settings.html', generation=generation_router.get_config(), operations=OPERATIONS)
 
 # API Routes
 @app.route('/api/accounts', methods=['GET', 'POST'])
@@ -86,8 +204,9 @@ def api_accounts():
         )
         return jsonify(result)
     
-    accounts = db_manager.get_all_accounts()
-    return jsonify({'accounts': accounts})
+    limit, cursor = get_page_args()
+    accounts = db_manager.get_all_accounts(limit=limit, cursor=cursor)
+    return jsonify({'accounts': accounts, 'next_cursor': next_page_cursor(accounts, limit)})
 
 @app.route('/api/accounts/<int:account_id>', methods=['PUT', 'DELETE'])
 def api_account_detail(account_id):
@@ -108,7 +227,7 @@ def api_test_account(account_id):
     if not account:
         return jsonify({'success': False, 'message': 'Account not found'})
     
-    result = social_bot.test_login(account)
+    result = create_social_bot().test_login(account)
     return jsonify(result)
 
 @app.route('/api/guest-sites', methods=['GET', 'POST'])
@@ -116,6 +235,13 @@ def api_guest_sites():
     """API for guest posting sites"""
     if request.method == 'POST':
         data = request.json
+        input_mode = data.get('input_mode') or None
+        if input_mode is not None and input_mode not in INPUT_MODES:
+            return jsonify({
+                'success': False,
+                'message': f"Invalid input_mode, expected one of: {', '.join(INPUT_MODES)}"
+            })
+        
         result = db_manager.add_guest_site(
             name=data['name'],
             url=data['url'],
@@ -123,7 +249,8 @@ def api_guest_sites():
             username=data['username'],
             password=data['password'],
             post_url=data.get('post_url', ''),
-            notes=data.get('notes', '')
+            notes=data.get('notes', ''),
+            input_mode=input_mode
         )
         return jsonify(result)
     
@@ -137,7 +264,7 @@ def api_test_guest_site(site_id):
     if not site:
         return jsonify({'success': False, 'message': 'Site not found'})
     
-    result = social_bot.test_guest_login(site)
+    result = create_social_bot().test_guest_login(site)
     return jsonify(result)
 
 @app.route('/api/posts', methods=['GET', 'POST'])
@@ -151,7 +278,8 @@ def api_posts():
             content = openai_service.generate_post_content(
                 topic=data.get('topic', ''),
                 platform=data.get('platform', ''),
-                tone=data.get('tone', 'professional')
+                tone=data.get('tone', 'professional'),
+                use_cache=not data.get('fresh')
             )
             data['content'] = content
         
@@ -163,12 +291,81 @@ def api_posts():
             scheduled_time=data.get('scheduled_time'),
             image_path=data.get('image_path', ''),
             hashtags=data.get('hashtags', ''),
-            status='draft'
+            status='draft',
+            allow_duplicate=bool(data.get('allow_duplicate'))
         )
         return jsonify(result)
     
-    posts = db_manager.get_all_posts()
-    return jsonify({'posts': posts})
+    limit, cursor = get_page_args()
+    posts = db_manager.get_all_posts(limit=limit, cursor=cursor)
+    return jsonify({'posts': posts, 'next_cursor': next_page_cursor(posts, limit)})
+
+@app.route('/api/posts/bulk', methods=['POST', 'PUT'])
+def api_posts_bulk():
+    """Bulk create (POST) atau bulk update (PUT) posts dalam satu transaksi
+    
+    POST {post_ids, action, scheduled_at} dari modal Bulk Actions di halaman posts
+    menjalankan action tersebut untuk post yang dipilih.
+    """
+    data = request.json
+    if isinstance(data, dict) and 'action' in data:
+        return jsonify(run_posts_bulk_action(data))
+    
+    items = data if isinstance(data, list) else (data or {}).get('posts', [])
+    
+    if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+        return jsonify({'success': False, 'message': 'A non-empty list of posts is required'})
+    
+    if request.method == 'PUT':
+        result = db_manager.update_posts_bulk(items)
+        return jsonify(result)
+    
+    allow_duplicates = isinstance(data, dict) and bool(data.get('allow_duplicates'))
+    for item in items:
+        item.setdefault('status', 'draft')
+    result = db_manager.add_posts_bulk(items, allow_duplicates=allow_duplicates)
+    return jsonify(result)
+
+def run_posts_bulk_action(data: dict) -> dict:
+    """Jalankan action Bulk Actions (publish/schedule/delete/duplicate) untuk post_ids"""
+    post_ids = data.get('post_ids')
+    if not isinstance(post_ids, list) or not post_ids or not all(isinstance(post_id, int) for post_id in post_ids):
+        return {'success': False, 'message': 'A non-empty list of post_ids is required'}
+    
+    action = data.get('action')
+    if action == 'publish':
+        # Masuk antrian automation seperti tombol Start (post yang sudah di antrian dilewati)
+        posts = [db_manager.get_post(post_id) for post_id in post_ids]
+        post_ids = [post['id'] for post in posts if post and post['status'] != 'queued']
+        if post_ids:
+            result = db_manager.update_posts_bulk([{'id': post_id, 'status': 'pending'} for post_id in post_ids])
+            if not result['success']:
+                return result
+        automation_workers.start()
+        result = db_manager.create_automation_job(post_ids)
+        if result['success'] and result['job_id']:
+            automation_workers.notify()
+        return result
+    
+    if action == 'schedule':
+        if not data.get('scheduled_at'):
+            return {'success': False, 'message': 'scheduled_at is required for schedule'}
+        return db_manager.update_posts_bulk([
+            {'id': post_id, 'status': 'scheduled', 'scheduled_time': data['scheduled_at']}
+            for post_id in post_ids
+        ])
+    
+    if action == 'delete':
+        return db_manager.delete_posts_bulk(post_ids)
+    
+    if action == 'duplicate':
+        posts = [db_manager.get_post(post_id) for post_id in post_ids]
+        copies = [dict(post, status='draft') for post in posts if post]
+        if not copies:
+            return {'success': False, 'message': 'Posts not found'}
+        return db_manager.add_posts_bulk(copies, allow_duplicates=True)
+    
+    return {'success': False, 'message': f'Unknown bulk action: {action}'}
 
 @app.route('/api/posts/<int:post_id>', methods=['GET', 'PUT', 'DELETE'])
 def api_post_detail(post_id):
@@ -193,7 +390,7 @@ def api_publish_post(post_id):
     if not post:
         return jsonify({'success': False, 'message': 'Post not found'})
     
-    result = social_bot.publish_post(post)
+    result = create_social_bot().publish_post(post)
     
     # Update post status
     db_manager.update_post(post_id, {
@@ -204,72 +401,235 @@ def api_publish_post(post_id):
     
     return jsonify(result)
 
+@app.route('/api/content')
+def api_content():
+    """API for content library listing"""
+    limit, cursor = get_page_args()
+    content_list = db_manager.get_content(limit=limit, cursor=cursor)
+    return jsonify({
+        'content': content_list,
+        'next_cursor': next_page_cursor(content_list, limit, sort_key='scraped_at')
+    })
+
+@app.route('/api/content/search')
+def api_search_content():
+    """Full-text search di content library dan posts"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'success': False, 'message': 'Query parameter q is required'})
+    
+    limit, cursor = get_page_args(DEFAULT_PAGE_SIZE)
+    result = db_manager.search_content(query, limit=limit, cursor=cursor)
+    return jsonify(result)
+
 @app.route('/api/content/generate', methods=['POST'])
 def api_generate_content():
-    """Generate content using OpenAI"""
+    """Generate content using OpenAI (stream=true: token dikirim lewat Server-Sent Events)"""
     data = request.json
     
+    if data.get('stream'):
+        return stream_generated_content(data)
+    
     content = openai_service.generate_post_content(
         topic=data.get('topic', ''),
         platform=data.get('platform', ''),
         tone=data.get('tone', 'professional'),
-        length=data.get('length', 'medium')
+        length=data.get('length', 'medium'),
+        use_cache=not data.get('fresh')
     )
     
     return jsonify({'content': content})
 
+def sse_event(payload: dict, event: str = None) -> str:
+    prefix = f'event: {event}\n' if event else ''
+    return f'{prefix}data: {json.dumps(payload)}\n\n'
+
+def stream_generated_content(data: dict) -> Response:
+    """Event 'data' {delta} per potongan teks, lalu event 'done' {content} atau 'error' {message}"""
+    chunks = openai_service.stream_post_content(
+        topic=data.get('topic', ''),
+        platform=data.get('platform', ''),
+        tone=data.get('tone', 'professional'),
+        length=data.get('length', 'medium'),
+        use_cache=not data.get('fresh')
+    )
+    
+    def events():
+        parts = []
+        try:
+            for delta in chunks:
+                parts.append(delta)
+                yield sse_event({'delta': delta})
+        except Exception as e:
+            print(f"Error streaming generated content: {e}")
+            yield sse_event({'message': f'Content generation failed: {str(e)}'}, event='error')
+            return
+        yield sse_event({'content': ''.join(parts).strip()}, event='done')
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/content/generate/variants', methods=['POST'])
+def api_generate_variants():
+    """Generate content + hashtags untuk beberapa platform dalam satu request OpenAI"""
+    data = request.json or {}
+    platforms = data.get('platforms') or []
+    
+    if not isinstance(platforms, list) or not platforms:
+        return jsonify({'success': False, 'message': 'A non-empty list of platforms is required'})
+    
+    variants = openai_service.generate_variants(
+        topic=data.get('topic', ''),
+        platforms=platforms,
+        tone=data.get('tone', 'professional'),
+        length=data.get('length', 'medium'),
+        use_cache=not data.get('fresh')
+    )
+    
+    return jsonify({'success': True, 'variants': variants})
+
+@app.route('/api/content/generate/bulk', methods=['POST'])
+def api_generate_bulk():
+    """Banyak request generate sekaligus (concurrent), hasil sesuai urutan input"""
+    data = request.json
+    items = data if isinstance(data, list) else (data or {}).get('requests', [])
+    
+    if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+        return jsonify({'success': False, 'message': 'A non-empty list of requests is required'})
+    if len(items) > MAX_GENERATE_REQUESTS:
+        return jsonify({'success': False, 'message': f'At most {MAX_GENERATE_REQUESTS} requests per call'})
+    
+    results = openai_service.generate_many(items)
+    return jsonify({'success': True, 'results': results})
+
+@app.route('/api/content/generate/usage')
+def api_generate_usage():
+    """Token prompt/completion OpenAI per operasi (dibayar vs dilayani cache)"""
+    days = min(request.args.get('days', 30, type=int), 365)
+    return jsonify({'success': True, **db_manager.get_ai_usage_stats(days=days)})
+
+@app.route('/api/settings/generation', methods=['GET', 'POST'])
+def api_generation_settings():
+    """Backend generate (openai / local) default dan per operasi"""
+    if request.method == 'GET':
+        return jsonify({'success': True, **generation_router.get_config()})
+    
+    # Form settings (FormData) atau JSON
+    data = request.get_json(silent=True) or request.form.to_dict()
+    routes = data.get('routes')
+    if routes is None and any(f'route_{operation}' in data for operation in OPERATIONS):
+        routes = {operation: data.get(f'route_{operation}') for operation in OPERATIONS}
+    local = data.get('local')
+    if local is None and 'local_base_url' in data:
+        local = {'base_url': data.get('local_base_url', ''), 'model': data.get('local_model', '')}
+    
+    result = generation_router.configure(default=data.get('default_backend') or data.get('default'),
+                                         routes=routes, local=local)
+    return jsonify(result)
+
+@app.route('/api/test/generation', methods=['POST'])
+def api_test_generation():
+    """Test koneksi backend generate"""
+    data = request.get_json(silent=True) or {}
+    return jsonify(openai_service.test_connection(data.get('backend')))
+
 @app.route('/api/content/scrape', methods=['POST'])
 def api_scrape_content():
     """Scrape content from WordPress or other sources"""
     data = request.json
     url = data.get('url', '')
     
+    # Batch: daftar URL dan/atau sitemap, di-fetch concurrent lalu disimpan bulk
+    if data.get('urls') or data.get('sitemap_url'):
+        limit = min(int(data.get('limit') or MAX_SCRAPE_URLS), MAX_SCRAPE_URLS)
+        result = content_scraper.scrape(
+            urls=data.get('urls') or [],
+            sitemap_url=data.get('sitemap_url'),
+            limit=limit
+        )
+        return jsonify(result)
+    
     if not url:
         return jsonify({'success': False, 'message': 'URL is required'})
     
-    result = social_bot.scrape_content(url)
+    result = create_social_bot().scrape_content(url)
+    validators = result.pop('cache_validators', None)
     
-    if result['success']:
+    # Halaman tidak berubah sejak scrape terakhir: tidak perlu disimpan lagi
+    if result['success'] and not result.get('unchanged'):
         # Save scraped content to database
-        db_manager.add_content(
+        saved = db_manager.add_content(
             title=result['title'],
             content=result['content'],
             source_url=url,
             scraped_at=datetime.now().isoformat()
         )
+        if saved.get('duplicate'):
+            result['duplicate_of'] = saved['duplicate_of']
+        # Duplikat tetap menyimpan validator (kontennya sudah ada di DB); hanya insert gagal yang dilewati
+        if (saved['success'] or saved.get('duplicate')) and validators:
+            http_cache.store_validators(url, validators)
+    
+    return jsonify(result)
+
+@app.route('/api/content/wordpress/ingest', methods=['POST'])
+def api_ingest_wordpress():
+    """Ingest post WordPress lewat REST API (incremental sejak high-water mark)"""
+    data = request.json or {}
+    url = data.get('url', '')
+    
+    if not url:
+        return jsonify({'success': False, 'message': 'URL is required'})
     
+    result = wordpress_ingester.ingest(url, full=bool(data.get('full')))
     return jsonify(result)
 
+@app.route('/api/content/wordpress/sources')
+def api_wordpress_sources():
+    """Source WordPress yang sudah di-ingest beserta high-water mark"""
+    return jsonify({'success': True, 'sources': db_manager.get_content_sources()})
+
+@app.route('/api/content/duplicates')
+def api_content_duplicates():
+    """Laporan duplikat persis dan hampir duplikat di content library dan posts"""
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    return jsonify(db_manager.get_duplicate_report(limit=limit))
+
+@app.route('/api/content/scrape/cache')
+def api_scrape_cache_stats():
+    """Hit/miss HTTP cache scraper (304 / body tidak berubah)"""
+    return jsonify({'success': True, 'stats': http_cache.get_stats()})
+
 @app.route('/api/automation/start', methods=['POST'])
 def api_start_automation():
-    """Start automation process"""
-    data = request.json
+    """Start automation process (enqueue pending posts untuk worker)"""
+    automation_workers.start()
     
-    # Get pending posts
-    pending_posts = db_manager.get_posts_by_status('pending')
-    
-    results = []
-    for post in pending_posts:
-        result = social_bot.publish_post(post)
-        results.append({
-            'post_id': post['id'],
-            'success': result['success'],
-            'message': result['message']
-        })
-        
-        # Update post status
-        db_manager.update_post(post['id'], {
-            'status': 'published' if result['success'] else 'failed',
-            'published_at': datetime.now().isoformat() if result['success'] else None,
-            'error_message': result.get('message', '') if not result['success'] else ''
-        })
+    # Klaim posts pending secara atomik; request start yang bersamaan tidak meng-enqueue ulang
+    result = db_manager.create_automation_job()
+    if not result['success'] or not result['job_id']:
+        return jsonify(result)
+    
+    automation_workers.notify()
     
     return jsonify({
         'success': True,
-        'processed': len(results),
-        'results': results
+        'job_id': result['job_id'],
+        'queued': result['queued'],
+        'status_url': url_for('api_automation_job_status', job_id=result['job_id'])
     })
 
+@app.route('/api/automation/jobs/<int:job_id>')
+def api_automation_job_status(job_id):
+    """Progress automation job"""
+    job = db_manager.get_automation_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    
+    return jsonify({'success': True, 'job': job})
+
 @app.route('/api/dashboard/stats')
 def api_dashboard_stats():
     """Get dashboard statistics"""
@@ -282,7 +642,11 @@ def api_health():
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'version': '2.0.0'
+        'version': '2.0.0',
+        'driver_pool': driver_pool.get_stats(),
+        'http_cache': http_cache.get_stats(),
+        'ai_response_cache': response_cache.get_stats(),
+        'ai_executor': ai_executor.get_stats()
     })
 
 # Error handlers
@@ -303,6 +667,12 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('DEBUG', 'True').lower() == 'true'
     
+    # Lanjutkan task yang masih queued/leased dari proses sebelumnya.
+    # Dengan reloader (debug) hanya proses child yang menjalankan worker.
+    if (not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true') and db_manager.has_open_job_tasks():
+        print("🔁 Resuming queued automation tasks")
+        automation_workers.start()
+    
     print("🚀 Social Media Automation V2 Starting...")
     print(f"📱 Dashboard: http://{host}:{port}")
     print(f"🏥 Health Check: http://{host}:{port}/api/health")
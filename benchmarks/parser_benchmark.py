@@ -0,0 +1,123 @@
+"""
+Benchmark parser scraper
+Membandingkan extract_content cara lama (html.parser, seluruh dokumen di-parse) dengan cara baru
+(lxml + ContentStrainer): waktu parse per halaman, peak memory (tracemalloc) per halaman dan apakah
+title/content yang dihasilkan sama.
+
+    python benchmarks/parser_benchmark.py                 # halaman sintetis ala WordPress
+    python benchmarks/parser_benchmark.py page1.html ...  # file HTML hasil download sendiri
+
+Exit code 1 jika ada halaman yang hasil ekstraksinya berbeda.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.scraper import DEFAULT_PARSER, extract_content  # noqa: E402
+
+# Variasi layout tema: content di article, di main, atau hanya di div dengan class content
+LAYOUTS = [
+    '<article class="post"><h1>{title}</h1><div class="entry-content">{body}</div></article>',
+    '<main><h1>{title}</h1><div class="post-content">{body}</div></main>',
+    '<div class="container"><h1>{title}</h1><div class="entry-content">{body}</div></div>',
+    '<div id="page"><section class="article-content"><h2>{title}</h2>{body}</section></div>',
+    '<div class="layout"><h1>{title}</h1><div class="text">{body}</div></div>',
+]
+
+
+def synthetic_page(index: int, paragraphs: int = 30) -> bytes:
+    """Halaman dengan head, navigasi, sidebar dan footer besar seperti tema WordPress biasa"""
+    title = f'Post number {index}'
+    body = ''.join(
+        f'<p>Paragraph {i} of post {index}. <a href="/tag/{i}">Link</a> with <strong>some</strong> '
+        f'text to make the page realistic, including <em>inline</em> markup.</p>'
+        for i in range(paragraphs)
+    ) + '<script>trackPost();</script>'
+    navigation = ''.join(f'<li class="menu-item"><a href="/category/{i}">Category {i}</a></li>' for i in range(80))
+    sidebar = ''.join(f'<div class="widget"><h3>Widget {i}</h3><ul>{navigation[:600]}</ul></div>' for i in range(10))
+    layout = LAYOUTS[index % len(LAYOUTS)].format(title=title, body=body)
+    return (
+        f'<!DOCTYPE html><html><head><title>{title} | Blog</title>'
+        + ''.join(f'<link rel="stylesheet" href="/style{i}.css"><script src="/app{i}.js"></script>' for i in range(15))
+        + f'</head><body><header><nav><ul>{navigation}</ul></nav></header>{layout}'
+        f'<aside class="sidebar">{sidebar}</aside><footer>{navigation}</footer></body></html>'
+    ).encode('utf-8')
+
+
+def run(pages, parser: str, strained: bool, repeat: int):
+    """(detik per halaman, hasil ekstraksi per halaman)"""
+    results = [extract_content(html, 'benchmark', parser, strained) for html in pages]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            extract_content(html, 'benchmark', parser, strained)
+    return (time.perf_counter() - start) / (repeat * len(pages)), results
+
+
+def peak_memory(pages, parser: str, strained: bool) -> int:
+    """Peak alokasi terbesar (bytes) saat mengekstrak satu halaman
+
+    Diukur di pass terpisah: tracemalloc memperlambat alokasi, jadi tidak boleh ikut di loop timing.
+    """
+    peak = 0
+    for html in pages:
+        tracemalloc.start()
+        try:
+            extract_content(html, 'benchmark', parser, strained)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return peak
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark parser lama vs baru untuk extract_content')
+    arg_parser.add_argument('files', nargs='*', help='File HTML (default: halaman sintetis)')
+    arg_parser.add_argument('--pages', type=int, default=50, help='Jumlah halaman sintetis')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='Pengulangan per halaman')
+    args = arg_parser.parse_args()
+
+    if args.files:
+        pages = []
+        for path in args.files:
+            with open(path, 'rb') as f:
+                pages.append(f.read())
+    else:
+        pages = [synthetic_page(i) for i in range(args.pages)]
+
+    old_time, old_results = run(pages, 'html.parser', False, args.repeat)
+    new_time, new_results = run(pages, DEFAULT_PARSER, True, args.repeat)
+    old_peak = peak_memory(pages, 'html.parser', False)
+    new_peak = peak_memory(pages, DEFAULT_PARSER, True)
+
+    mismatches = [
+        index for index, (old, new) in enumerate(zip(old_results, new_results))
+        if (old['title'], old['content']) != (new['title'], new['content'])
+    ]
+
+    size = sum(len(html) for html in pages) / len(pages)
+    print(f"Pages: {len(pages)} (avg {size / 1024:.1f} KB), repeat {args.repeat}")
+    print(f"Old  html.parser, full document: {old_time * 1000:8.2f} ms/page")
+    print(f"New  {DEFAULT_PARSER + ', strained:':<24}{new_time * 1000:8.2f} ms/page")
+    print(f"Speedup: {old_time / new_time:.1f}x")
+    print(f"Peak memory per page: old {old_peak / 1024:8.1f} KB, new {new_peak / 1024:8.1f} KB "
+          f"({old_peak / max(new_peak, 1):.1f}x less)")
+
+    if mismatches:
+        print(f"⚠️  Extracted text differs on {len(mismatches)} page(s): {mismatches[:10]}")
+        for index in mismatches[:3]:
+            print(f"   #{index} old: {old_results[index]['content'][:120]!r}")
+            print(f"   #{index} new: {new_results[index]['content'][:120]!r}")
+        return 1
+
+    print("✅ Extracted title and content identical on all pages")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+WebDriver Pool untuk Social Media Automation V2
+Menyimpan instance Chrome yang sudah warm supaya setiap aksi tidak perlu cold start
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bot.session_store import clear_browser_data
+
+
+class PooledDriver:
+    """WebDriver yang dikelola oleh DriverPool"""
+
+    def __init__(self, driver, key: Tuple[str, bool]):
+        self.driver = driver
+        self.key = key
+        self.uses = 0
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+
+class DriverPool:
+    """Pool WebDriver yang thread-safe, dikelompokkan berdasarkan (proxy, headless)"""
+
+    def __init__(self, factory: Callable, max_size: int = 2, max_uses: int = 50,
+                 idle_timeout: float = 300.0, acquire_timeout: float = 120.0):
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+
+        self._cond = threading.Condition()
+        self._idle: Dict[Tuple[str, bool], List[PooledDriver]] = {}
+        self._total = 0
+        self._closed = False
+        self._reaper = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def make_key(proxy: str = None, headless: bool = False) -> Tuple[str, bool]:
+        """Key pool untuk kombinasi proxy dan mode headless"""
+        return (proxy or '', bool(headless))
+
+    def acquire(self, proxy: str = None, headless: bool = False) -> PooledDriver:
+        """Lease driver dari pool, buat baru jika belum ada yang idle"""
+        key = self.make_key(proxy, headless)
+        deadline = time.time() + self.acquire_timeout
+
+        while True:
+            candidate = None
+            to_quit = []
+
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError('Driver pool is closed')
+
+                    to_quit.extend(self._collect_expired_locked())
+
+                    idle = self._idle.get(key)
+                    if idle:
+                        candidate = idle.pop()
+                        break
+
+                    if self._total < self.max_size:
+                        self._total += 1
+                        break
+
+                    # Pool penuh: korbankan driver idle milik key lain
+                    victim = self._pop_oldest_idle_locked()
+                    if victim:
+                        to_quit.append(victim)
+                        self._total += 1
+                        break
+
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError('Timed out waiting for a free WebDriver')
+                    self._cond.wait(remaining)
+
+            self._quit_all(to_quit)
+
+            if candidate is None:
+                return self._create(key)
+
+            if self._is_healthy(candidate):
+                return candidate
+
+            self._discard(candidate)
+
+    def release(self, pooled: PooledDriver, discard: bool = False):
+        """Kembalikan driver ke pool (atau tutup jika rusak / sudah terlalu sering dipakai)"""
+        pooled.uses += 1
+        pooled.last_used = time.time()
+
+        if not discard and pooled.uses < self.max_uses:
+            discard = not self._reset(pooled)
+
+        with self._cond:
+            if not discard and not self._closed and pooled.uses < self.max_uses:
+                self._idle.setdefault(pooled.key, []).append(pooled)
+                self._cond.notify()
+                return
+
+        self._discard(pooled)
+
+    @contextmanager
+    def lease(self, proxy: str = None, headless: bool = False):
+        """Context manager: `with pool.lease(proxy) as driver: ...`"""
+        pooled = self.acquire(proxy=proxy, headless=headless)
+        failed = False
+        try:
+            yield pooled.driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(pooled, discard=failed)
+
+    def evict_idle(self) -> int:
+        """Tutup driver yang idle lebih lama dari idle_timeout"""
+        with self._cond:
+            expired = self._collect_expired_locked()
+        self._quit_all(expired)
+        return len(expired)
+
+    def shutdown(self):
+        """Tutup semua driver idle; driver yang sedang dipakai ditutup saat release"""
+        self._stop_event.set()
+        with self._cond:
+            self._closed = True
+            drivers = [pooled for idle in self._idle.values() for pooled in idle]
+            self._idle.clear()
+            self._total -= len(drivers)
+            self._cond.notify_all()
+        for pooled in drivers:
+            self._quit(pooled)
+
+    def get_stats(self) -> Dict:
+        """Statistik pool untuk monitoring"""
+        with self._cond:
+            idle = sum(len(items) for items in self._idle.values())
+            return {
+                'total': self._total,
+                'idle': idle,
+                'in_use': self._total - idle,
+                'max_size': self.max_size
+            }
+
+    # Internal helpers
+    def _create(self, key: Tuple[str, bool]) -> PooledDriver:
+        proxy, headless = key
+        try:
+            driver = self.factory(headless=headless, proxy=proxy or None)
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+        self._start_reaper()
+        return PooledDriver(driver, key)
+
+    def _discard(self, pooled: PooledDriver):
+        self._quit(pooled)
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def _quit_all(self, drivers: List[PooledDriver]):
+        if not drivers:
+            return
+        for pooled in drivers:
+            self._quit(pooled)
+        with self._cond:
+            self._cond.notify_all()
+
+    def _collect_expired_locked(self) -> List[PooledDriver]:
+        """Ambil driver idle yang kedaluwarsa (dipanggil saat lock dipegang)"""
+        now = time.time()
+        expired = []
+        for key, idle in self._idle.items():
+            keep = []
+            for pooled in idle:
+                if now - pooled.last_used > self.idle_timeout:
+                    expired.append(pooled)
+                else:
+                    keep.append(pooled)
+            self._idle[key] = keep
+        self._total -= len(expired)
+        return expired
+
+    def _pop_oldest_idle_locked(self) -> Optional[PooledDriver]:
+        oldest = None
+        for idle in self._idle.values():
+            for pooled in idle:
+                if oldest is None or pooled.last_used < oldest.last_used:
+                    oldest = pooled
+        if oldest:
+            self._idle[oldest.key].remove(oldest)
+            self._total -= 1
+        return oldest
+
+    def _is_healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            pooled.driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, pooled: PooledDriver) -> bool:
+        """Bersihkan cookies, storage dan halaman supaya session tidak bocor antar akun"""
+        try:
+            clear_browser_data(pooled.driver)
+            pooled.driver.get('about:blank')
+            return True
+        except Exception as e:
+            print(f"⚠️  Error resetting pooled WebDriver: {e}")
+            return False
+
+    def _quit(self, pooled: PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            print(f"⚠️  Error closing pooled WebDriver: {e}")
+
+    def _start_reaper(self):
+        with self._cond:
+            if self._reaper is not None or self.idle_timeout <= 0:
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name='driver-pool-reaper', daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(5.0, self.idle_timeout / 2)
+        while not self._stop_event.wait(interval):
+            self.evict_idle()
@@ -15,12 +15,29 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from typing import Dict, List, Optional, Tuple
 import requests
 from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+from bot.selector_cache import find_element_cached
+from bot.text_input import enter_text
+from bot.waits import Pacer, wait_for_element, wait_for_navigation, wait_for_page
 
 class GuestPostingBot:
-    def __init__(self, driver, wait):
+    def __init__(self, driver, wait, input_mode: str = 'auto', selector_cache=None,
+                 selector_mode: str = 'union'):
         self.driver = driver
         self.wait = wait
         
+        # Cache selector yang terakhir berhasil per (site, field); mode 'union' atau 'sequential'
+        self.selector_cache = selector_cache
+        self.selector_mode = selector_mode
+        self.selector_scope = None
+        
+        # Cara mengisi field: human, send_keys, clipboard, insert_text, atau auto
+        # (per site: guest_sites.input_mode dipakai per panggilan tanpa mengubah default ini)
+        self.input_mode = input_mode
+        
+        # Jeda minimum antar aksi (BOT_MIN_PACING / BOT_PACING_JITTER)
+        self.pacer = Pacer()
+        
         # Common selectors untuk berbagai CMS
         self.cms_selectors = {
             'wordpress': {
@@ -189,7 +206,7 @@ class GuestPostingBot:
         """Detect CMS type dari URL atau page source"""
         try:
             self.driver.get(url)
-            time.sleep(3)
+            self._wait_for_page()
             
             page_source = self.driver.page_source.lower()
             current_url = self.driver.current_url.lower()
@@ -222,6 +239,9 @@ class GuestPostingBot:
             login_url = site_info['login_url']
             username = site_info['username']
             password = site_info['password']
+            # Mode input per site (guest_sites.input_mode) hanya untuk panggilan ini
+            mode = site_info.get('input_mode') or self.input_mode
+            self.selector_scope = f"guest:{urlparse(login_url).netloc}"
             
             # Detect CMS type
             cms_type = self.detect_cms(login_url)
@@ -229,40 +249,41 @@ class GuestPostingBot:
             
             # Navigate to login page
             self.driver.get(login_url)
-            time.sleep(random.uniform(3, 5))
+            self._wait_for_page()
             
             # Handle different CMS login flows
             if cms_type == 'wordpress':
-                return self._login_wordpress(username, password)
+                return self._login_wordpress(username, password, mode)
             elif cms_type == 'blogger':
-                return self._login_blogger(username, password)
+                return self._login_blogger(username, password, mode)
             elif cms_type == 'medium':
-                return self._login_medium(username, password)
+                return self._login_medium(username, password, mode)
             else:
-                return self._login_generic(username, password)
+                return self._login_generic(username, password, mode)
         
         except Exception as e:
             return {'success': False, 'message': f'Login error: {str(e)}'}
     
-    def _login_wordpress(self, username: str, password: str) -> Dict:
+    def _login_wordpress(self, username: str, password: str, mode: str = None) -> Dict:
         """Login ke WordPress site"""
         try:
             selectors = self.cms_selectors['wordpress']['login']
             
             # Find username field
             username_field = self._find_element_flexible(selectors['username'])
-            self._human_type(username_field, username)
-            time.sleep(random.uniform(1, 2))
+            self._human_type(username_field, username, mode=mode)
+            self.pacer.pace()
             
             # Find password field
             password_field = self._find_element_flexible(selectors['password'])
-            self._human_type(password_field, password)
-            time.sleep(random.uniform(1, 2))
+            self._human_type(password_field, password, mode=mode)
+            self.pacer.pace()
             
             # Find and click submit button
             submit_button = self._find_element_flexible(selectors['submit'])
+            login_page_url = self.driver.current_url
             submit_button.click()
-            time.sleep(random.uniform(3, 5))
+            self._wait_for_navigation(login_page_url)
             
             # Check if login successful
             current_url = self.driver.current_url
@@ -274,37 +295,38 @@ class GuestPostingBot:
         except Exception as e:
             return {'success': False, 'message': f'WordPress login error: {str(e)}'}
     
-    def _login_blogger(self, username: str, password: str) -> Dict:
+    def _login_blogger(self, username: str, password: str, mode: str = None) -> Dict:
         """Login ke Blogger"""
         try:
             selectors = self.cms_selectors['blogger']['login']
             
             # Enter email
             email_field = self._find_element_flexible(selectors['email'])
-            self._human_type(email_field, username)
-            time.sleep(1)
+            self._human_type(email_field, username, mode=mode)
+            self.pacer.pace()
             
             # Click Next
             next_button = self._find_element_flexible(selectors['next'])
             next_button.click()
-            time.sleep(3)
+            self.pacer.pace()
             
             # Enter password
             password_field = self._find_element_flexible(selectors['password'])
-            self._human_type(password_field, password)
-            time.sleep(1)
+            self._human_type(password_field, password, mode=mode)
+            self.pacer.pace()
             
             # Click Next/Submit
             submit_button = self._find_element_flexible(selectors['submit'])
+            login_page_url = self.driver.current_url
             submit_button.click()
-            time.sleep(5)
+            self._wait_for_navigation(login_page_url)
             
             return {'success': True, 'message': 'Blogger login successful'}
         
         except Exception as e:
             return {'success': False, 'message': f'Blogger login error: {str(e)}'}
     
-    def _login_medium(self, username: str, password: str) -> Dict:
+    def _login_medium(self, username: str, password: str, mode: str = None) -> Dict:
         """Login ke Medium"""
         try:
             selectors = self.cms_selectors['medium']['login']
@@ -312,48 +334,50 @@ class GuestPostingBot:
             # Click Sign in
             signin_button = self._find_element_flexible(selectors['signin'])
             signin_button.click()
-            time.sleep(2)
+            self.pacer.pace()
             
             # Enter email
             email_field = self._find_element_flexible(selectors['email'])
-            self._human_type(email_field, username)
-            time.sleep(1)
+            self._human_type(email_field, username, mode=mode)
+            self.pacer.pace()
             
             # Click Continue
             continue_button = self._find_element_flexible(selectors['continue'])
             continue_button.click()
-            time.sleep(2)
+            self.pacer.pace()
             
             # Enter password
             password_field = self._find_element_flexible(selectors['password'])
-            self._human_type(password_field, password)
+            self._human_type(password_field, password, mode=mode)
+            login_page_url = self.driver.current_url
             password_field.send_keys(Keys.RETURN)
-            time.sleep(5)
+            self._wait_for_navigation(login_page_url)
             
             return {'success': True, 'message': 'Medium login successful'}
         
         except Exception as e:
             return {'success': False, 'message': f'Medium login error: {str(e)}'}
     
-    def _login_generic(self, username: str, password: str) -> Dict:
+    def _login_generic(self, username: str, password: str, mode: str = None) -> Dict:
         """Generic login untuk custom sites"""
         try:
             selectors = self.cms_selectors['generic']['login']
             
             # Find username field
             username_field = self._find_element_flexible(selectors['username'])
-            self._human_type(username_field, username)
-            time.sleep(random.uniform(1, 2))
+            self._human_type(username_field, username, mode=mode)
+            self.pacer.pace()
             
             # Find password field
             password_field = self._find_element_flexible(selectors['password'])
-            self._human_type(password_field, password)
-            time.sleep(random.uniform(1, 2))
+            self._human_type(password_field, password, mode=mode)
+            self.pacer.pace()
             
             # Find and click submit button
             submit_button = self._find_element_flexible(selectors['submit'])
+            login_page_url = self.driver.current_url
             submit_button.click()
-            time.sleep(random.uniform(3, 5))
+            self._wait_for_navigation(login_page_url)
             
             # Basic success check
             current_url = self.driver.current_url
@@ -367,6 +391,8 @@ class GuestPostingBot:
     
     def create_guest_post(self, site_info: Dict, post_data: Dict) -> Dict:
         """Create guest post di site"""
+        mode = site_info.get('input_mode') or self.input_mode
+        
         try:
             # Login first
             login_result = self.login_to_site(site_info)
@@ -377,18 +403,18 @@ class GuestPostingBot:
             cms_type = self.detect_cms(site_info['url'])
             
             if cms_type == 'wordpress':
-                return self._create_wordpress_post(post_data)
+                return self._create_wordpress_post(post_data, mode)
             elif cms_type == 'blogger':
-                return self._create_blogger_post(post_data)
+                return self._create_blogger_post(post_data, mode)
             elif cms_type == 'medium':
-                return self._create_medium_post(post_data)
+                return self._create_medium_post(post_data, mode)
             else:
-                return self._create_generic_post(post_data, site_info)
+                return self._create_generic_post(post_data, site_info, mode)
         
         except Exception as e:
             return {'success': False, 'message': f'Post creation error: {str(e)}'}
     
-    def _create_wordpress_post(self, post_data: Dict) -> Dict:
+    def _create_wordpress_post(self, post_data: Dict, mode: str = None) -> Dict:
         """Create post di WordPress"""
         try:
             selectors = self.cms_selectors['wordpress']['post_creation']
@@ -403,12 +429,12 @@ class GuestPostingBot:
                 base_url = current_url.split('/wp-admin')[0]
                 self.driver.get(f"{base_url}/wp-admin/post-new.php")
             
-            time.sleep(random.uniform(3, 5))
+            self._wait_for_page()
             
             # Add title
             title_field = self._find_element_flexible(selectors['title'])
-            self._human_type(title_field, post_data['title'])
-            time.sleep(1)
+            self._human_type(title_field, post_data['title'], mode=mode)
+            self.pacer.pace()
             
             # Add content
             content_field = self._find_element_flexible(selectors['content'])
@@ -423,9 +449,9 @@ class GuestPostingBot:
                 self.driver.switch_to.default_content()
             else:
                 # Block editor or other
-                self._human_type(content_field, post_data['content'])
+                self._human_type(content_field, post_data['content'], mode=mode)
             
-            time.sleep(2)
+            self.pacer.pace()
             
             # Add categories if provided
             if post_data.get('categories'):
@@ -444,31 +470,32 @@ class GuestPostingBot:
                 try:
                     tags_field = self._find_element_flexible(selectors['tags'])
                     tags_text = ', '.join(post_data['tags'])
-                    self._human_type(tags_field, tags_text)
+                    self._human_type(tags_field, tags_text, mode=mode)
                     tags_field.send_keys(Keys.RETURN)
                 except:
                     pass
             
-            time.sleep(2)
+            self.pacer.pace()
             
             # Publish post
             publish_button = self._find_element_flexible(selectors['publish'])
             publish_button.click()
-            time.sleep(random.uniform(3, 5))
             
             # Check if published successfully
-            try:
-                success_message = self.driver.find_element(
-                    By.XPATH, "//div[contains(text(), 'Post published') or contains(text(), 'published successfully')]"
-                )
+            success_message = wait_for_element(
+                self.driver,
+                "//div[contains(text(), 'Post published') or contains(text(), 'published successfully')]",
+                timeout=15
+            )
+            if success_message:
                 return {'success': True, 'message': 'WordPress post published successfully'}
-            except:
+            else:
                 return {'success': True, 'message': 'WordPress post created (verification timeout)'}
         
         except Exception as e:
             return {'success': False, 'message': f'WordPress post creation error: {str(e)}'}
     
-    def _create_blogger_post(self, post_data: Dict) -> Dict:
+    def _create_blogger_post(self, post_data: Dict, mode: str = None) -> Dict:
         """Create post di Blogger"""
         try:
             selectors = self.cms_selectors['blogger']['post_creation']
@@ -476,29 +503,29 @@ class GuestPostingBot:
             # Click New Post
             new_post_button = self._find_element_flexible(selectors['new_post'])
             new_post_button.click()
-            time.sleep(3)
+            self.pacer.pace()
             
             # Add title
             title_field = self._find_element_flexible(selectors['title'])
-            self._human_type(title_field, post_data['title'])
-            time.sleep(1)
+            self._human_type(title_field, post_data['title'], mode=mode)
+            self.pacer.pace()
             
             # Add content
             content_field = self._find_element_flexible(selectors['content'])
-            self._human_type(content_field, post_data['content'])
-            time.sleep(2)
+            self._human_type(content_field, post_data['content'], mode=mode)
+            self.pacer.pace()
             
             # Publish
             publish_button = self._find_element_flexible(selectors['publish'])
             publish_button.click()
-            time.sleep(5)
+            self._wait_for_page()
             
             return {'success': True, 'message': 'Blogger post published successfully'}
         
         except Exception as e:
             return {'success': False, 'message': f'Blogger post creation error: {str(e)}'}
     
-    def _create_medium_post(self, post_data: Dict) -> Dict:
+    def _create_medium_post(self, post_data: Dict, mode: str = None) -> Dict:
         """Create post di Medium"""
         try:
             selectors = self.cms_selectors['medium']['post_creation']
@@ -506,25 +533,25 @@ class GuestPostingBot:
             # Click Write
             write_button = self._find_element_flexible(selectors['write'])
             write_button.click()
-            time.sleep(3)
+            self.pacer.pace()
             
             # Add title
             title_field = self._find_element_flexible(selectors['title'])
             title_field.click()
             title_field.clear()
-            self._human_type(title_field, post_data['title'])
-            time.sleep(1)
+            self._human_type(title_field, post_data['title'], mode=mode)
+            self.pacer.pace()
             
             # Add content
             content_field = self._find_element_flexible(selectors['content'])
             content_field.click()
-            self._human_type(content_field, post_data['content'])
-            time.sleep(2)
+            self._human_type(content_field, post_data['content'], mode=mode)
+            self.pacer.pace()
             
             # Publish
             publish_button = self._find_element_flexible(selectors['publish'])
             publish_button.click()
-            time.sleep(3)
+            self.pacer.pace()
             
             # Confirm publish
             try:
@@ -532,7 +559,7 @@ class GuestPostingBot:
                     EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Publish now')]"))
                 )
                 confirm_publish.click()
-                time.sleep(3)
+                self._wait_for_page()
             except:
                 pass
             
@@ -541,7 +568,7 @@ class GuestPostingBot:
         except Exception as e:
             return {'success': False, 'message': f'Medium post creation error: {str(e)}'}
     
-    def _create_generic_post(self, post_data: Dict, site_info: Dict) -> Dict:
+    def _create_generic_post(self, post_data: Dict, site_info: Dict, mode: str = None) -> Dict:
         """Create post di generic/custom site"""
         try:
             selectors = self.cms_selectors['generic']['post_creation']
@@ -550,19 +577,19 @@ class GuestPostingBot:
             try:
                 new_post_button = self._find_element_flexible(selectors['new_post'])
                 new_post_button.click()
-                time.sleep(3)
+                self.pacer.pace()
             except:
                 # Try using post_url if provided
                 if site_info.get('post_url'):
                     self.driver.get(site_info['post_url'])
-                    time.sleep(3)
+                    self._wait_for_page()
                 else:
                     return {'success': False, 'message': 'Could not find new post button'}
             
             # Add title
             title_field = self._find_element_flexible(selectors['title'])
-            self._human_type(title_field, post_data['title'])
-            time.sleep(1)
+            self._human_type(title_field, post_data['title'], mode=mode)
+            self.pacer.pace()
             
             # Add content
             content_field = self._find_element_flexible(selectors['content'])
@@ -575,45 +602,46 @@ class GuestPostingBot:
                 body.send_keys(post_data['content'])
                 self.driver.switch_to.default_content()
             else:
-                self._human_type(content_field, post_data['content'])
+                self._human_type(content_field, post_data['content'], mode=mode)
             
-            time.sleep(2)
+            self.pacer.pace()
             
             # Publish
             publish_button = self._find_element_flexible(selectors['publish'])
             publish_button.click()
-            time.sleep(5)
+            self._wait_for_page()
             
             return {'success': True, 'message': 'Generic post published successfully'}
         
         except Exception as e:
             return {'success': False, 'message': f'Generic post creation error: {str(e)}'}
     
-    def _find_element_flexible(self, xpath_list: List[str], timeout: int = 10):
-        """Find element dengan multiple XPath fallbacks"""
-        for xpath in xpath_list:
-            try:
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((By.XPATH, xpath))
-                )
-                return element
-            except TimeoutException:
-                continue
-        
-        raise TimeoutException(f"Could not find element with any of the XPaths: {xpath_list}")
+    def _find_element_flexible(self, xpath_list: List[str], timeout: int = 10, field: str = None):
+        """Find element dengan multiple XPath fallbacks (selector yang terakhir berhasil dicoba dulu)"""
+        return find_element_cached(
+            self.driver, xpath_list, timeout=timeout, scope=self.selector_scope, field=field,
+            cache=self.selector_cache, mode=self.selector_mode
+        )
+    
+    def _wait_for_page(self, timeout: float = 15) -> bool:
+        """Tunggu halaman siap (readyState + network idle)"""
+        return wait_for_page(self.driver, timeout=timeout)
+    
+    def _wait_for_navigation(self, old_url: str, timeout: float = 20) -> bool:
+        """Tunggu redirect dari old_url selesai"""
+        return wait_for_navigation(self.driver, old_url, timeout=timeout)
     
-    def _human_type(self, element, text: str, delay_range: Tuple[float, float] = (0.05, 0.15)):
-        """Type text seperti manusia"""
+    def _human_type(self, element, text: str, delay_range: Tuple[float, float] = (0.05, 0.15),
+                    mode: str = None):
+        """Isi text sesuai input mode (default: self.input_mode)"""
         element.clear()
-        for char in text:
-            element.send_keys(char)
-            time.sleep(random.uniform(*delay_range))
+        enter_text(self.driver, element, text, mode=mode or self.input_mode, delay_range=delay_range)
     
     def get_site_info(self, url: str) -> Dict:
         """Get information about the site"""
         try:
             self.driver.get(url)
-            time.sleep(3)
+            self._wait_for_page()
             
             # Get basic site info
             title = self.driver.title
@@ -16,12 +16,20 @@ from typing import Dict, List, Optional
 import requests
 from PIL import Image
 import io
+from bot.text_input import enter_text
+from bot.waits import Pacer, wait_for_element, wait_for_navigation, wait_for_page
 
 class InstagramBot:
-    def __init__(self, driver, wait):
+    def __init__(self, driver, wait, input_mode: str = 'auto'):
         self.driver = driver
         self.wait = wait
         
+        # Cara mengisi field: human, send_keys, clipboard, insert_text, atau auto
+        self.input_mode = input_mode
+        
+        # Jeda minimum antar aksi (BOT_MIN_PACING / BOT_PACING_JITTER)
+        self.pacer = Pacer()
+        
         # Instagram-specific XPath selectors
         self.selectors = {
             'login': {
@@ -36,6 +44,7 @@ class InstagramBot:
                 'profile': "//a[contains(@href, '/') and contains(@aria-label, 'Profile')]"
             },
             'post_creation': {
+                'shared_notice': "//*[contains(text(), 'has been shared')]",
                 'select_files': "//input[@type='file' and @accept]",
                 'drag_drop_area': "//div[contains(text(), 'Drag photos and videos here')]",
                 'next_button': "//button[contains(text(), 'Next')]",
@@ -62,13 +71,13 @@ class InstagramBot:
         """Login ke Instagram"""
         try:
             self.driver.get('https://www.instagram.com/accounts/login/')
-            time.sleep(random.uniform(3, 5))
+            self._wait_for_page()
             
             # Handle cookies popup if exists
             try:
                 cookies_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Accept') or contains(text(), 'Allow')]")
                 cookies_button.click()
-                time.sleep(1)
+                self.pacer.pace()
             except:
                 pass
             
@@ -79,19 +88,20 @@ class InstagramBot:
             
             # Type username with human-like delay
             self._human_type(username_field, username)
-            time.sleep(random.uniform(1, 2))
+            self.pacer.pace()
             
             # Find password field
             password_field = self.driver.find_element(By.XPATH, self.selectors['login']['password'])
             self._human_type(password_field, password)
-            time.sleep(random.uniform(1, 2))
+            self.pacer.pace()
             
             # Click login button
             login_button = self.driver.find_element(By.XPATH, self.selectors['login']['submit'])
+            login_page_url = self.driver.current_url
             login_button.click()
             
             # Wait for login to complete
-            time.sleep(random.uniform(5, 8))
+            self._wait_for_navigation(login_page_url)
             
             # Handle "Save Your Login Info" popup
             try:
@@ -99,7 +109,7 @@ class InstagramBot:
                     EC.element_to_be_clickable((By.XPATH, self.selectors['login']['not_now']))
                 )
                 not_now_button.click()
-                time.sleep(2)
+                self.pacer.pace()
             except:
                 pass
             
@@ -109,7 +119,7 @@ class InstagramBot:
                     EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Not Now')]"))
                 )
                 not_now_button.click()
-                time.sleep(2)
+                self.pacer.pace()
             except:
                 pass
             
@@ -129,14 +139,14 @@ class InstagramBot:
         try:
             # Navigate to create post
             self.driver.get('https://www.instagram.com/')
-            time.sleep(random.uniform(2, 4))
+            self._wait_for_page()
             
             # Click create button
             create_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, self.selectors['navigation']['create']))
             )
             create_button.click()
-            time.sleep(random.uniform(2, 3))
+            self.pacer.pace()
             
             # Upload file
             file_input = WebDriverWait(self.driver, 10).until(
@@ -148,14 +158,14 @@ class InstagramBot:
                 return {'success': False, 'message': 'Image file not found'}
             
             file_input.send_keys(os.path.abspath(image_path))
-            time.sleep(random.uniform(3, 5))
+            self._wait_for_upload()
             
             # Click Next (crop/filter step)
             next_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, self.selectors['post_creation']['next_button']))
             )
             next_button.click()
-            time.sleep(random.uniform(2, 3))
+            self.pacer.pace()
             
             # Click Next again (filter step)
             try:
@@ -163,7 +173,7 @@ class InstagramBot:
                     EC.element_to_be_clickable((By.XPATH, self.selectors['post_creation']['next_button']))
                 )
                 next_button.click()
-                time.sleep(random.uniform(2, 3))
+                self.pacer.pace()
             except:
                 pass
             
@@ -179,21 +189,21 @@ class InstagramBot:
                     full_caption = f"{caption}\\n\\n{hashtag_text}" if caption else hashtag_text
                 
                 self._human_type(caption_field, full_caption)
-                time.sleep(random.uniform(1, 2))
+                self.pacer.pace()
             
             # Add location if provided
             if location:
                 try:
                     location_input = self.driver.find_element(By.XPATH, self.selectors['post_creation']['location_input'])
                     self._human_type(location_input, location)
-                    time.sleep(2)
+                    self.pacer.pace()
                     
                     # Select first location suggestion
                     location_suggestion = WebDriverWait(self.driver, 5).until(
                         EC.element_to_be_clickable((By.XPATH, "//div[@role='button' and contains(@class, 'location')]"))
                     )
                     location_suggestion.click()
-                    time.sleep(1)
+                    self.pacer.pace()
                 except:
                     pass
             
@@ -202,13 +212,13 @@ class InstagramBot:
                 try:
                     advanced_settings = self.driver.find_element(By.XPATH, self.selectors['post_creation']['advanced_settings'])
                     advanced_settings.click()
-                    time.sleep(1)
+                    self.pacer.pace()
                     
                     alt_text_field = WebDriverWait(self.driver, 5).until(
                         EC.presence_of_element_located((By.XPATH, "//textarea[@aria-label='Alt text']"))
                     )
                     self._human_type(alt_text_field, alt_text)
-                    time.sleep(1)
+                    self.pacer.pace()
                 except:
                     pass
             
@@ -219,19 +229,9 @@ class InstagramBot:
             share_button.click()
             
             # Wait for post to be shared
-            time.sleep(random.uniform(5, 8))
-            
-            # Check if post was successful
-            try:
-                # Look for success indicators
-                WebDriverWait(self.driver, 10).until(
-                    EC.any_of(
-                        EC.presence_of_element_located((By.XPATH, "//span[contains(text(), 'Your post has been shared')]")),
-                        EC.url_contains('instagram.com')
-                    )
-                )
+            if self._wait_for_shared(timeout=60):
                 return {'success': True, 'message': 'Instagram photo posted successfully'}
-            except:
+            else:
                 return {'success': True, 'message': 'Instagram photo posted (verification timeout)'}
         
         except Exception as e:
@@ -243,14 +243,14 @@ class InstagramBot:
         try:
             # Similar to photo posting but for video
             self.driver.get('https://www.instagram.com/')
-            time.sleep(random.uniform(2, 4))
+            self._wait_for_page()
             
             # Click create button
             create_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, self.selectors['navigation']['create']))
             )
             create_button.click()
-            time.sleep(random.uniform(2, 3))
+            self.pacer.pace()
             
             # Upload video file
             file_input = WebDriverWait(self.driver, 10).until(
@@ -261,14 +261,14 @@ class InstagramBot:
                 return {'success': False, 'message': 'Video file not found'}
             
             file_input.send_keys(os.path.abspath(video_path))
-            time.sleep(random.uniform(5, 8))  # Video upload takes longer
+            self._wait_for_upload()
             
             # Click Next (trim video step)
             next_button = WebDriverWait(self.driver, 15).until(
                 EC.element_to_be_clickable((By.XPATH, self.selectors['post_creation']['next_button']))
             )
             next_button.click()
-            time.sleep(random.uniform(3, 5))
+            self.pacer.pace()
             
             # Click Next (cover selection step)
             try:
@@ -276,7 +276,7 @@ class InstagramBot:
                     EC.element_to_be_clickable((By.XPATH, self.selectors['post_creation']['next_button']))
                 )
                 next_button.click()
-                time.sleep(random.uniform(2, 3))
+                self.pacer.pace()
             except:
                 pass
             
@@ -292,7 +292,7 @@ class InstagramBot:
                     full_caption = f"{caption}\\n\\n{hashtag_text}" if caption else hashtag_text
                 
                 self._human_type(caption_field, full_caption)
-                time.sleep(random.uniform(1, 2))
+                self.pacer.pace()
             
             # Share the video
             share_button = WebDriverWait(self.driver, 10).until(
@@ -301,7 +301,7 @@ class InstagramBot:
             share_button.click()
             
             # Wait for video to be processed and shared
-            time.sleep(random.uniform(10, 15))
+            self._wait_for_shared(timeout=120)
             
             return {'success': True, 'message': 'Instagram video posted successfully'}
         
@@ -312,14 +312,14 @@ class InstagramBot:
         """Post story ke Instagram"""
         try:
             self.driver.get('https://www.instagram.com/')
-            time.sleep(random.uniform(2, 4))
+            self._wait_for_page()
             
             # Click on "Your story" or camera icon
             story_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, self.selectors['story']['your_story']))
             )
             story_button.click()
-            time.sleep(random.uniform(2, 3))
+            self.pacer.pace()
             
             # Upload media
             if story_type == 'photo':
@@ -335,7 +335,7 @@ class InstagramBot:
                 )
                 file_input.send_keys(os.path.abspath(media_path))
             
-            time.sleep(random.uniform(3, 5))
+            self._wait_for_upload()
             
             # Share to story
             share_story_button = WebDriverWait(self.driver, 10).until(
@@ -343,7 +343,7 @@ class InstagramBot:
             )
             share_story_button.click()
             
-            time.sleep(random.uniform(3, 5))
+            self._wait_for_page()
             
             return {'success': True, 'message': 'Instagram story posted successfully'}
         
@@ -355,14 +355,14 @@ class InstagramBot:
         """Post reel ke Instagram"""
         try:
             self.driver.get('https://www.instagram.com/')
-            time.sleep(random.uniform(2, 4))
+            self._wait_for_page()
             
             # Navigate to reels creation
             create_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, self.selectors['navigation']['create']))
             )
             create_button.click()
-            time.sleep(random.uniform(2, 3))
+            self.pacer.pace()
             
             # Select Reels tab if available
             try:
@@ -370,7 +370,7 @@ class InstagramBot:
                     EC.element_to_be_clickable((By.XPATH, self.selectors['reels']['reels_tab']))
                 )
                 reels_tab.click()
-                time.sleep(2)
+                self.pacer.pace()
             except:
                 pass
             
@@ -383,7 +383,7 @@ class InstagramBot:
                 return {'success': False, 'message': 'Video file not found'}
             
             file_input.send_keys(os.path.abspath(video_path))
-            time.sleep(random.uniform(5, 8))
+            self._wait_for_upload()
             
             # Process through reel creation steps
             # This would include music selection, effects, etc.
@@ -402,7 +402,7 @@ class InstagramBot:
                         full_caption = f"{caption}\\n\\n{hashtag_text}" if caption else hashtag_text
                     
                     self._human_type(caption_field, full_caption)
-                    time.sleep(random.uniform(1, 2))
+                    self.pacer.pace()
                 except:
                     pass
             
@@ -412,7 +412,7 @@ class InstagramBot:
             )
             share_button.click()
             
-            time.sleep(random.uniform(8, 12))
+            self._wait_for_shared(timeout=120)
             
             return {'success': True, 'message': 'Instagram reel posted successfully'}
         
@@ -431,7 +431,7 @@ class InstagramBot:
                 )
                 profile_button.click()
             
-            time.sleep(random.uniform(3, 5))
+            self._wait_for_page()
             
             # Extract account information
             try:
@@ -459,16 +459,26 @@ class InstagramBot:
         except Exception as e:
             return {'success': False, 'message': f'Error getting account info: {str(e)}'}
     
-    def _human_type(self, element, text: str, delay_range: tuple = (0.05, 0.15)):
-        """Type text dengan delay seperti manusia"""
-        for char in text:
-            element.send_keys(char)
-            time.sleep(random.uniform(*delay_range))
+    def _human_type(self, element, text: str, delay_range: tuple = (0.05, 0.15), mode: str = None):
+        """Isi text sesuai input mode (default: self.input_mode)"""
+        enter_text(self.driver, element, text, mode=mode or self.input_mode, delay_range=delay_range)
+    
+    def _wait_for_page(self, timeout: float = 15) -> bool:
+        """Tunggu halaman siap (readyState + network idle)"""
+        return wait_for_page(self.driver, timeout=timeout)
+    
+    def _wait_for_navigation(self, old_url: str, timeout: float = 20) -> bool:
+        """Tunggu redirect dari old_url selesai"""
+        return wait_for_navigation(self.driver, old_url, timeout=timeout)
+    
+    def _wait_for_shared(self, timeout: float = 60) -> bool:
+        """Tunggu notifikasi 'has been shared' setelah klik Share"""
+        return wait_for_element(self.driver, self.selectors['post_creation']['shared_notice'], timeout=timeout) is not None
     
     def _scroll_and_click(self, element):
         """Scroll ke element dan click"""
         self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        time.sleep(random.uniform(0.5, 1.0))
+        self.pacer.pace()
         
         try:
             element.click()
@@ -487,7 +497,7 @@ class InstagramBot:
                     break
             except:
                 pass
-            time.sleep(1)
+            time.sleep(0.25)
     
     def validate_media_file(self, file_path: str, media_type: str = 'photo') -> Dict:
         """Validate media file before upload"""
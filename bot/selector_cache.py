@@ -0,0 +1,139 @@
+"""
+Selector Resolution Cache untuk semua bot
+Mengingat XPath mana yang terakhir berhasil per (platform/site, field) supaya dicoba lebih dulu,
+dan mode 'union' yang mengevaluasi semua kandidat dalam satu round trip.
+"""
+
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
+
+# 'union': semua kandidat dievaluasi dalam satu execute_script per polling
+# 'sequential': perilaku lama, setiap kandidat menunggu timeout sendiri
+SELECTOR_MODES = ('union', 'sequential')
+
+# Evaluasi kandidat sesuai urutan prioritas (bukan document order seperti `a | b`)
+_FIRST_MATCH_SCRIPT = """
+const xpaths = arguments[0];
+for (let i = 0; i < xpaths.length; i++) {
+    try {
+        const node = document.evaluate(
+            xpaths[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        if (node) return [node, i];
+    } catch (e) {}
+}
+return null;
+"""
+
+
+def selector_field_key(xpath_list: List[str]) -> str:
+    """Key field default: hash dari daftar kandidat (berubah otomatis jika selector diedit)"""
+    return hashlib.sha1('\n'.join(xpath_list).encode('utf-8')).hexdigest()[:16]
+
+
+class SelectorCache:
+    """Cache XPath yang terakhir berhasil, disimpan di tabel selector_cache"""
+
+    def __init__(self, db_manager=None):
+        self.db_manager = db_manager
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], str] = {}
+        self._loaded = False
+
+    def get(self, scope: str, field: str) -> Optional[str]:
+        self._load()
+        with self._lock:
+            return self._entries.get((scope, field))
+
+    def remember(self, scope: str, field: str, xpath: str):
+        """Simpan selector yang berhasil; hanya menulis ke DB jika berubah"""
+        self._load()
+        with self._lock:
+            if self._entries.get((scope, field)) == xpath:
+                return
+            self._entries[(scope, field)] = xpath
+
+        if self.db_manager:
+            try:
+                self.db_manager.save_cached_selector(scope, field, xpath)
+            except Exception as e:
+                print(f"⚠️  Error saving selector cache: {e}")
+
+    def forget(self, scope: str, field: str):
+        with self._lock:
+            self._entries.pop((scope, field), None)
+
+        if self.db_manager:
+            try:
+                self.db_manager.delete_cached_selector(scope, field)
+            except Exception as e:
+                print(f"⚠️  Error deleting selector cache: {e}")
+
+    def _load(self):
+        if self._loaded:
+            return
+        rows = []
+        if self.db_manager:
+            try:
+                rows = self.db_manager.get_cached_selectors()
+            except Exception as e:
+                print(f"⚠️  Error loading selector cache: {e}")
+        with self._lock:
+            if not self._loaded:
+                for row in rows:
+                    self._entries.setdefault((row['scope'], row['field']), row['xpath'])
+                self._loaded = True
+
+
+def find_element_cached(driver, xpath_list, timeout: float = 10, scope: str = None,
+                        field: str = None, cache: SelectorCache = None, mode: str = 'union'):
+    """Find element dengan multiple XPath fallbacks; selector yang terakhir berhasil dicoba dulu"""
+    candidates = list(xpath_list) if isinstance(xpath_list, (list, tuple)) else [xpath_list]
+    use_cache = cache is not None and scope is not None
+    field = field or selector_field_key(candidates)
+
+    cached = cache.get(scope, field) if use_cache else None
+    if cached in candidates:
+        candidates.remove(cached)
+        candidates.insert(0, cached)
+
+    if mode == 'sequential':
+        element, index = _find_sequential(driver, candidates, timeout)
+    else:
+        element, index = _find_first_match(driver, candidates, timeout)
+
+    if element is None:
+        raise TimeoutException(f"Could not find element with any of the XPaths: {xpath_list}")
+
+    if use_cache:
+        cache.remember(scope, field, candidates[index])
+    return element
+
+
+def _find_first_match(driver, candidates: List[str], timeout: float):
+    """Satu round trip per polling untuk semua kandidat"""
+    try:
+        element, index = WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script(_FIRST_MATCH_SCRIPT, candidates)
+        )
+        return element, int(index)
+    except TimeoutException:
+        return None, None
+
+
+def _find_sequential(driver, candidates: List[str], timeout: float):
+    for index, xpath in enumerate(candidates):
+        try:
+            element = WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.XPATH, xpath))
+            )
+            return element, index
+        except TimeoutException:
+            continue
+    return None, None
@@ -0,0 +1,190 @@
+"""
+Browser Session Store untuk semua bot
+Menyimpan cookies + localStorage per social_accounts.id / guest_sites.id (terenkripsi)
+supaya login penuh hanya dilakukan saat session sudah expired.
+"""
+
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # Session tidak disimpan tanpa enkripsi
+    Fernet = None
+    InvalidToken = Exception
+
+SESSION_KEY_ENV = 'SESSION_STORE_KEY'
+DEFAULT_KEY_PATH = 'database/session_store.key'
+
+# Field yang diterima CDP Network.setCookies
+_COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+_LOCAL_STORAGE_SCRIPT = """
+const items = {};
+for (let i = 0; i < window.localStorage.length; i++) {
+    const key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return [window.location.origin, items];
+"""
+
+# Dipasang lewat Page.addScriptToEvaluateOnNewDocument: isi localStorage sebelum script halaman jalan,
+# sekali per restore per origin supaya perubahan dari aplikasi tidak ditimpa lagi. Flag diberi token
+# per restore: sessionStorage tab di driver pool bisa masih berisi flag dari lease sebelumnya.
+_RESTORE_STORAGE_TEMPLATE = """
+(() => {
+    const saved = %s;
+    const flag = '__sessionRestored:' + %s;
+    const items = saved[window.location.origin];
+    if (!items || window.sessionStorage.getItem(flag)) return;
+    for (const [key, value] of Object.entries(items)) window.localStorage.setItem(key, value);
+    window.sessionStorage.setItem(flag, '1');
+})();
+"""
+
+
+def clear_browser_data(driver):
+    """Hapus cookies semua domain dan localStorage/IndexedDB/cache, plus sessionStorage origin saat ini"""
+    try:
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    except Exception:
+        driver.delete_all_cookies()
+
+    try:
+        origin = driver.execute_script('return window.location.origin')
+        driver.execute_script('try { window.sessionStorage.clear(); } catch (e) {}')
+    except Exception:
+        origin = None
+    # '*' = semua origin; origin saat ini juga dikirim eksplisit untuk Chrome yang tidak menerima wildcard
+    for target in ['*'] + ([origin] if origin and origin.startswith('http') else []):
+        try:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': target, 'storageTypes': 'all'})
+        except Exception:
+            pass
+
+
+class SessionStore:
+    """Penyimpanan session browser terenkripsi (Fernet) di tabel browser_sessions"""
+
+    def __init__(self, db_manager, key: str = None, key_path: str = DEFAULT_KEY_PATH):
+        self.db_manager = db_manager
+        self.key_path = key_path
+        self._lock = threading.Lock()
+        self._fernet = None
+
+        if Fernet is None:
+            print("⚠️  cryptography not installed, browser sessions will not be persisted")
+            return
+
+        try:
+            self._fernet = Fernet(key or os.environ.get(SESSION_KEY_ENV) or self._load_or_create_key())
+        except Exception as e:
+            print(f"⚠️  Invalid session store key, browser sessions disabled: {e}")
+
+    @property
+    def enabled(self) -> bool:
+        return self._fernet is not None
+
+    def save(self, driver, target_type: str, target_id: int) -> bool:
+        """Simpan cookies semua domain + localStorage origin saat ini"""
+        if not self.enabled or not target_id:
+            return False
+
+        try:
+            cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+            origin, items = driver.execute_script(_LOCAL_STORAGE_SCRIPT)
+        except Exception as e:
+            print(f"⚠️  Error reading browser session: {e}")
+            return False
+
+        session = {
+            'cookies': [self._cookie_param(cookie) for cookie in cookies],
+            'local_storage': {origin: items} if items and origin.startswith('http') else {},
+            'saved_at': datetime.now().isoformat()
+        }
+        token = self._fernet.encrypt(json.dumps(session).encode('utf-8'))
+
+        try:
+            self.db_manager.save_browser_session(target_type, target_id, token)
+            return True
+        except Exception as e:
+            print(f"⚠️  Error saving browser session: {e}")
+            return False
+
+    def restore(self, driver, target_type: str, target_id: int) -> Optional[str]:
+        """Pasang session tersimpan ke driver; return identifier script localStorage ('' jika tidak ada), None jika gagal"""
+        session = self.load(target_type, target_id)
+        if not session or not session.get('cookies'):
+            return None
+
+        try:
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': session['cookies']})
+            if not session.get('local_storage'):
+                return ''
+            script = _RESTORE_STORAGE_TEMPLATE % (json.dumps(session['local_storage']), json.dumps(uuid.uuid4().hex))
+            result = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': script})
+            return result.get('identifier', '')
+        except Exception as e:
+            print(f"⚠️  Error restoring browser session: {e}")
+            return None
+
+    def detach(self, driver, script_id: str):
+        """Lepas script restore localStorage supaya tidak ikut ke akun lain di driver pool"""
+        if not script_id:
+            return
+        try:
+            driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': script_id})
+        except Exception:
+            pass
+
+    def load(self, target_type: str, target_id: int) -> Optional[Dict]:
+        if not self.enabled or not target_id:
+            return None
+
+        token = self.db_manager.get_browser_session(target_type, target_id)
+        if not token:
+            return None
+
+        try:
+            return json.loads(self._fernet.decrypt(bytes(token)).decode('utf-8'))
+        except (InvalidToken, ValueError) as e:
+            print(f"⚠️  Unreadable browser session for {target_type} {target_id}, discarding: {e}")
+            self.delete(target_type, target_id)
+            return None
+
+    def delete(self, target_type: str, target_id: int):
+        if target_id:
+            self.db_manager.delete_browser_session(target_type, target_id)
+
+    @staticmethod
+    def clear(driver):
+        """Hapus cookies + storage sebelum full login (session lama tidak valid)"""
+        clear_browser_data(driver)
+
+    @staticmethod
+    def _cookie_param(cookie: Dict) -> Dict:
+        param = {field: cookie[field] for field in _COOKIE_FIELDS if field in cookie}
+        # Session cookie (expires -1) tidak boleh dikirim dengan expires
+        if cookie.get('session') or param.get('expires', 0) <= 0:
+            param.pop('expires', None)
+        return param
+
+    def _load_or_create_key(self) -> bytes:
+        with self._lock:
+            if os.path.exists(self.key_path):
+                with open(self.key_path, 'rb') as f:
+                    return f.read().strip()
+
+            key = Fernet.generate_key()
+            key_dir = os.path.dirname(self.key_path)
+            if key_dir and not os.path.exists(key_dir):
+                os.makedirs(key_dir)
+            fd = os.open(self.key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(key)
+            print(f"✅ Created session store key at {self.key_path}")
+            return key
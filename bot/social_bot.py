@@ -6,7 +6,6 @@ Mendukung Facebook, Twitter, LinkedIn, Instagram, dan Guest Posting
 import time
 import random
 import os
-import requests
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -16,16 +15,117 @@ from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-from bs4 import BeautifulSoup
 from typing import Dict, List, Optional, Tuple
 import json
+from urllib.parse import urlparse
+from bot.selector_cache import find_element_cached
+from bot.text_input import enter_text
+from services.scraper import BatchScraper
+from bot.waits import Pacer, install_network_tracker, wait_for_page, wait_for_navigation, wait_for_ready_state
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0'
+]
+
+# Halaman yang hanya bisa dibuka saat login: (URL, penanda di URL jika di-redirect ke login)
+SESSION_PROBES = {
+    'facebook': ('https://www.facebook.com/me', ('login', 'checkpoint')),
+    'twitter': ('https://twitter.com/home', ('login', 'logout')),
+    'linkedin': ('https://www.linkedin.com/feed/', ('login', 'authwall', 'checkpoint')),
+    'instagram': ('https://www.instagram.com/accounts/edit/', ('login', 'challenge'))
+}
+GUEST_LOGIN_MARKERS = ('login', 'signin', 'sign-in', 'sign_in')
+
+def create_chrome_driver(headless: bool = False, proxy: str = None, user_agents: List[str] = None):
+    """Buat instance Chrome WebDriver baru (dipakai langsung atau oleh DriverPool)"""
+    options = Options()
+    
+    # Basic options
+    if headless:
+        options.add_argument('--headless')
+    
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    
+    # User agent rotation
+    user_agent = random.choice(user_agents or USER_AGENTS)
+    options.add_argument(f'--user-agent={user_agent}')
+    
+    # Window size
+    options.add_argument('--window-size=1366,768')
+    
+    # Proxy setup
+    if proxy:
+        options.add_argument(f'--proxy-server={proxy}')
+    
+    # Disable images untuk speed (optional)
+    # options.add_argument('--disable-images')
+    
+    # Try to find Chrome driver
+    chrome_paths = [
+        'chromedriver.exe',  # Windows
+        '/usr/local/bin/chromedriver',  # Linux/Mac
+        '/usr/bin/chromedriver',
+        'C:\\chromedriver\\chromedriver.exe'  # Windows alternative
+    ]
+    
+    driver_path = None
+    for path in chrome_paths:
+        if os.path.exists(path):
+            driver_path = path
+            break
+    
+    if driver_path:
+        service = Service(driver_path)
+        driver = webdriver.Chrome(service=service, options=options)
+    else:
+        # Try without specifying path (system PATH)
+        driver = webdriver.Chrome(options=options)
+    
+    # Anti-detection measures
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    
+    # Tracker fetch/XHR untuk wait_for_network_idle
+    install_network_tracker(driver)
+    
+    return driver
 
 class SocialMediaBot:
-    def __init__(self):
+    def __init__(self, driver_pool=None, input_mode: str = 'auto', selector_cache=None,
+                 selector_mode: str = 'union', session_store=None, scraper=None):
         self.driver = None
         self.wait = None
         self.current_platform = None
         
+        # Cara mengisi field: human, send_keys, clipboard, insert_text, atau auto
+        self.input_mode = input_mode
+        
+        # Cache selector yang terakhir berhasil per (platform, field); mode 'union' atau 'sequential'
+        self.selector_cache = selector_cache
+        self.selector_mode = selector_mode
+        
+        # Session browser tersimpan per akun/site (opsional) supaya tidak login ulang setiap aksi
+        self.session_store = session_store
+        self._session_script = None
+        
+        # Scraper dengan connection pool (keep-alive) untuk scrape_content
+        self.scraper = scraper or BatchScraper()
+        
+        # Jeda minimum antar aksi (BOT_MIN_PACING / BOT_PACING_JITTER)
+        self.pacer = Pacer()
+        
+        # Pool WebDriver (opsional) supaya tidak cold start Chrome setiap aksi
+        self.driver_pool = driver_pool
+        self._lease = None
+        # True jika acquire_driver terakhir gagal karena semua driver di pool sedang dipakai
+        self.driver_busy = False
+        
         # XPath selectors untuk berbagai platform
         self.selectors = {
             'facebook': {
@@ -85,66 +185,12 @@ class SocialMediaBot:
         }
         
         # User agents untuk rotasi
-        self.user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0'
-        ]
+        self.user_agents = list(USER_AGENTS)
     
     def setup_driver(self, headless: bool = False, proxy: str = None) -> bool:
         """Setup Chrome WebDriver dengan konfigurasi optimal"""
         try:
-            options = Options()
-            
-            # Basic options
-            if headless:
-                options.add_argument('--headless')
-            
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            # User agent rotation
-            user_agent = random.choice(self.user_agents)
-            options.add_argument(f'--user-agent={user_agent}')
-            
-            # Window size
-            options.add_argument('--window-size=1366,768')
-            
-            # Proxy setup
-            if proxy:
-                options.add_argument(f'--proxy-server={proxy}')
-            
-            # Disable images untuk speed (optional)
-            # options.add_argument('--disable-images')
-            
-            # Try to find Chrome driver
-            chrome_paths = [
-                'chromedriver.exe',  # Windows
-                '/usr/local/bin/chromedriver',  # Linux/Mac
-                '/usr/bin/chromedriver',
-                'C:\\chromedriver\\chromedriver.exe'  # Windows alternative
-            ]
-            
-            driver_path = None
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    driver_path = path
-                    break
-            
-            if driver_path:
-                service = Service(driver_path)
-                self.driver = webdriver.Chrome(service=service, options=options)
-            else:
-                # Try without specifying path (system PATH)
-                self.driver = webdriver.Chrome(options=options)
-            
-            # Anti-detection measures
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
+            self.driver = create_chrome_driver(headless=headless, proxy=proxy, user_agents=self.user_agents)
             self.wait = WebDriverWait(self.driver, 20)
             
             print("✅ Chrome WebDriver initialized successfully")
@@ -154,6 +200,40 @@ class SocialMediaBot:
             print(f"❌ Error setting up WebDriver: {e}")
             return False
     
+    def acquire_driver(self, headless: bool = False, proxy: str = None) -> bool:
+        """Lease WebDriver dari pool, atau setup driver baru jika tidak memakai pool"""
+        self.driver_busy = False
+        if self.driver_pool is None:
+            return self.setup_driver(headless=headless, proxy=proxy)
+        
+        try:
+            self._lease = self.driver_pool.acquire(proxy=proxy, headless=headless)
+        except TimeoutError as e:
+            print(f"⚠️  No free WebDriver in pool: {e}")
+            self.driver_busy = True
+            return False
+        except Exception as e:
+            print(f"❌ Error leasing WebDriver: {e}")
+            return False
+        
+        self.driver = self._lease.driver
+        self.wait = WebDriverWait(self.driver, 20)
+        return True
+    
+    def release_driver(self, discard: bool = False):
+        """Kembalikan WebDriver ke pool, atau close jika tidak memakai pool"""
+        self._detach_session_script()
+        
+        if self._lease is None:
+            self.close_driver()
+            return
+        
+        lease = self._lease
+        self._lease = None
+        self.driver = None
+        self.wait = None
+        self.driver_pool.release(lease, discard=discard)
+    
     def close_driver(self):
         """Close WebDriver dengan aman"""
         if self.driver:
@@ -171,31 +251,32 @@ class SocialMediaBot:
         delay = random.uniform(min_seconds, max_seconds)
         time.sleep(delay)
     
-    def human_type(self, element, text: str, delay_range: Tuple[float, float] = (0.05, 0.15)):
-        """Type text seperti manusia"""
-        for char in text:
-            element.send_keys(char)
-            time.sleep(random.uniform(*delay_range))
+    def wait_for_page(self, timeout: float = 15) -> bool:
+        """Tunggu halaman siap (readyState + network idle)"""
+        return wait_for_page(self.driver, timeout=timeout)
     
-    def find_element_flexible(self, xpath_list: List[str], timeout: int = 10):
-        """Find element dengan multiple XPath fallbacks"""
-        for xpath in xpath_list if isinstance(xpath_list, list) else [xpath_list]:
-            try:
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((By.XPATH, xpath))
-                )
-                return element
-            except TimeoutException:
-                continue
-        
-        raise TimeoutException(f"Could not find element with any of the XPaths: {xpath_list}")
+    def wait_for_navigation(self, old_url: str, timeout: float = 20) -> bool:
+        """Tunggu redirect dari old_url selesai"""
+        return wait_for_navigation(self.driver, old_url, timeout=timeout)
+    
+    def human_type(self, element, text: str, delay_range: Tuple[float, float] = (0.05, 0.15),
+                   mode: str = None):
+        """Isi text sesuai input mode (default: self.input_mode)"""
+        enter_text(self.driver, element, text, mode=mode or self.input_mode, delay_range=delay_range)
+    
+    def find_element_flexible(self, xpath_list: List[str], timeout: int = 10, field: str = None):
+        """Find element dengan multiple XPath fallbacks (selector yang terakhir berhasil dicoba dulu)"""
+        return find_element_cached(
+            self.driver, xpath_list, timeout=timeout, scope=self.current_platform, field=field,
+            cache=self.selector_cache, mode=self.selector_mode
+        )
     
     def click_element_safe(self, element):
         """Click element dengan retry dan scroll"""
         try:
             # Scroll to element
             self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            self.human_delay(0.5, 1.0)
+            self.pacer.pace()
             
             # Try normal click
             element.click()
@@ -217,33 +298,82 @@ class SocialMediaBot:
     def test_login(self, account: Dict) -> Dict:
         """Test login untuk akun social media"""
         platform = account['platform'].lower()
+        self.current_platform = platform
         
-        if not self.setup_driver():
+        if not self.acquire_driver(proxy=account.get('proxy') or None):
             return {'success': False, 'message': 'Failed to setup WebDriver'}
         
         try:
-            if platform == 'facebook':
-                return self._test_facebook_login(account)
-            elif platform == 'twitter':
-                return self._test_twitter_login(account)
-            elif platform == 'linkedin':
-                return self._test_linkedin_login(account)
-            elif platform == 'instagram':
-                return self._test_instagram_login(account)
-            else:
-                return {'success': False, 'message': f'Platform {platform} not supported'}
+            return self.login_account(account)
         
         except Exception as e:
             return {'success': False, 'message': f'Login test failed: {str(e)}'}
         
         finally:
-            self.close_driver()
+            self.release_driver()
+    
+    def login_account(self, account: Dict) -> Dict:
+        """Login akun di driver aktif: pakai session tersimpan jika masih valid, full login jika expired"""
+        platform = account['platform'].lower()
+        login_methods = {
+            'facebook': self._test_facebook_login,
+            'twitter': self._test_twitter_login,
+            'linkedin': self._test_linkedin_login,
+            'instagram': self._test_instagram_login
+        }
+        if platform not in login_methods:
+            return {'success': False, 'message': f'Platform {platform} not supported'}
+        
+        probe_url, markers = SESSION_PROBES[platform]
+        if self.restore_session('account', account.get('id'), probe_url, markers):
+            return {'success': True, 'message': f'{platform.title()} session restored', 'session_restored': True}
+        
+        result = login_methods[platform](account)
+        if result['success'] and self.session_store:
+            self.session_store.save(self.driver, 'account', account.get('id'))
+        return result
+    
+    def restore_session(self, target_type: str, target_id: int, probe_url: str, markers: Tuple[str, ...]) -> bool:
+        """Pasang session tersimpan lalu cek dengan membuka halaman yang butuh login"""
+        if not self.session_store or not target_id or not probe_url:
+            return False
+        
+        script_id = self.session_store.restore(self.driver, target_type, target_id)
+        if script_id is None:
+            return False
+        self._session_script = script_id or None
+        
+        try:
+            self.driver.get(probe_url)
+            wait_for_ready_state(self.driver)
+            current_url = self.driver.current_url.lower()
+        except Exception as e:
+            print(f"⚠️  Error checking stored session for {target_type} {target_id}: {e}")
+            self._detach_session_script()
+            self.session_store.clear(self.driver)
+            return False
+        
+        if not any(marker in current_url for marker in markers):
+            return True
+        
+        # Session expired: buang dan mulai full login dari cookies + localStorage kosong
+        print(f"⚠️  Stored session for {target_type} {target_id} expired, logging in again")
+        self._detach_session_script()
+        self.session_store.delete(target_type, target_id)
+        self.session_store.clear(self.driver)
+        return False
+    
+    def _detach_session_script(self):
+        """Lepas script restore localStorage dari driver (restore gagal atau lease selesai)"""
+        if self._session_script and self.driver:
+            self.session_store.detach(self.driver, self._session_script)
+        self._session_script = None
     
     def _test_facebook_login(self, account: Dict) -> Dict:
         """Test Facebook login"""
         try:
             self.driver.get('https://www.facebook.com/login')
-            self.human_delay(2, 4)
+            self.wait_for_page()
             
             # Find email field
             email_field = self.find_element_flexible([
@@ -253,7 +383,7 @@ class SocialMediaBot:
             ])
             
             self.human_type(email_field, account['email'] or account['username'])
-            self.human_delay(1, 2)
+            self.pacer.pace()
             
             # Find password field
             password_field = self.find_element_flexible([
@@ -262,7 +392,7 @@ class SocialMediaBot:
             ])
             
             self.human_type(password_field, account['password'])
-            self.human_delay(1, 2)
+            self.pacer.pace()
             
             # Find and click login button
             login_button = self.find_element_flexible([
@@ -271,8 +401,9 @@ class SocialMediaBot:
                 "//input[@type='submit']"
             ])
             
+            login_page_url = self.driver.current_url
             self.click_element_safe(login_button)
-            self.human_delay(5, 8)
+            self.wait_for_navigation(login_page_url)
             
             # Check if login successful
             current_url = self.driver.current_url
@@ -288,7 +419,7 @@ class SocialMediaBot:
         """Test Twitter login"""
         try:
             self.driver.get('https://twitter.com/i/flow/login')
-            self.human_delay(3, 5)
+            self.wait_for_page()
             
             # Email/username field
             email_field = self.find_element_flexible([
@@ -297,7 +428,7 @@ class SocialMediaBot:
             ])
             
             self.human_type(email_field, account['email'] or account['username'])
-            self.human_delay(1, 2)
+            self.pacer.pace()
             
             # Next button
             next_button = self.find_element_flexible([
@@ -306,7 +437,7 @@ class SocialMediaBot:
             ])
             
             self.click_element_safe(next_button)
-            self.human_delay(2, 4)
+            self.pacer.pace()
             
             # Password field
             password_field = self.find_element_flexible([
@@ -315,7 +446,7 @@ class SocialMediaBot:
             ])
             
             self.human_type(password_field, account['password'])
-            self.human_delay(1, 2)
+            self.pacer.pace()
             
             # Login button
             login_button = self.find_element_flexible([
@@ -323,8 +454,9 @@ class SocialMediaBot:
                 "//div[@role='button' and contains(text(), 'Log in')]"
             ])
             
+            login_page_url = self.driver.current_url
             self.click_element_safe(login_button)
-            self.human_delay(5, 8)
+            self.wait_for_navigation(login_page_url)
             
             # Check success
             current_url = self.driver.current_url
@@ -340,7 +472,7 @@ class SocialMediaBot:
         """Test LinkedIn login"""
         try:
             self.driver.get('https://www.linkedin.com/login')
-            self.human_delay(2, 4)
+            self.wait_for_page()
             
             # Email field
             email_field = self.find_element_flexible([
@@ -349,7 +481,7 @@ class SocialMediaBot:
             ])
             
             self.human_type(email_field, account['email'] or account['username'])
-            self.human_delay(1, 2)
+            self.pacer.pace()
             
             # Password field
             password_field = self.find_element_flexible([
@@ -358,7 +490,7 @@ class SocialMediaBot:
             ])
             
             self.human_type(password_field, account['password'])
-            self.human_delay(1, 2)
+            self.pacer.pace()
             
             # Login button
             login_button = self.find_element_flexible([
@@ -366,8 +498,9 @@ class SocialMediaBot:
                 "//button[@type='submit']"
             ])
             
+            login_page_url = self.driver.current_url
             self.click_element_safe(login_button)
-            self.human_delay(5, 8)
+            self.wait_for_navigation(login_page_url)
             
             # Check success
             current_url = self.driver.current_url
@@ -383,7 +516,7 @@ class SocialMediaBot:
         """Test Instagram login"""
         try:
             self.driver.get('https://www.instagram.com/accounts/login/')
-            self.human_delay(3, 5)
+            self.wait_for_page()
             
             # Username field
             username_field = self.find_element_flexible([
@@ -392,7 +525,7 @@ class SocialMediaBot:
             ])
             
             self.human_type(username_field, account['username'])
-            self.human_delay(1, 2)
+            self.pacer.pace()
             
             # Password field
             password_field = self.find_element_flexible([
@@ -401,7 +534,7 @@ class SocialMediaBot:
             ])
             
             self.human_type(password_field, account['password'])
-            self.human_delay(1, 2)
+            self.pacer.pace()
             
             # Login button
             login_button = self.find_element_flexible([
@@ -409,8 +542,9 @@ class SocialMediaBot:
                 "//button[@type='submit']"
             ])
             
+            login_page_url = self.driver.current_url
             self.click_element_safe(login_button)
-            self.human_delay(5, 8)
+            self.wait_for_navigation(login_page_url)
             
             # Check success
             current_url = self.driver.current_url
@@ -424,12 +558,31 @@ class SocialMediaBot:
     
     def test_guest_login(self, site: Dict) -> Dict:
         """Test login untuk guest posting site"""
-        if not self.setup_driver():
+        self.current_platform = f"guest:{urlparse(site['login_url']).netloc}"
+        
+        if not self.acquire_driver():
             return {'success': False, 'message': 'Failed to setup WebDriver'}
         
+        try:
+            return self.login_guest_site(site)
+        
+        except Exception as e:
+            return {'success': False, 'message': f'Guest site login error: {str(e)}'}
+        
+        finally:
+            self.release_driver()
+    
+    def login_guest_site(self, site: Dict) -> Dict:
+        """Login guest site di driver aktif (session tersimpan dicek lewat post_url)"""
+        if self.restore_session('guest_site', site.get('id'), site.get('post_url'), GUEST_LOGIN_MARKERS):
+            return {'success': True, 'message': 'Guest site session restored', 'session_restored': True}
+        
+        # Mode input per site (guest_sites.input_mode) hanya untuk login ini, default bot tidak diubah
+        mode = site.get('input_mode') or self.input_mode
+        
         try:
             self.driver.get(site['login_url'])
-            self.human_delay(3, 5)
+            self.wait_for_page()
             
             # Try common login field selectors
             username_selectors = [
@@ -454,58 +607,120 @@ class SocialMediaBot:
             
             # Find and fill username
             username_field = self.find_element_flexible(username_selectors)
-            self.human_type(username_field, site['username'])
-            self.human_delay(1, 2)
+            self.human_type(username_field, site['username'], mode=mode)
+            self.pacer.pace()
             
             # Find and fill password
             password_field = self.find_element_flexible(password_selectors)
-            self.human_type(password_field, site['password'])
-            self.human_delay(1, 2)
+            self.human_type(password_field, site['password'], mode=mode)
+            self.pacer.pace()
             
             # Find and click submit
             submit_button = self.find_element_flexible(submit_selectors)
+            login_page_url = self.driver.current_url
             self.click_element_safe(submit_button)
-            self.human_delay(5, 8)
+            self.wait_for_navigation(login_page_url)
             
             # Check if login successful (basic check)
             current_url = self.driver.current_url
             if current_url != site['login_url'] and 'login' not in current_url.lower():
+                if self.session_store:
+                    self.session_store.save(self.driver, 'guest_site', site.get('id'))
                 return {'success': True, 'message': 'Guest site login successful'}
             else:
                 return {'success': False, 'message': 'Guest site login failed'}
         
         except Exception as e:
             return {'success': False, 'message': f'Guest site login error: {str(e)}'}
-        
-        finally:
-            self.close_driver()
     
-    def publish_post(self, post: Dict) -> Dict:
-        """Publish post ke platform yang ditentukan"""
-        platform = post['platform'].lower()
+    def publish_post(self, post: Dict, account: Dict = None, site: Dict = None) -> Dict:
+        """Publish post ke platform yang ditentukan (login dulu jika account/site diberikan)"""
+        return self.publish_posts([post], account=account, site=site)[0]
+    
+    def publish_posts(self, posts: List[Dict], account: Dict = None, site: Dict = None,
+                      tabs: int = 1) -> List[Dict]:
+        """Publish beberapa post milik akun/site yang sama dalam satu session browser
         
-        if not self.setup_driver():
-            return {'success': False, 'message': 'Failed to setup WebDriver'}
+        Login (atau restore session) hanya sekali; dengan tabs > 1 setiap post dibuka
+        di tab bergiliran sehingga halaman post sebelumnya tidak perlu ditutup dulu.
+        Hasil dikembalikan sesuai urutan posts.
+        """
+        if not posts:
+            return []
+        
+        platform = posts[0]['platform'].lower()
+        self.current_platform = platform
         
+        if not self.acquire_driver(proxy=posts[0].get('account_proxy') or None):
+            if self.driver_busy:
+                # Bukan kegagalan publish: pemanggil (worker queue) bisa mengembalikan post ke antrian
+                return [{'success': False, 'retry': True, 'message': 'No free WebDriver available'} for _ in posts]
+            return [{'success': False, 'message': 'Failed to setup WebDriver'} for _ in posts]
+        
+        results = []
+        handles = []
         try:
-            if platform == 'facebook':
-                return self._publish_facebook_post(post)
-            elif platform == 'twitter':
-                return self._publish_twitter_post(post)
-            elif platform == 'linkedin':
-                return self._publish_linkedin_post(post)
-            elif platform == 'instagram':
-                return self._publish_instagram_post(post)
-            elif platform == 'guest_post':
-                return self._publish_guest_post(post)
-            else:
-                return {'success': False, 'message': f'Platform {platform} not supported'}
+            if account or site:
+                login_result = self.login_account(account) if account else self.login_guest_site(site)
+                if not login_result['success']:
+                    return [dict(login_result) for _ in posts]
+            
+            handles.append(self.driver.current_window_handle)
+            for index, post in enumerate(posts):
+                if tabs > 1:
+                    self._switch_to_tab(handles, index % tabs)
+                
+                try:
+                    results.append(self._publish_on_platform(post))
+                except Exception as e:
+                    results.append({'success': False, 'message': f'Publishing failed: {str(e)}'})
+            
+            return results
         
         except Exception as e:
-            return {'success': False, 'message': f'Publishing failed: {str(e)}'}
+            failed = {'success': False, 'message': f'Publishing failed: {str(e)}'}
+            return results + [dict(failed) for _ in posts[len(results):]]
         
         finally:
-            self.close_driver()
+            # Driver dengan tab yang gagal ditutup tidak dikembalikan ke pool
+            self.release_driver(discard=not self._close_extra_tabs(handles))
+    
+    def _publish_on_platform(self, post: Dict) -> Dict:
+        platform = post['platform'].lower()
+        if platform == 'facebook':
+            return self._publish_facebook_post(post)
+        elif platform == 'twitter':
+            return self._publish_twitter_post(post)
+        elif platform == 'linkedin':
+            return self._publish_linkedin_post(post)
+        elif platform == 'instagram':
+            return self._publish_instagram_post(post)
+        elif platform == 'guest_post':
+            return self._publish_guest_post(post)
+        else:
+            return {'success': False, 'message': f'Platform {platform} not supported'}
+    
+    def _switch_to_tab(self, handles: List[str], slot: int):
+        """Pindah ke tab ke-slot, buka tab baru (session/cookies sama) jika belum ada"""
+        if slot < len(handles):
+            self.driver.switch_to.window(handles[slot])
+        else:
+            self.driver.switch_to.new_window('tab')
+            handles.append(self.driver.current_window_handle)
+    
+    def _close_extra_tabs(self, handles: List[str]) -> bool:
+        """Tutup tab tambahan supaya driver kembali ke pool dengan satu tab"""
+        if len(handles) < 2 or not self.driver:
+            return True
+        try:
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            return True
+        except Exception as e:
+            print(f"⚠️  Error closing extra tabs: {e}")
+            return False
     
     def _publish_facebook_post(self, post: Dict) -> Dict:
         """Publish post ke Facebook"""
@@ -533,50 +748,5 @@ class SocialMediaBot:
         return {'success': False, 'message': 'Guest posting implementation pending'}
     
     def scrape_content(self, url: str) -> Dict:
-        """Scrape content dari URL"""
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title
-            title = ''
-            title_tags = soup.find_all(['h1', 'title'])
-            if title_tags:
-                title = title_tags[0].get_text().strip()
-            
-            # Extract content
-            content = ''
-            content_selectors = [
-                'article', '.post-content', '.entry-content', 
-                '.content', 'main', '.post', '.article-content'
-            ]
-            
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    # Remove script and style elements
-                    for script in content_elem(["script", "style"]):
-                        script.decompose()
-                    content = content_elem.get_text().strip()
-                    break
-            
-            if not content:
-                # Fallback: get all paragraph text
-                paragraphs = soup.find_all('p')
-                content = ' '.join([p.get_text().strip() for p in paragraphs])
-            
-            return {
-                'success': True,
-                'title': title,
-                'content': content[:2000],  # Limit content length
-                'url': url
-            }
-        
-        except Exception as e:
-            return {
-                'success': False,
-                'message': f'Content scraping failed: {str(e)}'
-            }
-
+        """Scrape content dari URL (lewat HTTP session yang di-pool)"""
+        return self.scraper.scrape_url(url)
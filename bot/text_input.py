@@ -0,0 +1,97 @@
+"""
+Text Input Strategies untuk semua bot
+Mengisi field dengan cara yang bisa dipilih: ketik per karakter, satu send_keys, paste, atau insertText
+"""
+
+import random
+import sys
+import time
+from typing import Tuple
+
+from selenium.webdriver.common.keys import Keys
+
+INPUT_MODES = ('human', 'send_keys', 'clipboard', 'insert_text', 'auto')
+
+# Mode 'auto': teks pendek (username, password, judul) tetap diketik seperti manusia,
+# teks panjang (isi post/artikel) dimasukkan sekaligus
+AUTO_HUMAN_MAX_CHARS = 60
+
+_SET_VALUE_SCRIPT = """
+const el = arguments[0], text = arguments[1];
+el.focus();
+if (el.isContentEditable) {
+    document.execCommand('insertText', false, text);
+} else {
+    const proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    const setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+    setter.call(el, (el.value || '') + text);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+"""
+
+_COPY_SCRIPT = """
+const text = arguments[0];
+const area = document.createElement('textarea');
+area.value = text;
+area.style.position = 'fixed';
+area.style.opacity = '0';
+document.body.appendChild(area);
+area.select();
+const ok = document.execCommand('copy');
+document.body.removeChild(area);
+return ok;
+"""
+
+
+def resolve_mode(mode: str, text: str) -> str:
+    """Tentukan mode efektif untuk teks ini"""
+    mode = (mode or 'auto').lower()
+    if mode not in INPUT_MODES:
+        mode = 'auto'
+    if mode == 'auto':
+        return 'human' if len(text) <= AUTO_HUMAN_MAX_CHARS else 'insert_text'
+    return mode
+
+
+def enter_text(driver, element, text: str, mode: str = 'auto',
+               delay_range: Tuple[float, float] = (0.05, 0.15)):
+    """Masukkan text ke element sesuai mode input yang dipilih"""
+    mode = resolve_mode(mode, text)
+
+    if mode == 'human':
+        for char in text:
+            element.send_keys(char)
+            time.sleep(random.uniform(*delay_range))
+        return
+
+    if mode == 'send_keys':
+        element.send_keys(text)
+        return
+
+    if mode == 'clipboard' and _paste_from_clipboard(driver, element, text):
+        return
+
+    _insert_text(driver, element, text)
+
+
+def _paste_from_clipboard(driver, element, text: str) -> bool:
+    try:
+        if not driver.execute_script(_COPY_SCRIPT, text):
+            return False
+        modifier = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
+        element.click()
+        element.send_keys(modifier, 'v')
+        return True
+    except Exception as e:
+        print(f"⚠️  Clipboard paste failed, falling back to insertText: {e}")
+        return False
+
+
+def _insert_text(driver, element, text: str):
+    """Satu event insertText lewat CDP (Chrome), fallback ke JavaScript"""
+    try:
+        driver.execute_script('arguments[0].focus();', element)
+        driver.execute_cdp_cmd('Input.insertText', {'text': text})
+    except Exception:
+        driver.execute_script(_SET_VALUE_SCRIPT, element, text)
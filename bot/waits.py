@@ -0,0 +1,148 @@
+"""
+Wait Layer untuk semua bot
+Menunggu kondisi nyata (readyState, URL berubah, element muncul, network idle)
+alih-alih sleep dengan durasi tetap. Jeda "seperti manusia" hanya lewat Pacer.
+"""
+
+import os
+import random
+import time
+from typing import Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+# Dipasang di setiap dokumen baru lewat CDP untuk menghitung fetch/XHR yang masih berjalan
+NETWORK_TRACKER_SCRIPT = """
+(() => {
+    if (window.__pendingRequests !== undefined) return;
+    window.__pendingRequests = 0;
+    const done = () => { window.__pendingRequests = Math.max(0, window.__pendingRequests - 1); };
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function() {
+            window.__pendingRequests++;
+            return originalFetch.apply(this, arguments).finally(done);
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__pendingRequests++;
+        this.addEventListener('loadend', done, {once: true});
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+_NETWORK_STATE_SCRIPT = """
+return [
+    window.__pendingRequests === undefined ? 0 : window.__pendingRequests,
+    performance.getEntriesByType('resource').length,
+    document.readyState
+];
+"""
+
+
+def install_network_tracker(driver) -> bool:
+    """Pasang tracker request di setiap dokumen baru (Chrome CDP)"""
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': NETWORK_TRACKER_SCRIPT})
+        return True
+    except Exception:
+        return False
+
+
+def wait_for_ready_state(driver, timeout: float = 15) -> bool:
+    """Tunggu sampai document.readyState == 'complete'"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script('return document.readyState') == 'complete'
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_network_idle(driver, idle_time: float = 0.5, timeout: float = 15) -> bool:
+    """Tunggu sampai tidak ada request berjalan dan jumlah resource stabil selama idle_time"""
+    deadline = time.monotonic() + timeout
+    last_count = None
+    idle_since = None
+
+    while time.monotonic() < deadline:
+        try:
+            pending, resource_count, ready_state = driver.execute_script(_NETWORK_STATE_SCRIPT)
+        except Exception:
+            return False
+
+        now = time.monotonic()
+        if pending == 0 and ready_state == 'complete' and resource_count == last_count:
+            idle_since = idle_since or now
+            if now - idle_since >= idle_time:
+                return True
+        else:
+            idle_since = None
+
+        last_count = resource_count
+        time.sleep(0.1)
+
+    return False
+
+
+def wait_for_page(driver, timeout: float = 15, idle_time: float = 0.5) -> bool:
+    """Halaman siap: readyState complete lalu network idle"""
+    start = time.monotonic()
+    if not wait_for_ready_state(driver, timeout):
+        return False
+    remaining = max(0.0, timeout - (time.monotonic() - start))
+    return wait_for_network_idle(driver, idle_time=idle_time, timeout=remaining)
+
+
+def wait_for_url_change(driver, old_url: str, timeout: float = 20) -> bool:
+    """Tunggu sampai URL berubah dari old_url (misalnya redirect setelah login)"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(EC.url_changes(old_url))
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_navigation(driver, old_url: str, timeout: float = 20) -> bool:
+    """Tunggu URL berubah lalu halaman baru siap"""
+    start = time.monotonic()
+    changed = wait_for_url_change(driver, old_url, timeout)
+    remaining = max(1.0, timeout - (time.monotonic() - start))
+    wait_for_page(driver, timeout=remaining)
+    return changed
+
+
+def wait_for_element(driver, xpath: str, timeout: float = 10, clickable: bool = False):
+    """Tunggu element muncul (atau clickable); None jika timeout"""
+    condition = EC.element_to_be_clickable if clickable else EC.presence_of_element_located
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(condition((By.XPATH, xpath)))
+    except TimeoutException:
+        return None
+
+
+class Pacer:
+    """Kebijakan jeda minimum antar aksi; hanya menunggu sisa waktu yang belum lewat"""
+
+    def __init__(self, min_interval: Optional[float] = None, jitter: Optional[float] = None):
+        if min_interval is None:
+            min_interval = float(os.environ.get('BOT_MIN_PACING', 0.5))
+        if jitter is None:
+            jitter = float(os.environ.get('BOT_PACING_JITTER', 0.5))
+        self.min_interval = max(0.0, min_interval)
+        self.jitter = max(0.0, jitter)
+        self._last_action = 0.0
+
+    def pace(self):
+        """Pastikan jarak dari aksi sebelumnya minimal min_interval (+ jitter acak)"""
+        target = self.min_interval + random.uniform(0, self.jitter)
+        elapsed = time.monotonic() - self._last_action
+        if elapsed < target:
+            time.sleep(target - elapsed)
+        self._last_action = time.monotonic()
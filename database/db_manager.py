@@ -6,12 +6,322 @@ Menggunakan SQLite untuk kemudahan deployment di Windows
 import sqlite3
 import os
 import json
-from datetime import datetime
-from typing import Dict, List, Optional
+import re
+import base64
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from database.fingerprint import fingerprint, hamming_distance, simhash_bands, NEAR_DUPLICATE_DISTANCE
+
+# PRAGMA yang dijalankan sekali saat koneksi dibuka
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -16000',  # ~16 MB page cache
+    'PRAGMA busy_timeout = 5000',
+    'PRAGMA temp_store = MEMORY',
+)
+
+# Schema migrations berversi (PRAGMA user_version); tambahkan versi baru di akhir list
+SCHEMA_MIGRATIONS = [
+    (1, [
+        # Listing posts (ORDER BY created_at) dan filter status (automation, dashboard counts)
+        'CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts (created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_posts_status_created_at ON posts (status, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_posts_platform ON posts (platform)',
+        'CREATE INDEX IF NOT EXISTS idx_posts_account_id ON posts (account_id)',
+        'CREATE INDEX IF NOT EXISTS idx_posts_guest_site_id ON posts (guest_site_id)',
+        'CREATE INDEX IF NOT EXISTS idx_social_accounts_created_at ON social_accounts (created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_social_accounts_status ON social_accounts (status)',
+        'CREATE INDEX IF NOT EXISTS idx_guest_sites_created_at ON guest_sites (created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_guest_sites_status ON guest_sites (status)',
+        'CREATE INDEX IF NOT EXISTS idx_scraped_content_scraped_at ON scraped_content (scraped_at)',
+        'CREATE INDEX IF NOT EXISTS idx_automation_logs_created_at ON automation_logs (created_at)',
+        # Antrian automation: lease task dan progress per job
+        'CREATE INDEX IF NOT EXISTS idx_job_tasks_status ON job_tasks (status, id)',
+        'CREATE INDEX IF NOT EXISTS idx_job_tasks_job_id ON job_tasks (job_id, status)',
+    ]),
+    (2, [
+        # Ringkasan jumlah posts per (platform, status), dijaga oleh trigger untuk dashboard
+        '''
+        CREATE TABLE IF NOT EXISTS post_stats (
+            platform TEXT NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (platform, status)
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_posts_stats_insert AFTER INSERT ON posts
+        BEGIN
+            INSERT INTO post_stats (platform, status, count)
+            VALUES (NEW.platform, COALESCE(NEW.status, ''), 1)
+            ON CONFLICT (platform, status) DO UPDATE SET count = count + 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_posts_stats_delete AFTER DELETE ON posts
+        BEGIN
+            UPDATE post_stats SET count = count - 1
+            WHERE platform = OLD.platform AND status = COALESCE(OLD.status, '');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_posts_stats_update AFTER UPDATE OF platform, status ON posts
+        WHEN OLD.platform IS NOT NEW.platform OR OLD.status IS NOT NEW.status
+        BEGIN
+            UPDATE post_stats SET count = count - 1
+            WHERE platform = OLD.platform AND status = COALESCE(OLD.status, '');
+            INSERT INTO post_stats (platform, status, count)
+            VALUES (NEW.platform, COALESCE(NEW.status, ''), 1)
+            ON CONFLICT (platform, status) DO UPDATE SET count = count + 1;
+        END
+        ''',
+        'DELETE FROM post_stats',
+        '''
+        INSERT INTO post_stats (platform, status, count)
+        SELECT platform, COALESCE(status, ''), COUNT(*) FROM posts GROUP BY platform, COALESCE(status, '')
+        ''',
+    ]),
+    (3, [
+        # Full-text search (FTS5, external content) untuk content library dan posts
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS scraped_content_fts USING fts5(
+            title, content, tags, content='scraped_content', content_rowid='id'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_scraped_content_fts_insert AFTER INSERT ON scraped_content
+        BEGIN
+            INSERT INTO scraped_content_fts (rowid, title, content, tags)
+            VALUES (NEW.id, NEW.title, NEW.content, NEW.tags);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_scraped_content_fts_delete AFTER DELETE ON scraped_content
+        BEGIN
+            INSERT INTO scraped_content_fts (scraped_content_fts, rowid, title, content, tags)
+            VALUES ('delete', OLD.id, OLD.title, OLD.content, OLD.tags);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_scraped_content_fts_update AFTER UPDATE OF title, content, tags ON scraped_content
+        BEGIN
+            INSERT INTO scraped_content_fts (scraped_content_fts, rowid, title, content, tags)
+            VALUES ('delete', OLD.id, OLD.title, OLD.content, OLD.tags);
+            INSERT INTO scraped_content_fts (rowid, title, content, tags)
+            VALUES (NEW.id, NEW.title, NEW.content, NEW.tags);
+        END
+        ''',
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+            content, hashtags, content='posts', content_rowid='id'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_posts_fts_insert AFTER INSERT ON posts
+        BEGIN
+            INSERT INTO posts_fts (rowid, content, hashtags) VALUES (NEW.id, NEW.content, NEW.hashtags);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_posts_fts_delete AFTER DELETE ON posts
+        BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, content, hashtags)
+            VALUES ('delete', OLD.id, OLD.content, OLD.hashtags);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_posts_fts_update AFTER UPDATE OF content, hashtags ON posts
+        BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, content, hashtags)
+            VALUES ('delete', OLD.id, OLD.content, OLD.hashtags);
+            INSERT INTO posts_fts (rowid, content, hashtags) VALUES (NEW.id, NEW.content, NEW.hashtags);
+        END
+        ''',
+        "INSERT INTO scraped_content_fts (scraped_content_fts) VALUES ('rebuild')",
+        "INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')",
+    ]),
+    (4, [
+        # Input mode per guest site (human, send_keys, clipboard, insert_text, auto)
+        'ALTER TABLE guest_sites ADD COLUMN input_mode TEXT',
+    ]),
+    (5, [
+        # XPath yang terakhir berhasil per (platform/site, field) untuk find_element_flexible
+        '''
+        CREATE TABLE IF NOT EXISTS selector_cache (
+            scope TEXT NOT NULL,
+            field TEXT NOT NULL,
+            xpath TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (scope, field)
+        )
+        ''',
+    ]),
+    (6, [
+        # Session browser terenkripsi (cookies + localStorage) per social account / guest site
+        '''
+        CREATE TABLE IF NOT EXISTS browser_sessions (
+            target_type TEXT NOT NULL,
+            target_id INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (target_type, target_id)
+        )
+        ''',
+    ]),
+    (7, [
+        # Validator HTTP per URL untuk conditional request scraper
+        '''
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body_hash TEXT,
+            body_size INTEGER DEFAULT 0,
+            fetched_at TIMESTAMP,
+            checked_at TIMESTAMP
+        )
+        ''',
+    ]),
+    (8, [
+        # Ingest WordPress REST API: kategori terstruktur, upsert per URL, high-water mark per source
+        'ALTER TABLE scraped_content ADD COLUMN categories TEXT',
+        'CREATE INDEX IF NOT EXISTS idx_scraped_content_source_url ON scraped_content (source_url)',
+        '''
+        CREATE TABLE IF NOT EXISTS content_sources (
+            source_url TEXT PRIMARY KEY,
+            source_type TEXT NOT NULL,
+            api_url TEXT,
+            high_water_mark TEXT,
+            last_polled_at TIMESTAMP,
+            items_ingested INTEGER DEFAULT 0
+        )
+        ''',
+    ]),
+    (9, [
+        # Fingerprint konten: SHA-256 teks ternormalisasi + SimHash (diisi oleh backfill_fingerprints)
+        'ALTER TABLE scraped_content ADD COLUMN content_hash TEXT',
+        'ALTER TABLE scraped_content ADD COLUMN simhash INTEGER',
+        'ALTER TABLE posts ADD COLUMN content_hash TEXT',
+        'ALTER TABLE posts ADD COLUMN simhash INTEGER',
+        'CREATE INDEX IF NOT EXISTS idx_scraped_content_content_hash ON scraped_content (content_hash)',
+        'CREATE INDEX IF NOT EXISTS idx_posts_content_hash ON posts (content_hash)',
+        # Band 16-bit dari SimHash untuk mencari kandidat near-duplicate lewat index
+        '''
+        CREATE TABLE IF NOT EXISTS simhash_bands (
+            target_type TEXT NOT NULL,
+            target_id INTEGER NOT NULL,
+            band INTEGER NOT NULL,
+            value INTEGER NOT NULL,
+            PRIMARY KEY (target_type, target_id, band)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_simhash_bands_lookup ON simhash_bands (target_type, band, value)',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_scraped_content_bands_delete AFTER DELETE ON scraped_content
+        BEGIN
+            DELETE FROM simhash_bands WHERE target_type = 'scraped_content' AND target_id = OLD.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_posts_bands_delete AFTER DELETE ON posts
+        BEGIN
+            DELETE FROM simhash_bands WHERE target_type = 'posts' AND target_id = OLD.id;
+        END
+        ''',
+    ]),
+    (10, [
+        # Cache response OpenAI (LRU lewat last_used_at, TTL lewat created_at)
+        '''
+        CREATE TABLE IF NOT EXISTS ai_response_cache (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT,
+            response TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            last_used_at TIMESTAMP NOT NULL,
+            hits INTEGER DEFAULT 0
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_ai_response_cache_last_used ON ai_response_cache (last_used_at)',
+    ]),
+    (11, [
+        # Token per panggilan OpenAI (cached = dilayani response cache, token tidak dibayar)
+        '''
+        CREATE TABLE IF NOT EXISTS ai_usage (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TIMESTAMP NOT NULL,
+            model TEXT,
+            operation TEXT,
+            prompt_tokens INTEGER DEFAULT 0,
+            completion_tokens INTEGER DEFAULT 0,
+            max_tokens INTEGER,
+            cached INTEGER DEFAULT 0,
+            estimated INTEGER DEFAULT 0
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_ai_usage_created_at ON ai_usage (created_at)',
+    ]),
+]
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    """Encode posisi keyset (sort_value, id) menjadi cursor opaque untuk API"""
+    raw = json.dumps([sort_value, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Optional[Tuple]:
+    """Decode cursor dari encode_cursor; None jika cursor kosong atau tidak valid"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+def next_page_cursor(rows: List[Dict], limit: Optional[int], sort_key: str = 'created_at') -> Optional[str]:
+    """Cursor halaman berikutnya, atau None jika halaman ini yang terakhir"""
+    if not limit or len(rows) < limit:
+        return None
+    return encode_cursor(rows[-1][sort_key], rows[-1]['id'])
+
+def build_fts_query(text: str) -> str:
+    """Ubah input user menjadi query FTS5 yang aman: semua kata wajib, kata terakhir prefix match"""
+    terms = re.findall(r'\w+', text or '', flags=re.UNICODE)
+    if not terms:
+        return ''
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+# Kolom yang boleh diisi lewat bulk insert/update
+POST_COLUMNS = ('platform', 'content', 'account_id', 'guest_site_id', 'title', 'image_path',
+                'hashtags', 'status', 'scheduled_time', 'published_at', 'error_message')
+CONTENT_COLUMNS = ('title', 'content', 'source_url', 'scraped_at', 'tags', 'categories')
+BULK_CHUNK_SIZE = 500
+# Post dianggap duplikat hanya jika untuk platform + akun/site yang sama
+POST_DUPLICATE_SCOPE = ('platform', 'account_id', 'guest_site_id')
+
+class ThreadConnection(sqlite3.Connection):
+    """Koneksi yang dipegang satu thread sampai dikembalikan ke pool: close() hanya membatalkan
+    transaksi yang belum di-commit"""
+    
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+    
+    def close_for_real(self):
+        super().close()
 
 class DatabaseManager:
-    def __init__(self, db_path: str = 'database/social_automation.db'):
+    def __init__(self, db_path: str = 'database/social_automation.db', pool_size: int = 8):
         self.db_path = db_path
+        self._local = threading.local()
+        # Koneksi idle yang siap dipakai thread lain (Werkzeug membuat thread baru per request)
+        self._pool = queue.Queue(maxsize=pool_size)
         self.ensure_db_directory()
     
     def ensure_db_directory(self):
@@ -20,12 +330,49 @@ class DatabaseManager:
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir)
     
-    def get_connection(self):
-        """Dapatkan koneksi database"""
-        conn = sqlite3.connect(self.db_path)
+    def _open_connection(self) -> ThreadConnection:
+        # check_same_thread=False: koneksi berpindah thread lewat pool, tapi hanya dipegang satu thread
+        conn = sqlite3.connect(self.db_path, timeout=5.0, factory=ThreadConnection, check_same_thread=False)
         conn.row_factory = sqlite3.Row  # Untuk akses kolom by name
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
     
+    def get_connection(self):
+        """Dapatkan koneksi database (diambil dari pool sekali per thread lalu dipakai ulang
+        sampai release_connection)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._open_connection()
+            self._local.conn = conn
+        if conn.in_transaction:
+            # Sisa transaksi dari method yang gagal sebelum commit
+            conn.rollback()
+        return conn
+    
+    def release_connection(self):
+        """Kembalikan koneksi thread ini ke pool (dipanggil di akhir setiap request)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close_for_real()
+    
+    def close_connection(self):
+        """Tutup koneksi milik thread ini (misalnya saat worker thread berhenti)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close_for_real()
+    
     def init_database(self):
         """Inisialisasi database dengan tabel-tabel yang diperlukan"""
         conn = self.get_connection()
@@ -125,10 +472,105 @@ class DatabaseManager:
             )
         ''')
         
+        # Tabel untuk automation jobs (antrian publish di background)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS automation_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_type TEXT NOT NULL DEFAULT 'publish',
+                status TEXT DEFAULT 'queued',
+                total INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        ''')
+        
+        # Tabel untuk task per post di dalam automation job
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER NOT NULL,
+                post_id INTEGER NOT NULL,
+                status TEXT DEFAULT 'queued',
+                attempts INTEGER DEFAULT 0,
+                worker_id TEXT,
+                leased_until TIMESTAMP,
+                message TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP,
+                FOREIGN KEY (job_id) REFERENCES automation_jobs (id),
+                FOREIGN KEY (post_id) REFERENCES posts (id)
+            )
+        ''')
+        
         conn.commit()
         conn.close()
+        
+        self.run_migrations()
+        self.backfill_fingerprints()
         print("✅ Database initialized successfully")
     
+    def run_migrations(self) -> int:
+        """Jalankan schema migrations yang belum diterapkan, return versi schema saat ini"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        current_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+        for version, statements in SCHEMA_MIGRATIONS:
+            if version <= current_version:
+                continue
+            
+            try:
+                cursor.execute('BEGIN IMMEDIATE')
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute(f'PRAGMA user_version = {int(version)}')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            
+            current_version = version
+            print(f"✅ Schema migrated to version {version}")
+        
+        cursor.execute('ANALYZE')
+        conn.commit()
+        conn.close()
+        return current_version
+    
+    def backfill_fingerprints(self, chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        """Hitung fingerprint untuk baris lama yang belum punya content_hash"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        total = 0
+        try:
+            for table in ('scraped_content', 'posts'):
+                while True:
+                    rows = cursor.execute(
+                        f'SELECT id, content FROM {table} WHERE content_hash IS NULL LIMIT ?', (chunk_size,)
+                    ).fetchall()
+                    if not rows:
+                        break
+                    
+                    cursor.execute('BEGIN IMMEDIATE')
+                    fingerprints = [(row['id'],) + fingerprint(row['content']) for row in rows]
+                    cursor.executemany(
+                        f'UPDATE {table} SET content_hash = ?, simhash = ? WHERE id = ?',
+                        [(content_hash, simhash_value, row_id) for row_id, content_hash, simhash_value in fingerprints]
+                    )
+                    self._save_simhash_bands(cursor, table, [(row_id, value) for row_id, _, value in fingerprints])
+                    conn.commit()
+                    total += len(rows)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        if total:
+            print(f"✅ Fingerprinted {total} existing rows")
+        return total
+    
     # Social Accounts Methods
     def add_account(self, platform: str, username: str, email: str, password: str, 
                    proxy: str = '', notes: str = '') -> Dict:
@@ -157,13 +599,34 @@ class DatabaseManager:
                 'message': f'Error adding account: {str(e)}'
             }
     
-    def get_all_accounts(self) -> List[Dict]:
-        """Dapatkan semua akun social media"""
+    def _keyset_query(self, base_query: str, sort_column: str, id_column: str,
+                      limit: Optional[int], cursor: Optional[str], params: List = None) -> Tuple[str, List]:
+        """Tambahkan filter keyset (sort_column, id) DESC dan LIMIT ke query"""
+        params = list(params or [])
+        position = decode_cursor(cursor)
+        
+        query = base_query
+        if position:
+            joiner = ' AND ' if ' WHERE ' in base_query else ' WHERE '
+            query += f"{joiner}({sort_column}, {id_column}) < (?, ?)"
+            params.extend(position)
+        
+        query += f' ORDER BY {sort_column} DESC, {id_column} DESC'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return query, params
+    
+    def get_all_accounts(self, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Dapatkan akun social media (keyset pagination dengan limit/cursor)"""
         conn = self.get_connection()
-        cursor = conn.cursor()
+        db_cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM social_accounts ORDER BY created_at DESC')
-        accounts = [dict(row) for row in cursor.fetchall()]
+        query, params = self._keyset_query(
+            'SELECT * FROM social_accounts', 'created_at', 'id', limit, cursor
+        )
+        db_cursor.execute(query, params)
+        accounts = [dict(row) for row in db_cursor.fetchall()]
         
         conn.close()
         return accounts
@@ -213,6 +676,9 @@ class DatabaseManager:
             cursor = conn.cursor()
             
             cursor.execute('DELETE FROM social_accounts WHERE id = ?', (account_id,))
+            cursor.execute(
+                "DELETE FROM browser_sessions WHERE target_type = 'account' AND target_id = ?", (account_id,)
+            )
             
             conn.commit()
             conn.close()
@@ -223,16 +689,16 @@ class DatabaseManager:
     
     # Guest Sites Methods
     def add_guest_site(self, name: str, url: str, login_url: str, username: str, 
-                      password: str, post_url: str = '', notes: str = '') -> Dict:
+                      password: str, post_url: str = '', notes: str = '', input_mode: str = None) -> Dict:
         """Tambah guest posting site baru"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
-                INSERT INTO guest_sites (name, url, login_url, username, password, post_url, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (name, url, login_url, username, password, post_url, notes))
+                INSERT INTO guest_sites (name, url, login_url, username, password, post_url, notes, input_mode)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (name, url, login_url, username, password, post_url, notes, input_mode))
             
             site_id = cursor.lastrowid
             conn.commit()
@@ -275,22 +741,19 @@ class DatabaseManager:
     def add_post(self, platform: str, content: str, account_id: int = None, 
                 guest_site_id: int = None, scheduled_time: str = None, 
                 image_path: str = '', hashtags: str = '', status: str = 'draft',
-                title: str = '') -> Dict:
-        """Tambah post baru"""
+                title: str = '', allow_duplicate: bool = False) -> Dict:
+        """Tambah post baru (ditolak jika duplikat post lain untuk platform + akun yang sama)"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            post_ids, duplicates = self._bulk_insert('posts', (
+                'platform', 'content', 'account_id', 'guest_site_id', 'scheduled_time',
+                'image_path', 'hashtags', 'status', 'title'
+            ), [(platform, content, account_id, guest_site_id, scheduled_time,
+                 image_path, hashtags, status, title)],
+                scope_columns=POST_DUPLICATE_SCOPE, allow_duplicates=allow_duplicate)
             
-            cursor.execute('''
-                INSERT INTO posts (platform, content, account_id, guest_site_id, 
-                                 scheduled_time, image_path, hashtags, status, title)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (platform, content, account_id, guest_site_id, scheduled_time, 
-                  image_path, hashtags, status, title))
-            
-            post_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            if duplicates:
+                return self._duplicate_result('post', duplicates[0])
+            post_id = post_ids[0]
             
             return {
                 'success': True,
@@ -303,19 +766,223 @@ class DatabaseManager:
                 'message': f'Error adding post: {str(e)}'
             }
     
-    def get_all_posts(self) -> List[Dict]:
-        """Dapatkan semua posts"""
+    def _find_duplicate(self, cursor, table: str, content_hash: str, simhash_value: int,
+                        scope: Dict = None) -> Optional[Dict]:
+        """Baris di table yang sama persis (content_hash) atau hampir sama (SimHash) dalam scope"""
+        scope = scope or {}
+        scope_sql = ''.join(f' AND t.{column} IS ?' for column in scope)
+        
+        row = cursor.execute(
+            f'SELECT t.id FROM {table} t WHERE t.content_hash = ?{scope_sql} ORDER BY t.id LIMIT 1',
+            (content_hash,) + tuple(scope.values())
+        ).fetchone()
+        if row:
+            return {'duplicate_of': row[0], 'match': 'exact', 'distance': 0}
+        
+        # Kandidat: minimal satu band 16-bit sama, lalu cek jarak Hamming sebenarnya
+        bands = simhash_bands(simhash_value)
+        band_sql = ' OR '.join('(b.band = ? AND b.value = ?)' for _ in bands)
+        candidates = cursor.execute(f'''
+            SELECT DISTINCT t.id, t.simhash FROM simhash_bands b
+            JOIN {table} t ON t.id = b.target_id
+            WHERE b.target_type = ? AND ({band_sql}){scope_sql}
+            ORDER BY t.id
+        ''', (table,) + tuple(value for band in bands for value in band) + tuple(scope.values())).fetchall()
+        for candidate_id, candidate_simhash in candidates:
+            distance = hamming_distance(simhash_value, candidate_simhash)
+            if distance <= NEAR_DUPLICATE_DISTANCE:
+                return {'duplicate_of': candidate_id, 'match': 'near', 'distance': distance}
+        return None
+    
+    def _save_simhash_bands(self, cursor, table: str, fingerprints) -> None:
+        """Simpan / ganti band SimHash untuk [(id, simhash)]"""
+        cursor.executemany(
+            'INSERT OR REPLACE INTO simhash_bands (target_type, target_id, band, value) VALUES (?, ?, ?, ?)',
+            [(table, target_id, band, value)
+             for target_id, simhash_value in fingerprints
+             for band, value in simhash_bands(simhash_value)]
+        )
+    
+    @staticmethod
+    def _duplicate_result(label: str, duplicate: Dict) -> Dict:
+        match = 'Duplicate' if duplicate['match'] == 'exact' else 'Near-duplicate'
+        return {
+            'success': False,
+            'duplicate': True,
+            'message': f"{match} {label} of #{duplicate['duplicate_of']}, not added",
+            **{key: value for key, value in duplicate.items() if key != 'index'}
+        }
+    
+    @staticmethod
+    def _find_batch_duplicate(seen: Dict, content_hash: str, simhash_value: int,
+                              scope_key: Tuple) -> Optional[Dict]:
+        """Seperti _find_duplicate, tapi terhadap baris sebelumnya dalam batch yang sama"""
+        index = seen['exact'].get((content_hash,) + scope_key)
+        if index is not None:
+            return {'duplicate_of_index': index, 'match': 'exact', 'distance': 0}
+        
+        candidates = set()
+        for band in simhash_bands(simhash_value):
+            candidates.update(seen['bands'].get(band + scope_key, ()))
+        for candidate_index, candidate_simhash in sorted(candidates):
+            distance = hamming_distance(simhash_value, candidate_simhash)
+            if distance <= NEAR_DUPLICATE_DISTANCE:
+                return {'duplicate_of_index': candidate_index, 'match': 'near', 'distance': distance}
+        return None
+    
+    @staticmethod
+    def _remember_batch_row(seen: Dict, index: int, content_hash: str, simhash_value: int, scope_key: Tuple):
+        seen['exact'][(content_hash,) + scope_key] = index
+        for band in simhash_bands(simhash_value):
+            seen['bands'].setdefault(band + scope_key, []).append((index, simhash_value))
+    
+    def _bulk_insert(self, table: str, columns: Tuple[str, ...], rows: List[Tuple],
+                     chunk_size: int = BULK_CHUNK_SIZE, scope_columns: Tuple[str, ...] = (),
+                     allow_duplicates: bool = False) -> Tuple[List[int], List[Dict]]:
+        """Insert banyak baris dalam satu transaksi (executemany per chunk) beserta fingerprint kolom content
+        
+        Baris yang duplikat (persis / SimHash dekat) dengan data yang ada dalam scope_columns yang sama
+        dilewati kecuali allow_duplicates. Return (id yang dibuat, duplikat yang dilewati).
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
+        all_columns = tuple(columns) + ('content_hash', 'simhash')
+        placeholders = ', '.join('?' for _ in all_columns)
+        query = f"INSERT INTO {table} ({', '.join(all_columns)}) VALUES ({placeholders})"
+        content_index = columns.index('content')
+        scope_indexes = [columns.index(column) for column in scope_columns]
         
-        cursor.execute('''
-            SELECT p.*, sa.username as account_username, gs.name as guest_site_name
+        ids = []
+        duplicates = []
+        # Baris batch yang sudah diterima: belum ada di tabel selama chunk-nya belum di-insert
+        seen = {'exact': {}, 'bands': {}}
+        try:
+            # BEGIN IMMEDIATE: tidak ada writer lain, jadi id AUTOINCREMENT per chunk berurutan
+            cursor.execute('BEGIN IMMEDIATE')
+            for start in range(0, len(rows), chunk_size):
+                chunk = []
+                for index in range(start, min(start + chunk_size, len(rows))):
+                    row = rows[index]
+                    content_hash, simhash_value = fingerprint(row[content_index])
+                    
+                    if not allow_duplicates:
+                        scope = {column: row[i] for column, i in zip(scope_columns, scope_indexes)}
+                        scope_key = tuple(scope.values())
+                        duplicate = self._find_batch_duplicate(seen, content_hash, simhash_value, scope_key)
+                        if duplicate:
+                            duplicates.append(dict(duplicate, index=index))
+                            continue
+                        duplicate = self._find_duplicate(cursor, table, content_hash, simhash_value, scope)
+                        if duplicate:
+                            duplicates.append(dict(duplicate, index=index))
+                            continue
+                        self._remember_batch_row(seen, index, content_hash, simhash_value, scope_key)
+                    
+                    chunk.append(tuple(row) + (content_hash, simhash_value))
+                
+                if not chunk:
+                    continue
+                cursor.executemany(query, chunk)
+                last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+                chunk_ids = list(range(last_id - len(chunk) + 1, last_id + 1))
+                self._save_simhash_bands(cursor, table, zip(chunk_ids, (row[-1] for row in chunk)))
+                ids.extend(chunk_ids)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        return ids, duplicates
+    
+    def add_posts_bulk(self, posts: List[Dict], chunk_size: int = BULK_CHUNK_SIZE,
+                       allow_duplicates: bool = False) -> Dict:
+        """Tambah banyak post sekaligus dalam satu transaksi"""
+        try:
+            rows = []
+            for post in posts:
+                if not post.get('platform') or not post.get('content'):
+                    raise ValueError('platform and content are required for every post')
+                rows.append((
+                    post['platform'], post['content'], post.get('account_id'), post.get('guest_site_id'),
+                    post.get('scheduled_time'), post.get('image_path', ''), post.get('hashtags', ''),
+                    post.get('status', 'draft'), post.get('title', '')
+                ))
+            
+            post_ids, duplicates = self._bulk_insert('posts', (
+                'platform', 'content', 'account_id', 'guest_site_id', 'scheduled_time',
+                'image_path', 'hashtags', 'status', 'title'
+            ), rows, chunk_size, scope_columns=POST_DUPLICATE_SCOPE, allow_duplicates=allow_duplicates)
+            
+            return {
+                'success': True,
+                'message': f'{len(post_ids)} posts added successfully, {len(duplicates)} duplicates skipped',
+                'post_ids': post_ids,
+                'duplicates': duplicates
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Error adding posts: {str(e)}'
+            }
+    
+    def update_posts_bulk(self, updates: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+        """Update banyak post sekaligus; setiap item berisi 'id' dan kolom yang diubah"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = datetime.now().isoformat()
+        
+        # Kelompokkan berdasarkan kombinasi kolom supaya bisa executemany
+        groups: Dict[Tuple[str, ...], List[Tuple]] = {}
+        fingerprints = []
+        try:
+            for update in updates:
+                fields = tuple(sorted(key for key in update if key != 'id'))
+                invalid = [field for field in fields if field not in POST_COLUMNS]
+                if invalid:
+                    raise ValueError(f"Unknown post fields: {', '.join(invalid)}")
+                if 'id' not in update or not fields:
+                    raise ValueError('Every update needs an id and at least one field')
+                if 'content' in fields:
+                    # Fingerprint ikut diperbarui saat isi post berubah
+                    update = dict(update, **dict(zip(('content_hash', 'simhash'), fingerprint(update['content']))))
+                    fields = tuple(sorted(fields + ('content_hash', 'simhash')))
+                    fingerprints.append((update['id'], update['simhash']))
+                groups.setdefault(fields, []).append(
+                    tuple(update[field] for field in fields) + (now, update['id'])
+                )
+            
+            cursor.execute('BEGIN IMMEDIATE')
+            updated = 0
+            for fields, rows in groups.items():
+                query = f"UPDATE posts SET {', '.join(f'{field} = ?' for field in fields)}, updated_at = ? WHERE id = ?"
+                for start in range(0, len(rows), chunk_size):
+                    cursor.executemany(query, rows[start:start + chunk_size])
+                    updated += cursor.rowcount
+            self._save_simhash_bands(cursor, 'posts', fingerprints)
+            conn.commit()
+            
+            return {'success': True, 'message': f'{updated} posts updated successfully', 'updated': updated}
+        except Exception as e:
+            conn.rollback()
+            return {'success': False, 'message': f'Error updating posts: {str(e)}'}
+        finally:
+            conn.close()
+    
+    def get_all_posts(self, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Dapatkan posts (keyset pagination dengan limit/cursor)"""
+        conn = self.get_connection()
+        db_cursor = conn.cursor()
+        
+        query, params = self._keyset_query('''
+            SELECT p.*, sa.username as account_username, sa.proxy as account_proxy, gs.name as guest_site_name
             FROM posts p
             LEFT JOIN social_accounts sa ON p.account_id = sa.id
             LEFT JOIN guest_sites gs ON p.guest_site_id = gs.id
-            ORDER BY p.created_at DESC
-        ''')
-        posts = [dict(row) for row in cursor.fetchall()]
+        ''', 'p.created_at', 'p.id', limit, cursor)
+        db_cursor.execute(query, params)
+        posts = [dict(row) for row in db_cursor.fetchall()]
         
         conn.close()
         return posts
@@ -326,7 +993,7 @@ class DatabaseManager:
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT p.*, sa.username as account_username, gs.name as guest_site_name
+            SELECT p.*, sa.username as account_username, sa.proxy as account_proxy, gs.name as guest_site_name
             FROM posts p
             LEFT JOIN social_accounts sa ON p.account_id = sa.id
             LEFT JOIN guest_sites gs ON p.guest_site_id = gs.id
@@ -343,7 +1010,7 @@ class DatabaseManager:
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT p.*, sa.username as account_username, gs.name as guest_site_name
+            SELECT p.*, sa.username as account_username, sa.proxy as account_proxy, gs.name as guest_site_name
             FROM posts p
             LEFT JOIN social_accounts sa ON p.account_id = sa.id
             LEFT JOIN guest_sites gs ON p.guest_site_id = gs.id
@@ -361,6 +1028,10 @@ class DatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
             
+            # Fingerprint ikut diperbarui saat isi post berubah
+            if 'content' in data:
+                data = dict(data, **dict(zip(('content_hash', 'simhash'), fingerprint(data['content']))))
+            
             # Build dynamic update query
             fields = []
             values = []
@@ -374,6 +1045,8 @@ class DatabaseManager:
             
             query = f"UPDATE posts SET {', '.join(fields)}, updated_at = ? WHERE id = ?"
             cursor.execute(query, values)
+            if 'content' in data:
+                self._save_simhash_bands(cursor, 'posts', [(post_id, data['simhash'])])
             
             conn.commit()
             conn.close()
@@ -397,25 +1070,42 @@ class DatabaseManager:
         except Exception as e:
             return {'success': False, 'message': f'Error deleting post: {str(e)}'}
     
+    def delete_posts_bulk(self, post_ids: List[int], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+        """Hapus banyak post sekaligus dalam satu transaksi"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            deleted = 0
+            for start in range(0, len(post_ids), chunk_size):
+                chunk = post_ids[start:start + chunk_size]
+                cursor.execute(f"DELETE FROM posts WHERE id IN ({', '.join('?' for _ in chunk)})", chunk)
+                deleted += cursor.rowcount
+            conn.commit()
+            
+            return {'success': True, 'message': f'{deleted} posts deleted successfully', 'deleted': deleted}
+        except Exception as e:
+            conn.rollback()
+            return {'success': False, 'message': f'Error deleting posts: {str(e)}'}
+        finally:
+            conn.close()
+    
     # Content Methods
     def add_content(self, title: str, content: str, source_url: str = '', 
-                   scraped_at: str = None, tags: str = '') -> Dict:
-        """Tambah scraped content"""
+                   scraped_at: str = None, tags: str = '', allow_duplicate: bool = False) -> Dict:
+        """Tambah scraped content (ditolak jika duplikat / hampir duplikat content yang sudah ada)"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
             if not scraped_at:
                 scraped_at = datetime.now().isoformat()
             
-            cursor.execute('''
-                INSERT INTO scraped_content (title, content, source_url, scraped_at, tags)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (title, content, source_url, scraped_at, tags))
+            content_ids, duplicates = self._bulk_insert(
+                'scraped_content', ('title', 'content', 'source_url', 'scraped_at', 'tags'),
+                [(title, content, source_url, scraped_at, tags)], allow_duplicates=allow_duplicate
+            )
             
-            content_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            if duplicates:
+                return self._duplicate_result('content', duplicates[0])
+            content_id = content_ids[0]
             
             return {
                 'success': True,
@@ -428,52 +1118,300 @@ class DatabaseManager:
                 'message': f'Error adding content: {str(e)}'
             }
     
-    def get_content(self) -> List[Dict]:
-        """Dapatkan semua scraped content"""
+    def add_content_bulk(self, items: List[Dict], chunk_size: int = BULK_CHUNK_SIZE,
+                         allow_duplicates: bool = False) -> Dict:
+        """Tambah banyak scraped content sekaligus dalam satu transaksi"""
+        try:
+            now = datetime.now().isoformat()
+            rows = []
+            for item in items:
+                if not item.get('title') or not item.get('content'):
+                    raise ValueError('title and content are required for every item')
+                rows.append((
+                    item['title'], item['content'], item.get('source_url', ''),
+                    item.get('scraped_at') or now, item.get('tags', ''), item.get('categories', '')
+                ))
+            
+            content_ids, duplicates = self._bulk_insert(
+                'scraped_content', CONTENT_COLUMNS, rows, chunk_size, allow_duplicates=allow_duplicates
+            )
+            
+            return {
+                'success': True,
+                'message': f'{len(content_ids)} content items added successfully, {len(duplicates)} duplicates skipped',
+                'content_ids': content_ids,
+                'duplicates': duplicates
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Error adding content: {str(e)}'
+            }
+    
+    def upsert_content_bulk(self, items: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+        """Insert atau update scraped content berdasarkan source_url dalam satu transaksi
+        (URL adalah identitas di sini, jadi tidak ada pengecekan duplikat; fingerprint tetap disimpan)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = datetime.now().isoformat()
+        
+        # URL yang sama muncul dua kali: versi terakhir yang dipakai
+        by_url = {item['source_url']: item for item in items if item.get('source_url')}
+        items = list(by_url.values())
+        insert_columns = CONTENT_COLUMNS + ('content_hash', 'simhash')
+        insert_query = f"INSERT INTO scraped_content ({', '.join(insert_columns)}) VALUES ({', '.join('?' for _ in insert_columns)})"
+        
+        content_ids = []
+        updated = 0
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start:start + chunk_size]
+                urls = [item['source_url'] for item in chunk]
+                cursor.execute(
+                    f"SELECT id, source_url FROM scraped_content WHERE source_url IN ({', '.join('?' for _ in urls)})",
+                    urls
+                )
+                existing = {row['source_url']: row['id'] for row in cursor.fetchall()}
+                
+                updates = []
+                rows = []
+                for item in chunk:
+                    values = (
+                        item['title'], item['content'], item['source_url'],
+                        item.get('scraped_at') or now, item.get('tags', ''), item.get('categories', '')
+                    ) + fingerprint(item['content'])
+                    if item['source_url'] in existing:
+                        updates.append(values[:2] + values[3:] + (existing[item['source_url']],))
+                    else:
+                        rows.append(values)
+                
+                cursor.executemany('''
+                    UPDATE scraped_content SET title = ?, content = ?, scraped_at = ?, tags = ?, categories = ?,
+                        content_hash = ?, simhash = ?
+                    WHERE id = ?
+                ''', updates)
+                updated += len(updates)
+                content_ids.extend(existing[item['source_url']] for item in chunk if item['source_url'] in existing)
+                fingerprints = [(row[-1], row[-2]) for row in updates]
+                
+                if rows:
+                    cursor.executemany(insert_query, rows)
+                    last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+                    row_ids = range(last_id - len(rows) + 1, last_id + 1)
+                    content_ids.extend(row_ids)
+                    fingerprints.extend(zip(row_ids, (row[-1] for row in rows)))
+                self._save_simhash_bands(cursor, 'scraped_content', fingerprints)
+            
+            conn.commit()
+            return {
+                'success': True,
+                'message': f'{len(content_ids) - updated} content items added, {updated} updated',
+                'inserted': len(content_ids) - updated,
+                'updated': updated,
+                'content_ids': content_ids
+            }
+        except Exception as e:
+            conn.rollback()
+            return {
+                'success': False,
+                'message': f'Error saving content: {str(e)}'
+            }
+        finally:
+            conn.close()
+    
+    # Content sources (ingest incremental)
+    def get_content_source(self, source_url: str) -> Optional[Dict]:
+        """State ingest untuk satu source (high-water mark)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM scraped_content ORDER BY scraped_at DESC')
-        content = [dict(row) for row in cursor.fetchall()]
+        cursor.execute('SELECT * FROM content_sources WHERE source_url = ?', (source_url,))
+        source = cursor.fetchone()
         
         conn.close()
-        return content
+        return dict(source) if source else None
     
-    # Dashboard Stats
-    def get_dashboard_stats(self) -> Dict:
-        """Dapatkan statistik untuk dashboard"""
+    def get_content_sources(self) -> List[Dict]:
+        """Semua source yang pernah di-ingest"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM content_sources ORDER BY last_polled_at DESC')
+        sources = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return sources
+    
+    def save_content_source(self, source_url: str, source_type: str, api_url: str = None,
+                            high_water_mark: str = None, items_ingested: int = 0) -> None:
+        """Simpan high-water mark source dan tambah jumlah item yang di-ingest"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Total accounts
-        cursor.execute('SELECT COUNT(*) as count FROM social_accounts WHERE status = "active"')
-        total_accounts = cursor.fetchone()['count']
+        cursor.execute('''
+            INSERT INTO content_sources (source_url, source_type, api_url, high_water_mark, last_polled_at, items_ingested)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source_url) DO UPDATE SET
+                source_type = excluded.source_type,
+                api_url = COALESCE(excluded.api_url, content_sources.api_url),
+                high_water_mark = COALESCE(excluded.high_water_mark, content_sources.high_water_mark),
+                last_polled_at = excluded.last_polled_at,
+                items_ingested = content_sources.items_ingested + excluded.items_ingested
+        ''', (source_url, source_type, api_url, high_water_mark, datetime.now().isoformat(), items_ingested))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_content(self, limit: int = None, cursor: str = None) -> List[Dict]:
+        """Dapatkan scraped content (keyset pagination pada scraped_at, id)"""
+        conn = self.get_connection()
+        db_cursor = conn.cursor()
+        
+        query, params = self._keyset_query(
+            'SELECT * FROM scraped_content', 'scraped_at', 'id', limit, cursor
+        )
+        db_cursor.execute(query, params)
+        content = [dict(row) for row in db_cursor.fetchall()]
+        
+        conn.close()
+        return content
+    
+    def search_content(self, query: str, limit: int = 20, cursor: str = None) -> Dict:
+        """Full-text search di content library dan posts, diurutkan berdasarkan relevansi (bm25)"""
+        match = build_fts_query(query)
+        if not match:
+            return {'success': True, 'results': [], 'next_cursor': None}
         
-        # Total guest sites
-        cursor.execute('SELECT COUNT(*) as count FROM guest_sites WHERE status = "active"')
-        total_guest_sites = cursor.fetchone()['count']
+        position = decode_cursor(cursor)
+        if cursor and not position:
+            return {'success': False, 'message': 'Invalid cursor'}
+        params = [match, match]
+        keyset = ''
+        if position:
+            # Cursor search berisi [rank, source_type]; cursor dari listing lain tidak valid di sini
+            try:
+                (rank, source_type), row_id = position
+                rank = float(rank)
+            except (TypeError, ValueError):
+                return {'success': False, 'message': 'Invalid cursor'}
+            keyset = 'WHERE (rank, source_type, id) > (?, ?, ?)'
+            params.extend([rank, source_type, row_id])
+        params.append(limit)
         
-        # Total posts
-        cursor.execute('SELECT COUNT(*) as count FROM posts')
-        total_posts = cursor.fetchone()['count']
+        try:
+            conn = self.get_connection()
+            db_cursor = conn.cursor()
+            
+            db_cursor.execute(f'''
+                SELECT * FROM (
+                    SELECT 'content' as source_type, sc.id, sc.title, sc.source_url, NULL as platform,
+                           sc.scraped_at as created_at,
+                           snippet(scraped_content_fts, -1, '<mark>', '</mark>', '…', 24) as snippet,
+                           bm25(scraped_content_fts, 5.0, 1.0, 2.0) as rank
+                    FROM scraped_content_fts
+                    JOIN scraped_content sc ON sc.id = scraped_content_fts.rowid
+                    WHERE scraped_content_fts MATCH ?
+                    UNION ALL
+                    SELECT 'post' as source_type, p.id, p.title, NULL as source_url, p.platform,
+                           p.created_at,
+                           snippet(posts_fts, -1, '<mark>', '</mark>', '…', 24) as snippet,
+                           bm25(posts_fts, 1.0, 2.0) as rank
+                    FROM posts_fts
+                    JOIN posts p ON p.id = posts_fts.rowid
+                    WHERE posts_fts MATCH ?
+                )
+                {keyset}
+                ORDER BY rank, source_type, id
+                LIMIT ?
+            ''', params)
+            results = [dict(row) for row in db_cursor.fetchall()]
+            
+            conn.close()
+        except Exception as e:
+            return {'success': False, 'message': f'Error searching content: {str(e)}'}
         
-        # Published posts
-        cursor.execute('SELECT COUNT(*) as count FROM posts WHERE status = "published"')
-        published_posts = cursor.fetchone()['count']
+        next_cursor = None
+        if len(results) == limit:
+            last = results[-1]
+            next_cursor = encode_cursor([last['rank'], last['source_type']], last['id'])
         
-        # Pending posts
-        cursor.execute('SELECT COUNT(*) as count FROM posts WHERE status = "pending"')
-        pending_posts = cursor.fetchone()['count']
+        return {'success': True, 'results': results, 'next_cursor': next_cursor}
+    
+    def get_duplicate_report(self, limit: int = 50) -> Dict:
+        """Grup duplikat persis dan pasangan hampir duplikat di scraped_content dan posts"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            report = {}
+            
+            for table in ('scraped_content', 'posts'):
+                cursor.execute(f'''
+                    SELECT content_hash, COUNT(*) as count, GROUP_CONCAT(id) as ids
+                    FROM {table}
+                    WHERE content_hash IS NOT NULL
+                    GROUP BY content_hash
+                    HAVING COUNT(*) > 1
+                    ORDER BY count DESC
+                    LIMIT ?
+                ''', (limit,))
+                exact = [
+                    {'content_hash': row['content_hash'], 'count': row['count'],
+                     'ids': sorted(int(row_id) for row_id in row['ids'].split(','))}
+                    for row in cursor.fetchall()
+                ]
+                
+                # Pasangan dengan band sama tapi hash berbeda, lalu disaring dengan jarak Hamming
+                cursor.execute(f'''
+                    SELECT DISTINCT a.target_id as id, b.target_id as other_id, ta.simhash, tb.simhash as other_simhash
+                    FROM simhash_bands a
+                    JOIN simhash_bands b ON b.target_type = a.target_type AND b.band = a.band
+                         AND b.value = a.value AND b.target_id > a.target_id
+                    JOIN {table} ta ON ta.id = a.target_id
+                    JOIN {table} tb ON tb.id = b.target_id
+                    WHERE a.target_type = ? AND ta.content_hash != tb.content_hash
+                    LIMIT ?
+                ''', (table, limit * 20))
+                near = []
+                for row in cursor.fetchall():
+                    distance = hamming_distance(row['simhash'], row['other_simhash'])
+                    if distance <= NEAR_DUPLICATE_DISTANCE:
+                        near.append({'ids': [row['id'], row['other_id']], 'distance': distance})
+                
+                report[table] = {'exact': exact, 'near': near[:limit]}
+            
+            conn.close()
+            return {'success': True, **report}
+        except Exception as e:
+            return {'success': False, 'message': f'Error building duplicate report: {str(e)}'}
+    
+    # Dashboard Stats
+    def get_dashboard_stats(self) -> Dict:
+        """Dapatkan statistik untuk dashboard"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
         
-        # Failed posts
-        cursor.execute('SELECT COUNT(*) as count FROM posts WHERE status = "failed"')
-        failed_posts = cursor.fetchone()['count']
+        # Semua counter dalam satu pass: posts dari tabel ringkasan post_stats
+        cursor.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM social_accounts WHERE status = 'active') as total_accounts,
+                (SELECT COUNT(*) FROM guest_sites WHERE status = 'active') as total_guest_sites,
+                COALESCE(SUM(count), 0) as total_posts,
+                COALESCE(SUM(CASE WHEN status = 'published' THEN count END), 0) as published_posts,
+                COALESCE(SUM(CASE WHEN status = 'pending' THEN count END), 0) as pending_posts,
+                COALESCE(SUM(CASE WHEN status = 'failed' THEN count END), 0) as failed_posts
+            FROM post_stats
+        ''')
+        counts = dict(cursor.fetchone())
+        total_posts = counts['total_posts']
+        published_posts = counts['published_posts']
         
         # Posts by platform
         cursor.execute('''
-            SELECT platform, COUNT(*) as count 
-            FROM posts 
+            SELECT platform, SUM(count) as count 
+            FROM post_stats 
             GROUP BY platform
+            HAVING SUM(count) > 0
         ''')
         platform_stats = {row['platform']: row['count'] for row in cursor.fetchall()}
         
@@ -488,17 +1426,286 @@ class DatabaseManager:
         conn.close()
         
         return {
-            'total_accounts': total_accounts,
-            'total_guest_sites': total_guest_sites,
+            'total_accounts': counts['total_accounts'],
+            'total_guest_sites': counts['total_guest_sites'],
             'total_posts': total_posts,
             'published_posts': published_posts,
-            'pending_posts': pending_posts,
-            'failed_posts': failed_posts,
+            'pending_posts': counts['pending_posts'],
+            'failed_posts': counts['failed_posts'],
             'platform_stats': platform_stats,
             'recent_activity': recent_activity,
             'success_rate': round((published_posts / total_posts * 100) if total_posts > 0 else 0, 1)
         }
     
+    # Automation Jobs
+    def create_automation_job(self, post_ids: List[int] = None, job_type: str = 'publish') -> Dict:
+        """Masukkan posts pending ke antrian automation sebagai satu job
+        
+        Klaim posts (pending -> queued) dan pembuatan task terjadi dalam satu BEGIN IMMEDIATE,
+        jadi dua request start yang bersamaan tidak meng-enqueue post yang sama dua kali.
+        Tanpa post_ids semua post pending diklaim; post yang sudah tidak pending dilewati.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = datetime.now().isoformat()
+        
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            if post_ids is None:
+                claimed = [row[0] for row in cursor.execute(
+                    "SELECT id FROM posts WHERE status = 'pending' ORDER BY created_at, id"
+                ).fetchall()]
+            else:
+                claimed = []
+                unique_ids = list(dict.fromkeys(post_ids))
+                for start in range(0, len(unique_ids), BULK_CHUNK_SIZE):
+                    chunk = unique_ids[start:start + BULK_CHUNK_SIZE]
+                    placeholders = ', '.join('?' for _ in chunk)
+                    claimed.extend(row[0] for row in cursor.execute(
+                        f"SELECT id FROM posts WHERE id IN ({placeholders}) AND status = 'pending' ORDER BY id",
+                        chunk
+                    ).fetchall())
+            
+            if not claimed:
+                conn.rollback()
+                return {
+                    'success': True,
+                    'message': 'No pending posts',
+                    'job_id': None,
+                    'queued': 0,
+                    'post_ids': []
+                }
+            
+            # Tandai posts supaya tidak di-enqueue dua kali
+            cursor.executemany('''
+                UPDATE posts SET status = 'queued', updated_at = ? WHERE id = ? AND status = 'pending'
+            ''', [(now, post_id) for post_id in claimed])
+            
+            cursor.execute('''
+                INSERT INTO automation_jobs (job_type, status, total, created_at)
+                VALUES (?, 'queued', ?, ?)
+            ''', (job_type, len(claimed), now))
+            job_id = cursor.lastrowid
+            
+            cursor.executemany('''
+                INSERT INTO job_tasks (job_id, post_id, created_at) VALUES (?, ?, ?)
+            ''', [(job_id, post_id, now) for post_id in claimed])
+            
+            conn.commit()
+            
+            return {
+                'success': True,
+                'message': 'Automation job queued successfully',
+                'job_id': job_id,
+                'queued': len(claimed),
+                'post_ids': claimed
+            }
+        except Exception as e:
+            conn.rollback()
+            return {
+                'success': False,
+                'message': f'Error creating automation job: {str(e)}'
+            }
+        finally:
+            conn.close()
+    
+    def has_open_job_tasks(self) -> bool:
+        """Cek apakah masih ada task queued/leased (misalnya sisa dari proses sebelum restart)"""
+        conn = self.get_connection()
+        row = conn.execute(
+            "SELECT 1 FROM job_tasks WHERE status IN ('queued', 'leased') LIMIT 1"
+        ).fetchone()
+        conn.close()
+        return row is not None
+    
+    def lease_job_tasks(self, worker_id: str, limit: int = 1, lease_seconds: int = 600,
+                        max_attempts: int = 3, exclude: Dict = None,
+                        target: Tuple[str, int] = None) -> List[Dict]:
+        """Lease task dari antrian secara atomik (task dengan lease kedaluwarsa diambil ulang)
+        
+        `exclude` berisi platforms/account_ids/guest_site_ids yang sedang penuh menurut scheduler.
+        `target` ('account', id) / ('guest_site', id) membatasi lease ke post milik satu akun/site
+        (dipakai untuk batching beberapa post dalam satu session).
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = datetime.now()
+        
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            # Task yang lease-nya habis tapi sudah terlalu sering dicoba dianggap gagal
+            cursor.execute('''
+                UPDATE posts SET status = 'failed', error_message = 'Lease expired too many times', updated_at = ?
+                WHERE id IN (
+                    SELECT post_id FROM job_tasks
+                    WHERE status = 'leased' AND leased_until < ? AND attempts >= ?
+                )
+            ''', (now.isoformat(), now.isoformat(), max_attempts))
+            cursor.execute('''
+                UPDATE job_tasks SET status = 'failed', finished_at = ?,
+                       message = 'Lease expired too many times'
+                WHERE status = 'leased' AND leased_until < ? AND attempts >= ?
+            ''', (now.isoformat(), now.isoformat(), max_attempts))
+            if cursor.rowcount:
+                self._close_finished_jobs(cursor, now.isoformat())
+            
+            filters = []
+            params = [now.isoformat()]
+            exclude = exclude or {}
+            for column, key in (('LOWER(p.platform)', 'platforms'), ('p.account_id', 'account_ids'),
+                                ('p.guest_site_id', 'guest_site_ids')):
+                values = list(exclude.get(key) or [])
+                if values:
+                    filters.append(f"({column} IS NULL OR {column} NOT IN ({', '.join('?' for _ in values)}))")
+                    params.extend(values)
+            if target:
+                target_type, target_id = target
+                filters.append('p.account_id = ?' if target_type == 'account' else 'p.guest_site_id = ?')
+                params.append(target_id)
+            params.append(limit)
+            
+            cursor.execute(f'''
+                SELECT jt.id FROM job_tasks jt
+                JOIN posts p ON p.id = jt.post_id
+                WHERE (jt.status = 'queued' OR (jt.status = 'leased' AND jt.leased_until < ?))
+                {''.join(' AND ' + clause for clause in filters)}
+                ORDER BY jt.id
+                LIMIT ?
+            ''', params)
+            task_ids = [row['id'] for row in cursor.fetchall()]
+            
+            leased_until = (now + timedelta(seconds=lease_seconds)).isoformat()
+            cursor.executemany('''
+                UPDATE job_tasks
+                SET status = 'leased', worker_id = ?, leased_until = ?, attempts = attempts + 1
+                WHERE id = ?
+            ''', [(worker_id, leased_until, task_id) for task_id in task_ids])
+            
+            if task_ids:
+                placeholders = ', '.join('?' for _ in task_ids)
+                cursor.execute(f'''
+                    UPDATE automation_jobs SET status = 'running', started_at = COALESCE(started_at, ?)
+                    WHERE id IN (SELECT job_id FROM job_tasks WHERE id IN ({placeholders}))
+                ''', [now.isoformat()] + task_ids)
+                
+                cursor.execute(f'SELECT * FROM job_tasks WHERE id IN ({placeholders}) ORDER BY id', task_ids)
+                tasks = [dict(row) for row in cursor.fetchall()]
+            else:
+                tasks = []
+            
+            conn.commit()
+            return tasks
+        except Exception as e:
+            conn.rollback()
+            print(f"Error leasing job tasks: {e}")
+            return []
+        finally:
+            conn.close()
+    
+    def extend_job_leases(self, worker_id: str, task_ids: List[int], lease_seconds: int) -> None:
+        """Perpanjang lease task yang sedang dikerjakan worker ini (batch yang panjang)"""
+        if not task_ids:
+            return
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            leased_until = (datetime.now() + timedelta(seconds=lease_seconds)).isoformat()
+            placeholders = ', '.join('?' for _ in task_ids)
+            cursor.execute(f'''
+                UPDATE job_tasks SET leased_until = ?
+                WHERE status = 'leased' AND worker_id = ? AND id IN ({placeholders})
+            ''', [leased_until, worker_id] + list(task_ids))
+            
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Error extending job leases: {e}")
+    
+    def requeue_job_task(self, task_id: int) -> None:
+        """Kembalikan task ke antrian tanpa menghitungnya sebagai percobaan"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE job_tasks
+                SET status = 'queued', worker_id = NULL, leased_until = NULL,
+                    attempts = MAX(attempts - 1, 0)
+                WHERE id = ? AND status = 'leased'
+            ''', (task_id,))
+            
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Error requeueing job task: {e}")
+    
+    def complete_job_task(self, task_id: int, success: bool, message: str = '') -> None:
+        """Simpan hasil task dan tutup job jika semua task sudah selesai"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            now = datetime.now().isoformat()
+            
+            cursor.execute('''
+                UPDATE job_tasks SET status = ?, message = ?, finished_at = ?, leased_until = NULL
+                WHERE id = ?
+            ''', ('done' if success else 'failed', message, now, task_id))
+            
+            self._close_finished_jobs(cursor, now)
+            
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Error completing job task: {e}")
+    
+    def _close_finished_jobs(self, cursor, now: str) -> None:
+        """Tandai job selesai jika tidak ada lagi task yang queued/leased"""
+        cursor.execute('''
+            UPDATE automation_jobs SET status = 'completed', finished_at = ?
+            WHERE status IN ('queued', 'running')
+              AND NOT EXISTS (
+                  SELECT 1 FROM job_tasks
+                  WHERE job_id = automation_jobs.id AND status IN ('queued', 'leased')
+              )
+        ''', (now,))
+    
+    def get_automation_job(self, job_id: int) -> Optional[Dict]:
+        """Dapatkan progress automation job beserta hasil tiap task"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM automation_jobs WHERE id = ?', (job_id,))
+        job = cursor.fetchone()
+        if not job:
+            conn.close()
+            return None
+        
+        cursor.execute('''
+            SELECT id, post_id, status, attempts, message, finished_at
+            FROM job_tasks WHERE job_id = ? ORDER BY id
+        ''', (job_id,))
+        tasks = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        
+        job = dict(job)
+        counts = {'queued': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        for task in tasks:
+            counts[task['status']] = counts.get(task['status'], 0) + 1
+        
+        job.update({
+            'queued': counts['queued'],
+            'running': counts['leased'],
+            'succeeded': counts['done'],
+            'failed': counts['failed'],
+            'processed': counts['done'] + counts['failed'],
+            'tasks': tasks
+        })
+        return job
+    
     # Logging
     def log_action(self, action: str, target_id: int = None, target_type: str = None, 
                   status: str = 'success', message: str = '') -> None:
@@ -517,6 +1724,232 @@ class DatabaseManager:
         except Exception as e:
             print(f"Error logging action: {e}")
     
+    # Selector cache
+    def get_cached_selectors(self) -> List[Dict]:
+        """Semua selector yang terakhir berhasil"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT scope, field, xpath FROM selector_cache')
+        rows = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return rows
+    
+    def save_cached_selector(self, scope: str, field: str, xpath: str) -> None:
+        """Simpan selector yang berhasil untuk (scope, field)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO selector_cache (scope, field, xpath, updated_at)
+            VALUES (?, ?, ?, ?)
+        ''', (scope, field, xpath, datetime.now().isoformat()))
+        
+        conn.commit()
+        conn.close()
+    
+    def delete_cached_selector(self, scope: str, field: str) -> None:
+        """Hapus selector cache untuk (scope, field)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM selector_cache WHERE scope = ? AND field = ?', (scope, field))
+        
+        conn.commit()
+        conn.close()
+    
+    # HTTP cache (scraper)
+    def get_http_cache_entry(self, url: str) -> Optional[Dict]:
+        """Validator HTTP yang tersimpan untuk URL"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM http_cache WHERE url = ?', (url,))
+        entry = cursor.fetchone()
+        
+        conn.close()
+        return dict(entry) if entry else None
+    
+    def save_http_cache_entry(self, url: str, etag: str = None, last_modified: str = None,
+                              body_hash: str = None, body_size: int = 0) -> None:
+        """Simpan validator HTTP setelah halaman di-download"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = datetime.now().isoformat()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body_hash, body_size, fetched_at, checked_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (url, etag, last_modified, body_hash, body_size, now, now))
+        
+        conn.commit()
+        conn.close()
+    
+    def touch_http_cache_entry(self, url: str, checked_at: str) -> None:
+        """Catat waktu cek terakhir (304 Not Modified)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('UPDATE http_cache SET checked_at = ? WHERE url = ?', (checked_at, url))
+        
+        conn.commit()
+        conn.close()
+    
+    # AI response cache
+    def get_ai_response(self, cache_key: str, max_age_seconds: float = None) -> Optional[str]:
+        """Response tersimpan untuk cache_key (None jika tidak ada / expired), sekaligus tandai dipakai"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = datetime.now()
+        
+        query = 'SELECT response FROM ai_response_cache WHERE cache_key = ?'
+        params = [cache_key]
+        if max_age_seconds:
+            query += ' AND created_at >= ?'
+            params.append((now - timedelta(seconds=max_age_seconds)).isoformat())
+        row = cursor.execute(query, params).fetchone()
+        
+        if row:
+            cursor.execute(
+                'UPDATE ai_response_cache SET last_used_at = ?, hits = hits + 1 WHERE cache_key = ?',
+                (now.isoformat(), cache_key)
+            )
+            conn.commit()
+        
+        conn.close()
+        return row['response'] if row else None
+    
+    def save_ai_response(self, cache_key: str, model: str, response: str, max_entries: int = None,
+                         max_age_seconds: float = None) -> None:
+        """Simpan response lalu buang entry expired dan yang paling lama tidak dipakai di atas max_entries"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = datetime.now()
+        
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                INSERT OR REPLACE INTO ai_response_cache (cache_key, model, response, created_at, last_used_at, hits)
+                VALUES (?, ?, ?, ?, ?, 0)
+            ''', (cache_key, model, response, now.isoformat(), now.isoformat()))
+            if max_age_seconds:
+                cursor.execute(
+                    'DELETE FROM ai_response_cache WHERE created_at < ?',
+                    ((now - timedelta(seconds=max_age_seconds)).isoformat(),)
+                )
+            if max_entries:
+                cursor.execute('''
+                    DELETE FROM ai_response_cache WHERE cache_key IN (
+                        SELECT cache_key FROM ai_response_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (max_entries,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def clear_ai_responses(self) -> int:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM ai_response_cache')
+        deleted = cursor.rowcount
+        
+        conn.commit()
+        conn.close()
+        return deleted
+    
+    # AI usage
+    def log_ai_usage(self, model: str, operation: str, prompt_tokens: int, completion_tokens: int,
+                     max_tokens: int = None, cached: bool = False, estimated: bool = False) -> None:
+        """Catat token prompt/completion satu panggilan OpenAI"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO ai_usage (created_at, model, operation, prompt_tokens, completion_tokens,
+                                      max_tokens, cached, estimated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (datetime.now().isoformat(), model, operation, prompt_tokens, completion_tokens,
+                  max_tokens, int(cached), int(estimated)))
+            
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Error logging AI usage: {e}")
+    
+    def get_ai_usage_stats(self, days: int = 30) -> Dict:
+        """Total token per operasi sejak `days` hari terakhir (dibayar vs dilayani cache)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        
+        cursor.execute('''
+            SELECT operation,
+                   SUM(cached = 0) as calls,
+                   SUM(cached) as cached_calls,
+                   SUM(CASE WHEN cached = 0 THEN prompt_tokens ELSE 0 END) as prompt_tokens,
+                   SUM(CASE WHEN cached = 0 THEN completion_tokens ELSE 0 END) as completion_tokens,
+                   SUM(CASE WHEN cached = 1 THEN prompt_tokens + completion_tokens ELSE 0 END) as tokens_saved,
+                   ROUND(AVG(CASE WHEN cached = 0 THEN completion_tokens END), 1) as avg_completion_tokens
+            FROM ai_usage
+            WHERE created_at >= ?
+            GROUP BY operation
+            ORDER BY operation
+        ''', (since,))
+        operations = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        totals = {
+            key: sum(operation[key] or 0 for operation in operations)
+            for key in ('calls', 'cached_calls', 'prompt_tokens', 'completion_tokens', 'tokens_saved')
+        }
+        return {'days': days, 'totals': totals, 'operations': operations}
+    
+    # Browser sessions
+    def get_browser_session(self, target_type: str, target_id: int) -> Optional[bytes]:
+        """Data session terenkripsi untuk akun/site"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            'SELECT data FROM browser_sessions WHERE target_type = ? AND target_id = ?',
+            (target_type, target_id)
+        )
+        result = cursor.fetchone()
+        
+        conn.close()
+        return result['data'] if result else None
+    
+    def save_browser_session(self, target_type: str, target_id: int, data: bytes) -> None:
+        """Simpan data session terenkripsi untuk akun/site"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO browser_sessions (target_type, target_id, data, updated_at)
+            VALUES (?, ?, ?, ?)
+        ''', (target_type, target_id, sqlite3.Binary(data), datetime.now().isoformat()))
+        
+        conn.commit()
+        conn.close()
+    
+    def delete_browser_session(self, target_type: str, target_id: int) -> None:
+        """Hapus session tersimpan untuk akun/site"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            'DELETE FROM browser_sessions WHERE target_type = ? AND target_id = ?', (target_type, target_id)
+        )
+        
+        conn.commit()
+        conn.close()
+    
     # Settings
     def get_setting(self, key: str, default_value: str = None) -> str:
         """Dapatkan setting berdasarkan key"""
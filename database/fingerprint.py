@@ -0,0 +1,65 @@
+"""
+Content Fingerprint untuk deduplikasi
+SHA-256 dari teks yang dinormalisasi (duplikat persis) dan SimHash 64-bit (hampir duplikat).
+SimHash dipecah menjadi 4 band 16-bit: dua hash dengan jarak Hamming <= 3 pasti punya minimal
+satu band yang sama, jadi kandidat bisa dicari lewat index biasa.
+"""
+
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from typing import List, Tuple
+
+SIMHASH_BITS = 64
+BAND_BITS = 16
+BAND_COUNT = SIMHASH_BITS // BAND_BITS
+NEAR_DUPLICATE_DISTANCE = 3
+SHINGLE_SIZE = 3
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, tanpa tag HTML/tanda baca, spasi dirapikan"""
+    text = unicodedata.normalize('NFKC', _TAG_RE.sub(' ', text or '')).lower()
+    return ' '.join(_WORD_RE.findall(text))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def simhash(text: str) -> int:
+    """SimHash 64-bit (signed, supaya muat di INTEGER SQLite) dari shingle 3 kata"""
+    words = normalize_text(text).split()
+    if len(words) >= SHINGLE_SIZE:
+        features = Counter(' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    else:
+        features = Counter(words)
+
+    vector = [0] * SIMHASH_BITS
+    for feature, weight in features.items():
+        value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += weight if value >> bit & 1 else -weight
+
+    result = sum(1 << bit for bit in range(SIMHASH_BITS) if vector[bit] > 0)
+    return result - (1 << SIMHASH_BITS) if result >= 1 << (SIMHASH_BITS - 1) else result
+
+
+def fingerprint(text: str) -> Tuple[str, int]:
+    """(content_hash, simhash) untuk satu teks"""
+    return content_hash(text), simhash(text)
+
+
+def simhash_bands(value: int) -> List[Tuple[int, int]]:
+    """[(band, nilai band)] untuk index kandidat near-duplicate"""
+    unsigned = value & ((1 << SIMHASH_BITS) - 1)
+    mask = (1 << BAND_BITS) - 1
+    return [(band, unsigned >> (band * BAND_BITS) & mask) for band in range(BAND_COUNT)]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << SIMHASH_BITS) - 1)).count('1')
@@ -0,0 +1,160 @@
+"""
+Request Executor untuk OpenAIService
+Membatasi request yang berjalan bersamaan, menjaga budget requests/tokens per menit (token bucket)
+dan mengulang request yang kena 429/5xx dengan exponential backoff + jitter.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from services.scheduler import TokenBucket
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+# Nama class error openai (0.x) yang aman diulang walaupun tidak membawa http_status
+RETRYABLE_ERRORS = {'RateLimitError', 'ServiceUnavailableError', 'APIConnectionError', 'Timeout', 'TryAgain'}
+
+
+def is_retryable(error: Exception) -> bool:
+    status = getattr(error, 'http_status', None) or getattr(error, 'status_code', None)
+    if status:
+        return status in RETRYABLE_STATUS or status >= 500
+    return type(error).__name__ in RETRYABLE_ERRORS
+
+
+def retry_after(error: Exception) -> float:
+    """Header Retry-After dari error (detik), 0 jika tidak ada"""
+    headers = getattr(error, 'headers', None) or {}
+    try:
+        return max(0.0, float(headers.get('retry-after') or headers.get('Retry-After') or 0))
+    except (TypeError, ValueError, AttributeError):
+        return 0.0
+
+
+class StreamingResponse:
+    """Iterator stream yang memegang slot in-flight sampai habis, error, atau close()"""
+
+    def __init__(self, stream, release: Callable):
+        self._stream = iter(stream)
+        self._release = release
+        self._released = False
+        self._release_lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._stream)
+        except BaseException:
+            # StopIteration juga: stream habis berarti request selesai
+            self.close()
+            raise
+
+    def close(self):
+        with self._release_lock:
+            if self._released:
+                return
+            self._released = True
+        try:
+            close = getattr(self._stream, 'close', None)
+            if close:
+                close()
+        finally:
+            self._release()
+
+    def __del__(self):
+        self.close()
+
+
+class RequestExecutor:
+    """Jalankan request API dengan batas in-flight, budget RPM/TPM dan retry"""
+
+    def __init__(self, max_in_flight: int = 8, requests_per_minute: int = 3500,
+                 tokens_per_minute: int = 90000, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(requests_per_minute * 60, requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute * 60, tokens_per_minute)
+        self._stats = {'requests': 0, 'retries': 0, 'failures': 0, 'throttled_seconds': 0.0}
+
+    def call(self, fn: Callable, estimated_tokens: int = 0, stream: bool = False):
+        """Panggil fn() dalam budget; error yang bisa diulang dicoba lagi sampai max_retries
+        
+        stream=True: slot in-flight tetap dipegang sampai iterator hasil fn() habis atau ditutup.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._acquire_budget(estimated_tokens)
+            try:
+                if stream:
+                    self._slots.acquire()
+                    try:
+                        response = StreamingResponse(fn(), self._slots.release)
+                    except BaseException:
+                        self._slots.release()
+                        raise
+                else:
+                    with self._slots:
+                        response = fn()
+                self._settle_tokens(estimated_tokens, response)
+                self._count('requests')
+                return response
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self._count('failures')
+                    raise
+                # Slot in-flight sudah dilepas selama menunggu, request lain tetap jalan
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay = max(retry_after(e), random.uniform(0, delay))
+                self._count('retries')
+                print(f"⚠️  OpenAI request failed ({e}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def map(self, fn: Callable, items: List) -> List:
+        """fn(item) untuk semua item secara concurrent, hasil sesuai urutan input"""
+        if not items:
+            return []
+        with ThreadPoolExecutor(min(self.max_in_flight, len(items)), thread_name_prefix='ai-request') as pool:
+            return list(pool.map(fn, items))
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['request_tokens'] = round(self._requests.tokens, 1)
+            stats['token_budget'] = round(self._tokens.tokens)
+        stats['throttled_seconds'] = round(stats['throttled_seconds'], 2)
+        return stats
+
+    def _acquire_budget(self, estimated_tokens: int):
+        while True:
+            with self._lock:
+                wait = max(self._requests.wait_time(), self._tokens.wait_time(estimated_tokens))
+                if wait <= 0:
+                    self._requests.consume()
+                    self._tokens.consume(estimated_tokens)
+                    return
+                self._stats['throttled_seconds'] += min(wait, 1.0)
+            time.sleep(min(wait, 1.0))
+
+    def _settle_tokens(self, estimated_tokens: int, response):
+        """Koreksi budget TPM dengan usage sebenarnya dari response"""
+        usage = getattr(response, 'usage', None) or (response.get('usage') if isinstance(response, dict) else None)
+        used = getattr(usage, 'total_tokens', None) if usage is not None else None
+        if used is None and isinstance(usage, dict):
+            used = usage.get('total_tokens')
+        if used is None:
+            return
+        with self._lock:
+            self._tokens.consume(used - estimated_tokens)
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
@@ -0,0 +1,173 @@
+"""
+Generation Backends untuk OpenAIService
+Backend chat completion yang bisa dipilih lewat settings: OpenAI API atau server lokal yang
+kompatibel dengan OpenAI (llama.cpp server, Ollama, LM Studio, vLLM) di CPU/jaringan sendiri.
+Router menentukan urutan backend per operasi; backend berikutnya dipakai jika yang pertama gagal.
+"""
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+import openai
+
+BACKEND_SETTING = 'generation_backend'
+OPERATIONS = ('content', 'hashtags', 'improve', 'title', 'variants')
+
+
+class OpenAIBackend:
+    """OpenAI API (request lewat RequestExecutor: budget RPM/TPM + retry)"""
+
+    name = 'openai'
+
+    def __init__(self, api_key: Optional[str], model: str, executor=None):
+        self.api_key = api_key
+        self.model = model
+        self.executor = executor
+
+    @property
+    def cache_model(self) -> str:
+        return self.model
+
+    def is_available(self) -> bool:
+        return bool(self.api_key)
+
+    def create(self, messages: List[Dict], **params):
+        return openai.ChatCompletion.create(model=self.model, messages=messages, api_key=self.api_key, **params)
+
+    def describe(self) -> Dict:
+        return {'name': self.name, 'model': self.model, 'available': self.is_available()}
+
+
+class LocalBackend:
+    """Server lokal dengan endpoint /v1/chat/completions (misalnya `llama-server -m model.gguf --port 8080`)"""
+
+    name = 'local'
+
+    def __init__(self, base_url: str = '', model: str = 'local', api_key: str = 'local', timeout: float = 120):
+        self.configure(base_url, model, api_key)
+        self.timeout = timeout
+        # Tidak ada rate limit API; server lokal dibatasi oleh jumlah slot-nya sendiri
+        self.executor = None
+
+    def configure(self, base_url: str = None, model: str = None, api_key: str = None):
+        if base_url is not None:
+            self.base_url = base_url.rstrip('/')
+        if model is not None:
+            self.model = model or 'local'
+        if api_key is not None:
+            self.api_key = api_key or 'local'
+
+    @property
+    def cache_model(self) -> str:
+        # Nama model lokal bisa sama dengan model OpenAI, jadi key cache diberi prefix
+        return f'{self.name}:{self.model}'
+
+    def is_available(self) -> bool:
+        return bool(self.base_url)
+
+    def create(self, messages: List[Dict], **params):
+        return openai.ChatCompletion.create(
+            model=self.model, messages=messages, api_base=self.base_url, api_key=self.api_key,
+            request_timeout=self.timeout, **params
+        )
+
+    def describe(self) -> Dict:
+        return {'name': self.name, 'model': self.model, 'base_url': self.base_url, 'available': self.is_available()}
+
+
+class BackendRouter:
+    """Urutan backend per operasi dari setting `generation_backend` (JSON, dibaca ulang berkala)"""
+
+    def __init__(self, backends: List, db_manager=None, default: str = 'openai',
+                 refresh_interval: float = 60.0):
+        self.backends = {backend.name: backend for backend in backends}
+        self.db_manager = db_manager
+        self.refresh_interval = refresh_interval
+        self._env_default = default if default in self.backends else next(iter(self.backends))
+        self._default = self._env_default
+        self._routes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._loaded_at = 0.0
+
+    def candidates(self, operation: str) -> List:
+        """Backend yang tersedia untuk operasi: pilihan setting dulu, sisanya sebagai cadangan"""
+        with self._lock:
+            self._refresh_locked()
+            preferred = self._routes.get(operation, self._default)
+        order = [preferred] + [name for name in self.backends if name != preferred]
+        return [self.backends[name] for name in order if self.backends[name].is_available()]
+
+    def is_available(self) -> bool:
+        return any(backend.is_available() for backend in self.backends.values())
+
+    def get_config(self) -> Dict:
+        with self._lock:
+            self._refresh_locked()
+            return {
+                'default': self._default,
+                'routes': dict(self._routes),
+                'backends': [backend.describe() for backend in self.backends.values()]
+            }
+
+    def configure(self, default: str = None, routes: Dict[str, str] = None, local: Dict = None) -> Dict:
+        """Validasi + simpan pilihan backend ke settings"""
+        default = default or self._default
+        if default not in self.backends:
+            return {'success': False, 'message': f'Unknown generation backend: {default}'}
+
+        stored = self._stored_config()
+        if routes is None:
+            routes = stored.get('routes') or {}
+        routes = {key: value for key, value in routes.items() if value}
+        invalid = [key for key, value in routes.items() if key not in OPERATIONS or value not in self.backends]
+        if invalid:
+            return {'success': False, 'message': f"Invalid backend routes: {', '.join(invalid)}"}
+
+        # Config local yang tidak dikirim ulang tetap dipertahankan
+        config = {'default': default, 'routes': routes, 'local': dict(stored.get('local') or {})}
+        if local is not None:
+            config['local'].update(
+                {key: local[key] for key in ('base_url', 'model', 'api_key') if local.get(key) is not None}
+            )
+        if not config['local']:
+            del config['local']
+
+        if self.db_manager:
+            self.db_manager.set_setting(BACKEND_SETTING, json.dumps(config), 'Generation backend per operation')
+        with self._lock:
+            self._apply_locked(config)
+            self._loaded_at = time.monotonic()
+
+        return {'success': True, 'message': 'Generation backend updated', **self.get_config()}
+
+    def _refresh_locked(self):
+        now = time.monotonic()
+        if not self.db_manager or (self._loaded_at and now - self._loaded_at < self.refresh_interval):
+            return
+        self._loaded_at = now
+
+        self._apply_locked(self._stored_config())
+
+    def _stored_config(self) -> Dict:
+        if not self.db_manager:
+            return {}
+        try:
+            value = self.db_manager.get_setting(BACKEND_SETTING)
+            config = json.loads(value) if value else {}
+            return config if isinstance(config, dict) else {}
+        except Exception as e:
+            print(f"⚠️  Invalid generation backend setting: {e}")
+            return {}
+
+    def _apply_locked(self, config: Dict):
+        default = config.get('default')
+        self._default = default if default in self.backends else self._env_default
+        self._routes = {
+            operation: name for operation, name in (config.get('routes') or {}).items()
+            if operation in OPERATIONS and name in self.backends
+        }
+        local = self.backends.get(LocalBackend.name)
+        if local and config.get('local'):
+            local.configure(**config['local'])
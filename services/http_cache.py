@@ -0,0 +1,108 @@
+"""
+HTTP Cache untuk scraper
+Menyimpan ETag, Last-Modified dan hash body per URL (tabel http_cache) supaya halaman yang
+tidak berubah tidak di-download ulang (304) atau tidak di-parse/insert ulang (hash sama).
+"""
+
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body or b'').hexdigest()
+
+
+class HttpCache:
+    """Validator HTTP per URL + counter hit/miss untuk monitoring"""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'not_modified': 0,   # 304, body tidak di-download
+            'unchanged': 0,      # 200 tapi hash body sama, parse/insert dilewati
+            'misses': 0,
+            'bytes_saved': 0,
+            'bytes_downloaded': 0
+        }
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Header If-None-Match / If-Modified-Since untuk URL yang pernah di-fetch"""
+        entry = self._get(url)
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def check(self, url: str, response) -> str:
+        """Klasifikasi response: 'not_modified', 'unchanged', atau 'changed'"""
+        entry = self._get(url)
+        cached_size = (entry or {}).get('body_size') or 0
+
+        if response.status_code == 304:
+            self._count('not_modified', saved=cached_size)
+            self._touch(url)
+            return 'not_modified'
+
+        size = len(response.content)
+        if entry and entry.get('body_hash') == body_hash(response.content):
+            self._count('unchanged', downloaded=size)
+            # Validator baru (misalnya ETag yang berubah) tetap disimpan
+            self.store(url, response)
+            return 'unchanged'
+
+        self._count('misses', downloaded=size)
+        return 'changed'
+
+    @staticmethod
+    def validators(response) -> Dict:
+        """ETag, Last-Modified dan hash body dari response, untuk disimpan setelah halaman diproses"""
+        return {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body_hash': body_hash(response.content),
+            'body_size': len(response.content)
+        }
+
+    def store(self, url: str, response):
+        """Simpan validator setelah halaman berhasil diproses"""
+        self.store_validators(url, self.validators(response))
+
+    def store_validators(self, url: str, validators: Dict):
+        try:
+            self.db_manager.save_http_cache_entry(url, **validators)
+        except Exception as e:
+            print(f"⚠️  Error saving HTTP cache entry: {e}")
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        hits = stats['not_modified'] + stats['unchanged']
+        stats['hits'] = hits
+        stats['hit_rate'] = round(hits / stats['requests'], 3) if stats['requests'] else 0.0
+        return stats
+
+    def _get(self, url: str) -> Optional[Dict]:
+        try:
+            return self.db_manager.get_http_cache_entry(url)
+        except Exception as e:
+            print(f"⚠️  Error reading HTTP cache entry: {e}")
+            return None
+
+    def _touch(self, url: str):
+        try:
+            self.db_manager.touch_http_cache_entry(url, datetime.now().isoformat())
+        except Exception as e:
+            print(f"⚠️  Error updating HTTP cache entry: {e}")
+
+    def _count(self, key: str, saved: int = 0, downloaded: int = 0):
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats[key] += 1
+            self._stats['bytes_saved'] += saved
+            self._stats['bytes_downloaded'] += downloaded
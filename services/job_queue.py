@@ -0,0 +1,179 @@
+"""
+Automation Worker Pool untuk Social Media Automation V2
+Worker thread yang mengambil task dari antrian SQLite, publish post, lalu menyimpan hasilnya.
+Jika ada PublishScheduler, task hanya dijalankan saat limit platform/akun mengizinkan.
+Task untuk akun/site yang sama dikelompokkan (batch) sehingga satu login dipakai untuk banyak post.
+"""
+
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from services.scheduler import PublishScheduler
+
+
+class AutomationWorkerPool:
+    """Pool worker thread untuk memproses job_tasks dari DatabaseManager"""
+
+    def __init__(self, db_manager, bot_factory: Callable, num_workers: int = 2,
+                 poll_interval: float = 5.0, lease_seconds: int = 600, scheduler=None,
+                 batch_size: int = 10, batch_tabs: int = 1):
+        self.db_manager = db_manager
+        self.bot_factory = bot_factory
+        self.scheduler = scheduler
+        self.num_workers = max(1, num_workers)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        # Maksimum post per session browser dan jumlah tab yang dipakai bergiliran
+        self.batch_size = max(1, batch_size)
+        self.batch_tabs = max(1, batch_tabs)
+
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Jalankan worker threads (aman dipanggil berkali-kali)"""
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            self._stop_event.clear()
+
+            while len(self._threads) < self.num_workers:
+                worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    args=(worker_id,),
+                    name=f'automation-worker-{worker_id}',
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = None):
+        """Hentikan worker setelah task yang sedang berjalan selesai"""
+        self._stop_event.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def notify(self):
+        """Bangunkan worker karena ada task baru di antrian"""
+        self._wakeup.set()
+
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _run_worker(self, worker_id: str):
+        bot = self.bot_factory()
+
+        while not self._stop_event.is_set():
+            exclude = self.scheduler.blocked() if self.scheduler else None
+            tasks = self.db_manager.lease_job_tasks(
+                worker_id, limit=1, lease_seconds=self.lease_seconds, exclude=exclude
+            )
+            if not tasks:
+                self._idle_wait()
+                continue
+
+            for task in tasks:
+                self._process_task(bot, worker_id, task)
+
+        self.db_manager.close_connection()
+
+    def _idle_wait(self):
+        """Tunggu task baru, slot yang dilepas, atau token rate limit berikutnya"""
+        timeout = self.poll_interval
+        if self.scheduler:
+            next_token = self.scheduler.next_available_in()
+            if next_token > 0:
+                timeout = min(timeout, next_token)
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+    def _process_task(self, bot, worker_id: str, task: Dict):
+        post = self.db_manager.get_post(task['post_id'])
+        if not post:
+            self.db_manager.complete_job_task(task['id'], False, 'Post not found')
+            return
+
+        slot = None
+        if self.scheduler:
+            slot = self.scheduler.try_acquire(post)
+            if slot is None:
+                # Worker lain baru saja mengambil slot akun/platform ini
+                self.db_manager.requeue_job_task(task['id'])
+                return
+
+        batch = [(task, post)] + self._lease_batch(worker_id, post, slot)
+        posts = [batch_post for _, batch_post in batch]
+        if len(batch) > 1:
+            self.db_manager.extend_job_leases(
+                worker_id, [batch_task['id'] for batch_task, _ in batch], self.lease_seconds * len(batch)
+            )
+
+        for batch_post in posts:
+            self.db_manager.update_post(batch_post['id'], {'status': 'processing'})
+
+        # Kredensial untuk login (atau restore session tersimpan) sebelum publish
+        account = self.db_manager.get_account(post['account_id']) if post.get('account_id') else None
+        site = self.db_manager.get_guest_site(post['guest_site_id']) if post.get('guest_site_id') else None
+
+        try:
+            results = bot.publish_posts(posts, account=account, site=site, tabs=self.batch_tabs)
+        except Exception as e:
+            results = [{'success': False, 'message': f'Publishing failed: {str(e)}'} for _ in posts]
+        finally:
+            if slot:
+                self.scheduler.release(slot)
+                self.notify()
+
+        for (batch_task, batch_post), result in zip(batch, results):
+            if result.get('retry'):
+                self._requeue(batch_task, batch_post)
+            else:
+                self._save_result(batch_task, batch_post, result)
+
+    def _lease_batch(self, worker_id: str, post: Dict, slot) -> List[tuple]:
+        """Ambil task lain untuk akun/site yang sama supaya satu login dipakai untuk banyak post"""
+        target = PublishScheduler.target_key(post)
+        if not target or self.batch_size <= 1:
+            return []
+
+        tasks = self.db_manager.lease_job_tasks(
+            worker_id, limit=self.batch_size - 1, lease_seconds=self.lease_seconds, target=target
+        )
+        batch = []
+        for task in tasks:
+            batch_post = self.db_manager.get_post(task['post_id'])
+            if not batch_post:
+                self.db_manager.complete_job_task(task['id'], False, 'Post not found')
+                continue
+            if slot and not self.scheduler.try_extend(slot):
+                # Rate limit akun/platform habis: sisanya menunggu di antrian
+                self.db_manager.requeue_job_task(task['id'])
+                continue
+            batch.append((task, batch_post))
+        return batch
+
+    def _requeue(self, task: Dict, post: Dict):
+        """Kembalikan task ke antrian (misalnya semua WebDriver sedang dipakai), post tidak ditandai failed"""
+        self.db_manager.update_post(post['id'], {'status': 'queued'})
+        self.db_manager.requeue_job_task(task['id'])
+
+    def _save_result(self, task: Dict, post: Dict, result: Dict):
+        self.db_manager.update_post(post['id'], {
+            'status': 'published' if result['success'] else 'failed',
+            'published_at': datetime.now().isoformat() if result['success'] else None,
+            'error_message': result.get('message', '') if not result['success'] else ''
+        })
+        self.db_manager.complete_job_task(task['id'], result['success'], result.get('message', ''))
+        self.db_manager.log_action(
+            'publish_post',
+            target_id=post['id'],
+            target_type='post',
+            status='success' if result['success'] else 'failed',
+            message=result.get('message', '')
+        )
@@ -5,11 +5,79 @@ Menggunakan OpenAI API untuk generate konten yang sesuai dengan platform
 
 import os
 import openai
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import json
 
+from services.response_cache import cache_key
+from services import token_budget
+from services.generation_backends import BackendRouter, OpenAIBackend
+
+DEFAULT_MODEL = 'gpt-3.5-turbo'
+
+# Gaya per platform, dipakai oleh generate_post_content dan generate_variants
+PLATFORM_PROMPTS = {
+    'facebook': {
+        'style': 'engaging and conversational',
+        'length_guide': 'medium length (100-200 words)',
+        'features': 'Include emojis and call-to-action'
+    },
+    'twitter': {
+        'style': 'concise and impactful',
+        'length_guide': 'short (under 280 characters)',
+        'features': 'Include relevant hashtags'
+    },
+    'linkedin': {
+        'style': 'professional and insightful',
+        'length_guide': 'longer form (200-500 words)',
+        'features': 'Include professional insights and industry perspective'
+    },
+    'instagram': {
+        'style': 'visual-focused and trendy',
+        'length_guide': 'medium length with hashtags',
+        'features': 'Include relevant hashtags and visual descriptions'
+    },
+    'medium': {
+        'style': 'thoughtful and in-depth',
+        'length_guide': 'long form article style',
+        'features': 'Include subheadings and detailed explanations'
+    },
+    'guest_post': {
+        'style': 'authoritative and valuable',
+        'length_guide': 'comprehensive article',
+        'features': 'Include actionable insights and expert perspective'
+    }
+}
+
+LENGTH_SPECS = {
+    'short': 'Keep it brief and to the point',
+    'medium': 'Provide moderate detail',
+    'long': 'Be comprehensive and detailed'
+}
+
+TONE_SPECS = {
+    'professional': 'Use professional, business-appropriate language',
+    'casual': 'Use casual, friendly language',
+    'humorous': 'Include light humor where appropriate',
+    'inspirational': 'Use motivational and uplifting language',
+    'educational': 'Focus on teaching and informing'
+}
+
+# Tipe request generate_many -> method
+GENERATE_METHODS = {
+    'content': 'generate_post_content',
+    'hashtags': 'generate_hashtags',
+    'improve': 'improve_content',
+    'title': 'generate_title',
+    'variants': 'generate_variants'
+}
+
 class OpenAIService:
-    def __init__(self):
+    def __init__(self, response_cache=None, model: str = DEFAULT_MODEL, executor=None, db_manager=None,
+                 router: BackendRouter = None):
+        self.response_cache = response_cache
+        self.model = model
+        self.executor = executor
+        self.db_manager = db_manager
         self.api_key = os.environ.get('OPENAI_API_KEY')
         if not self.api_key:
             print("⚠️  Warning: OPENAI_API_KEY not found in environment variables")
@@ -17,79 +85,125 @@ class OpenAIService:
         
         if self.api_key:
             openai.api_key = self.api_key
+        
+        # Tanpa router hanya OpenAI API yang dipakai
+        self.router = router or BackendRouter([OpenAIBackend(self.api_key, model, executor)])
     
     def is_available(self) -> bool:
-        """Check if OpenAI service is available"""
-        return self.api_key is not None
+        """Check if any generation backend is available"""
+        return self.router.is_available()
     
-    def generate_post_content(self, topic: str, platform: str, tone: str = 'professional', 
-                            length: str = 'medium') -> str:
-        """Generate post content untuk platform tertentu"""
+    def _complete(self, messages: List[Dict], use_cache: bool = True, parse=None,
+                  operation: str = 'completion', **params):
+        """Chat completion (teks, sudah di-strip) lewat backend pilihan untuk operasi ini
         
-        if not self.is_available():
-            return self._get_fallback_content(topic, platform)
+        Hasil identik diambil dari response cache. Jika backend gagal, backend berikutnya dicoba;
+        error terakhir diteruskan supaya method memakai fallback template. parse (opsional) dijalankan
+        sebelum hasil disimpan, jadi response yang tidak valid tidak di-cache.
+        """
+        error = RuntimeError('No generation backend available')
+        for backend in self.router.candidates(operation):
+            key = cache_key(backend.cache_model, messages, params)
+            if use_cache and self.response_cache:
+                cached = self.response_cache.get(key)
+                if cached is not None:
+                    try:
+                        result = parse(cached) if parse else cached
+                        self._record_usage(backend, operation, messages, cached, params, cached=True)
+                        return result
+                    except Exception as e:
+                        error = e
+            
+            try:
+                response = self._request(backend, messages, params)
+                content = response.choices[0].message.content.strip()
+                self._record_usage(backend, operation, messages, content, params, response=response)
+                result = parse(content) if parse else content
+            except Exception as e:
+                print(f"⚠️  {backend.name} backend failed for {operation}: {e}")
+                error = e
+                continue
+            
+            # use_cache=False tetap menyimpan hasil terbaru untuk pemanggilan berikutnya
+            if self.response_cache:
+                self.response_cache.store(key, backend.cache_model, content)
+            return result
+        
+        raise error
+    
+    def _request(self, backend, messages: List[Dict], params: Dict):
+        def request():
+            return backend.create(messages, **params)
         
+        if backend.executor:
+            return backend.executor.call(
+                request, estimated_tokens=self._estimate_tokens(backend, messages, params),
+                stream=bool(params.get('stream'))
+            )
+        return request()
+    
+    @staticmethod
+    def _estimate_tokens(backend, messages: List[Dict], params: Dict) -> int:
+        """Token prompt + max_tokens untuk budget TPM executor"""
+        return token_budget.count_message_tokens(messages, backend.model) + params.get('max_tokens', 0)
+    
+    def _record_usage(self, backend, operation: str, messages: List[Dict], completion: str, params: Dict,
+                      response=None, cached: bool = False):
+        if not self.db_manager:
+            return
         try:
-            # Platform-specific prompts
-            platform_prompts = {
-                'facebook': {
-                    'style': 'engaging and conversational',
-                    'length_guide': 'medium length (100-200 words)',
-                    'features': 'Include emojis and call-to-action'
-                },
-                'twitter': {
-                    'style': 'concise and impactful',
-                    'length_guide': 'short (under 280 characters)',
-                    'features': 'Include relevant hashtags'
-                },
-                'linkedin': {
-                    'style': 'professional and insightful',
-                    'length_guide': 'longer form (200-500 words)',
-                    'features': 'Include professional insights and industry perspective'
-                },
-                'instagram': {
-                    'style': 'visual-focused and trendy',
-                    'length_guide': 'medium length with hashtags',
-                    'features': 'Include relevant hashtags and visual descriptions'
-                },
-                'medium': {
-                    'style': 'thoughtful and in-depth',
-                    'length_guide': 'long form article style',
-                    'features': 'Include subheadings and detailed explanations'
-                },
-                'guest_post': {
-                    'style': 'authoritative and valuable',
-                    'length_guide': 'comprehensive article',
-                    'features': 'Include actionable insights and expert perspective'
-                }
-            }
+            counts = token_budget.usage_counts(response, messages, completion, backend.model)
+        except Exception as e:
+            print(f"⚠️  Error counting tokens: {e}")
+            return
+        self.db_manager.log_ai_usage(
+            backend.cache_model, operation, counts['prompt_tokens'], counts['completion_tokens'],
+            max_tokens=params.get('max_tokens'), cached=cached, estimated=counts['estimated']
+        )
+    
+    def generate_many(self, requests: List[Dict]) -> List:
+        """Jalankan banyak request generate secara concurrent, hasil sesuai urutan input
+        
+        Setiap item: {'type': 'content' | 'hashtags' | 'improve' | 'title' | 'variants', ...argumen method}
+        """
+        def run(item: Dict):
+            if not isinstance(item, dict):
+                return {'success': False, 'message': 'Each request must be an object'}
             
-            platform_info = platform_prompts.get(platform.lower(), platform_prompts['facebook'])
+            item = dict(item)
+            request_type = item.pop('type', 'content')
+            method = GENERATE_METHODS.get(request_type)
+            if not method:
+                return {'success': False, 'message': f'Unknown request type: {request_type}'}
             
-            # Length specifications
-            length_specs = {
-                'short': 'Keep it brief and to the point',
-                'medium': 'Provide moderate detail',
-                'long': 'Be comprehensive and detailed'
-            }
+            platforms = item.get('platforms')
+            if request_type == 'variants' and (
+                not isinstance(platforms, list) or not all(isinstance(platform, str) for platform in platforms)
+            ):
+                return {'success': False, 'message': 'platforms must be a list of platform names'}
             
-            # Tone specifications
-            tone_specs = {
-                'professional': 'Use professional, business-appropriate language',
-                'casual': 'Use casual, friendly language',
-                'humorous': 'Include light humor where appropriate',
-                'inspirational': 'Use motivational and uplifting language',
-                'educational': 'Focus on teaching and informing'
-            }
-            
-            prompt = f"""
+            try:
+                return getattr(self, method)(**item)
+            except (TypeError, ValueError, AttributeError, KeyError) as e:
+                print(f"Error in generate_many request: {e}")
+                return {'success': False, 'message': f'Invalid {request_type} request: {str(e)}'}
+        
+        if not self.executor:
+            return [run(item) for item in requests]
+        return self.executor.map(run, requests)
+    
+    def _post_content_request(self, topic: str, platform: str, tone: str, length: str):
+        """(messages, params) untuk generate_post_content dan stream_post_content (key cache sama)"""
+        platform_info = PLATFORM_PROMPTS.get(platform.lower(), PLATFORM_PROMPTS['facebook'])
+        
+        prompt = f"""
 Create a {platform} post about "{topic}".
 
 Requirements:
 - Platform: {platform}
 - Style: {platform_info['style']}
-- Length: {platform_info['length_guide']} ({length_specs.get(length, 'moderate detail')})
-- Tone: {tone_specs.get(tone, 'professional and engaging')}
+- Length: {platform_info['length_guide']} ({LENGTH_SPECS.get(length, 'moderate detail')})
+- Tone: {TONE_SPECS.get(tone, 'professional and engaging')}
 - Features: {platform_info['features']}
 
 Additional guidelines:
@@ -102,25 +216,84 @@ Topic: {topic}
 
 Generate only the post content, no additional explanations.
 """
-
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a social media content expert who creates engaging, platform-specific content."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.7
-            )
-            
-            content = response.choices[0].message.content.strip()
+        messages = [
+            {"role": "system", "content": "You are a social media content expert who creates engaging, platform-specific content."},
+            {"role": "user", "content": prompt}
+        ]
+        return messages, {'max_tokens': token_budget.output_budget(platform, length), 'temperature': 0.7}
+    
+    def generate_post_content(self, topic: str, platform: str, tone: str = 'professional', 
+                            length: str = 'medium', use_cache: bool = True) -> str:
+        """Generate post content untuk platform tertentu"""
+        
+        if not self.is_available():
+            return self._get_fallback_content(topic, platform)
+        
+        try:
+            messages, params = self._post_content_request(topic, platform, tone, length)
+            content = self._complete(messages=messages, use_cache=use_cache, operation='content', **params)
             return content
             
         except Exception as e:
             print(f"Error generating content with OpenAI: {e}")
             return self._get_fallback_content(topic, platform)
     
-    def generate_hashtags(self, content: str, platform: str, count: int = 10) -> List[str]:
+    def stream_post_content(self, topic: str, platform: str, tone: str = 'professional',
+                            length: str = 'medium', use_cache: bool = True) -> Iterator[str]:
+        """Seperti generate_post_content tapi menghasilkan potongan teks selama completion berjalan
+        
+        Hasil dari cache/fallback dikirim sebagai satu potongan. Teks lengkap disimpan ke response cache
+        setelah stream selesai (stream yang terputus tidak disimpan).
+        """
+        if not self.is_available():
+            yield self._get_fallback_content(topic, platform)
+            return
+        
+        messages, params = self._post_content_request(topic, platform, tone, length)
+        for backend in self.router.candidates('content'):
+            key = cache_key(backend.cache_model, messages, params)
+            if use_cache and self.response_cache:
+                cached = self.response_cache.get(key)
+                if cached is not None:
+                    self._record_usage(backend, 'content', messages, cached, params, cached=True)
+                    yield cached
+                    return
+            
+            try:
+                stream = self._request(backend, messages, dict(params, stream=True))
+            except Exception as e:
+                print(f"⚠️  {backend.name} backend failed to stream content: {e}")
+                continue
+            
+            parts = []
+            try:
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.get('content') if chunk.choices else None
+                    if delta:
+                        # Spasi/baris kosong di awal dibuang seperti strip() pada hasil non-stream
+                        if not parts:
+                            delta = delta.lstrip()
+                            if not delta:
+                                continue
+                        parts.append(delta)
+                        yield delta
+            finally:
+                # Client yang memutus SSE menutup generator ini; stream (dan slot executor) ikut dilepas
+                close = getattr(stream, 'close', None)
+                if close:
+                    close()
+            
+            content = ''.join(parts).strip()
+            # Response stream tidak membawa usage, token completion dihitung dari teks
+            self._record_usage(backend, 'content', messages, content, params)
+            if content and self.response_cache:
+                self.response_cache.store(key, backend.cache_model, content)
+            return
+        
+        yield self._get_fallback_content(topic, platform)
+    
+    def generate_hashtags(self, content: str, platform: str, count: int = 10,
+                          use_cache: bool = True) -> List[str]:
         """Generate relevant hashtags untuk content"""
         
         if not self.is_available():
@@ -130,7 +303,7 @@ Generate only the post content, no additional explanations.
             prompt = f"""
 Generate {count} relevant hashtags for this {platform} post:
 
-"{content}"
+"{token_budget.truncate_to_tokens(content, token_budget.INPUT_TOKEN_LIMITS['hashtags'], self.model)}"
 
 Requirements:
 - Make hashtags relevant to the content
@@ -142,17 +315,17 @@ Requirements:
 Generate {count} hashtags:
 """
 
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            hashtags_text = self._complete(
                 messages=[
                     {"role": "system", "content": "You are a social media hashtag expert."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=200,
+                use_cache=use_cache,
+                operation='hashtags',
+                # Satu hashtag ~5-8 token termasuk baris baru
+                max_tokens=count * 8 + 16,
                 temperature=0.5
             )
-            
-            hashtags_text = response.choices[0].message.content.strip()
             hashtags = [tag.strip() for tag in hashtags_text.split('\n') if tag.strip().startswith('#')]
             
             return hashtags[:count]
@@ -161,8 +334,109 @@ Generate {count} hashtags:
             print(f"Error generating hashtags with OpenAI: {e}")
             return self._get_fallback_hashtags(content, platform)
     
+    def generate_variants(self, topic: str, platforms: List[str], tone: str = 'professional',
+                          length: str = 'medium', hashtag_count: int = 10,
+                          use_cache: bool = True) -> Dict[str, Dict]:
+        """Content + hashtags untuk beberapa platform dalam satu completion JSON
+        
+        Return {platform: {'content': str, 'hashtags': [str]}}. Platform yang hilang/tidak valid
+        di response di-generate ulang satu per satu.
+        """
+        platforms = list(dict.fromkeys(platform.lower() for platform in platforms if platform))
+        if not platforms:
+            return {}
+        
+        if not self.is_available():
+            return {
+                platform: {
+                    'content': self._get_fallback_content(topic, platform),
+                    'hashtags': self._get_fallback_hashtags(topic, platform)
+                }
+                for platform in platforms
+            }
+        
+        requirements = '\n'.join(
+            f"- {platform}: {info['style']}; {info['length_guide']}; {info['features']}"
+            for platform, info in (
+                (platform, PLATFORM_PROMPTS.get(platform, PLATFORM_PROMPTS['facebook'])) for platform in platforms
+            )
+        )
+        prompt = f"""
+Create one post about "{topic}" for each of these platforms:
+{requirements}
+
+For every platform:
+- Length: {LENGTH_SPECS.get(length, 'moderate detail')}
+- Tone: {TONE_SPECS.get(tone, 'professional and engaging')}
+- {hashtag_count} relevant hashtags (mix of popular and niche, no spaces, with # symbol)
+
+Respond with JSON only, no markdown, in exactly this shape:
+{{"variants": {{"<platform>": {{"content": "<post text>", "hashtags": ["#tag", "..."]}}}}}}
+Use these platform keys: {', '.join(platforms)}
+"""
+        
+        variants = {}
+        try:
+            variants = self._complete(
+                messages=[
+                    {"role": "system", "content": "You are a social media content expert who creates engaging, platform-specific content. You answer with valid JSON only."},
+                    {"role": "user", "content": prompt}
+                ],
+                use_cache=use_cache,
+                parse=lambda text: self._parse_variants(text, platforms, hashtag_count),
+                operation='variants',
+                # Budget tiap platform + hashtags + overhead JSON
+                max_tokens=sum(
+                    token_budget.output_budget(platform, length) + hashtag_count * 8 + 24 for platform in platforms
+                ) + 16,
+                temperature=0.7
+            )
+        except Exception as e:
+            print(f"Error generating variants with OpenAI: {e}")
+        
+        for platform in platforms:
+            if platform not in variants:
+                content = self.generate_post_content(topic, platform, tone, length, use_cache=use_cache)
+                variants[platform] = {
+                    'content': content,
+                    'hashtags': self.generate_hashtags(content, platform, hashtag_count, use_cache=use_cache)
+                }
+        
+        return {platform: variants[platform] for platform in platforms}
+    
+    @staticmethod
+    def _parse_variants(text: str, platforms: List[str], hashtag_count: int) -> Dict[str, Dict]:
+        """Validasi response generate_variants; ValueError jika tidak ada satu pun variant yang valid"""
+        text = text.strip()
+        if text.startswith('```'):
+            text = text.strip('`')
+            text = text[text.index('{'):] if '{' in text else text
+        
+        data = json.loads(text)
+        raw = data.get('variants', data) if isinstance(data, dict) else None
+        if not isinstance(raw, dict):
+            raise ValueError('Response JSON must be an object of platform variants')
+        raw = {str(key).lower(): value for key, value in raw.items()}
+        
+        variants = {}
+        for platform in platforms:
+            item = raw.get(platform)
+            if not isinstance(item, dict) or not isinstance(item.get('content'), str) or not item['content'].strip():
+                continue
+            hashtags = item.get('hashtags') or []
+            if isinstance(hashtags, str):
+                hashtags = hashtags.split()
+            if not isinstance(hashtags, list):
+                continue
+            hashtags = ['#' + str(tag).strip().lstrip('#').replace(' ', '') for tag in hashtags if str(tag).strip('# ')]
+            variants[platform] = {'content': item['content'].strip(), 'hashtags': hashtags[:hashtag_count]}
+        
+        if not variants:
+            raise ValueError('Response JSON contains no valid platform variants')
+        return variants
+    
     def improve_content(self, original_content: str, platform: str, 
-                       improvement_type: str = 'engagement') -> str:
+                       improvement_type: str = 'engagement', use_cache: bool = True) -> str:
         """Improve existing content"""
         
         if not self.is_available():
@@ -179,6 +453,12 @@ Generate {count} hashtags:
             
             improvement_instruction = improvement_prompts.get(improvement_type, 'improve overall quality')
             
+            # Input dibatasi supaya prompt + output tetap muat di context; output mengikuti panjang asli
+            original_content = token_budget.truncate_to_tokens(
+                original_content, token_budget.INPUT_TOKEN_LIMITS['improve'], self.model
+            )
+            original_tokens = token_budget.count_tokens(original_content, self.model)
+            
             prompt = f"""
 Improve this {platform} post to {improvement_instruction}:
 
@@ -195,24 +475,23 @@ Requirements:
 Improved content:
 """
 
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            improved_content = self._complete(
                 messages=[
                     {"role": "system", "content": "You are a social media content improvement expert."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=800,
+                use_cache=use_cache,
+                operation='improve',
+                max_tokens=token_budget.improve_budget(original_tokens),
                 temperature=0.6
             )
-            
-            improved_content = response.choices[0].message.content.strip()
             return improved_content
             
         except Exception as e:
             print(f"Error improving content with OpenAI: {e}")
             return original_content
     
-    def generate_title(self, content: str, platform: str = 'general') -> str:
+    def generate_title(self, content: str, platform: str = 'general', use_cache: bool = True) -> str:
         """Generate title untuk content"""
         
         if not self.is_available():
@@ -222,7 +501,7 @@ Improved content:
             prompt = f"""
 Generate a compelling title for this content:
 
-"{content[:500]}..."
+"{token_budget.truncate_to_tokens(content, token_budget.INPUT_TOKEN_LIMITS['title'], self.model)}"
 
 Requirements:
 - Make it attention-grabbing
@@ -234,17 +513,16 @@ Requirements:
 Title:
 """
 
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            title = self._complete(
                 messages=[
                     {"role": "system", "content": "You are a headline writing expert."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=100,
+                use_cache=use_cache,
+                operation='title',
+                max_tokens=40,
                 temperature=0.7
             )
-            
-            title = response.choices[0].message.content.strip()
             return title
             
         except Exception as e:
@@ -286,33 +564,40 @@ Title:
         first_sentence = content.split('.')[0] if '.' in content else content[:50]
         return first_sentence.strip() + ('...' if len(content) > 50 else '')
     
-    def test_connection(self) -> Dict:
-        """Test OpenAI API connection"""
+    def test_connection(self, backend_name: str = None) -> Dict:
+        """Test koneksi backend (default: backend pilihan untuk generate content)"""
         
-        if not self.is_available():
-            return {
-                'success': False,
-                'message': 'OpenAI API key not configured'
-            }
+        if backend_name:
+            backend = self.router.backends.get(backend_name)
+            if not backend or not backend.is_available():
+                return {
+                    'success': False,
+                    'message': f'Generation backend {backend_name} not configured'
+                }
+        else:
+            candidates = self.router.candidates('content')
+            if not candidates:
+                return {
+                    'success': False,
+                    'message': 'OpenAI API key not configured'
+                }
+            backend = candidates[0]
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "user", "content": "Say 'Hello, OpenAI API is working!'"}
-                ],
+            response = backend.create(
+                [{"role": "user", "content": "Say 'Hello, OpenAI API is working!'"}],
                 max_tokens=20
             )
             
             return {
                 'success': True,
-                'message': 'OpenAI API connection successful',
+                'message': f'{backend.name} backend connection successful',
+                'backend': backend.describe(),
                 'response': response.choices[0].message.content
             }
             
         except Exception as e:
             return {
                 'success': False,
-                'message': f'OpenAI API connection failed: {str(e)}'
+                'message': f'{backend.name} backend connection failed: {str(e)}'
             }
-
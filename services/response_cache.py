@@ -0,0 +1,65 @@
+"""
+Response Cache untuk OpenAIService
+Menyimpan hasil chat completion di SQLite (tabel ai_response_cache) dengan key hash dari
+model + messages + parameter, supaya input yang sama tidak dibayar dan ditunggu dua kali.
+Entry dibuang jika lebih tua dari TTL atau paling lama tidak dipakai saat melewati max_entries.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Dict, List, Optional
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def cache_key(model: str, messages: List[Dict], params: Dict) -> str:
+    """SHA-256 dari request yang dinormalisasi (urutan key tidak berpengaruh)"""
+    payload = json.dumps({'model': model, 'messages': messages, 'params': params},
+                         sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Cache LRU/TTL persisten + counter hit/miss untuk monitoring"""
+
+    def __init__(self, db_manager, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.db_manager = db_manager
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0}
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            response = self.db_manager.get_ai_response(key, self.ttl_seconds)
+        except Exception as e:
+            print(f"⚠️  Error reading AI response cache: {e}")
+            response = None
+        self._count('hits' if response is not None else 'misses')
+        return response
+
+    def store(self, key: str, model: str, response: str):
+        try:
+            self.db_manager.save_ai_response(
+                key, model, response, max_entries=self.max_entries, max_age_seconds=self.ttl_seconds
+            )
+            self._count('stores')
+        except Exception as e:
+            print(f"⚠️  Error saving AI response cache: {e}")
+
+    def clear(self) -> int:
+        return self.db_manager.clear_ai_responses()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
@@ -0,0 +1,234 @@
+"""
+Publish Scheduler untuk Social Media Automation V2
+Membatasi concurrency dan rate (token bucket) per platform dan per akun
+
+Token platform dihitung per post. Token akun dihitung per session browser (satu login),
+jadi satu session bisa mem-publish sampai AUTOMATION_BATCH_SIZE post milik akun yang sama,
+dibatasi oleh burst / sisa token platform-nya.
+"""
+
+import json
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Default limits, bisa di-override lewat tabel settings (JSON).
+# scheduler_platform_limits: post per jam per platform; scheduler_account_limits: session per jam per akun
+DEFAULT_PLATFORM_LIMITS = {
+    'default': {'concurrency': 2, 'rate_per_hour': 60, 'burst': 5},
+    'twitter': {'concurrency': 3, 'rate_per_hour': 120, 'burst': 10},
+    'instagram': {'concurrency': 1, 'rate_per_hour': 20, 'burst': 2},
+    'guest_post': {'concurrency': 2, 'rate_per_hour': 30, 'burst': 3}
+}
+
+DEFAULT_ACCOUNT_LIMITS = {'rate_per_hour': 12, 'burst': 2}
+
+PLATFORM_LIMITS_SETTING = 'scheduler_platform_limits'
+ACCOUNT_LIMITS_SETTING = 'scheduler_account_limits'
+
+
+class TokenBucket:
+    """Token bucket sederhana: `burst` token, diisi ulang `rate_per_hour` per jam"""
+
+    def __init__(self, rate_per_hour: float, burst: int):
+        self.configure(rate_per_hour, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def configure(self, rate_per_hour: float, burst: int):
+        self.rate = max(0.0, float(rate_per_hour)) / 3600.0
+        self.capacity = max(1, int(burst))
+        if hasattr(self, 'tokens'):
+            self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, amount: float = 1) -> bool:
+        self._refill()
+        return self.tokens >= min(amount, self.capacity)
+
+    def consume(self, amount: float = 1):
+        self._refill()
+        self.tokens -= amount
+
+    def wait_time(self, amount: float = 1) -> float:
+        """Detik sampai `amount` token tersedia (dibatasi kapasitas bucket)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        if self.rate <= 0:
+            return float('inf')
+        return (amount - self.tokens) / self.rate
+
+
+class PublishScheduler:
+    """Menentukan kapan sebuah post boleh dipublish berdasarkan limit platform dan akun"""
+
+    def __init__(self, db_manager, refresh_interval: float = 60.0):
+        self.db_manager = db_manager
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._platform_limits: Dict[str, Dict] = {}
+        self._account_limits: Dict = {}
+        self._loaded_at = 0.0
+
+        self._platform_active: Dict[str, int] = {}
+        self._active_targets = set()
+        self._platform_buckets: Dict[str, TokenBucket] = {}
+        self._target_buckets: Dict[Tuple[str, int], TokenBucket] = {}
+
+    @staticmethod
+    def target_key(post: Dict) -> Optional[Tuple[str, int]]:
+        """Akun yang dipakai post: social account atau guest site"""
+        if post.get('account_id'):
+            return ('account', post['account_id'])
+        if post.get('guest_site_id'):
+            return ('guest_site', post['guest_site_id'])
+        return None
+
+    def try_acquire(self, post: Dict) -> Optional[Tuple[str, Optional[Tuple[str, int]]]]:
+        """Ambil slot publish untuk post; None jika limit sedang penuh"""
+        platform = post['platform'].lower()
+        target = self.target_key(post)
+
+        with self._lock:
+            self._refresh_limits_locked()
+
+            if not self._platform_ready_locked(platform):
+                return None
+            if target and not self._target_ready_locked(target):
+                return None
+
+            self._platform_active[platform] = self._platform_active.get(platform, 0) + 1
+            self._platform_bucket_locked(platform).consume()
+            if target:
+                self._active_targets.add(target)
+                self._target_bucket_locked(target).consume()
+
+            return (platform, target)
+
+    def try_extend(self, slot: Tuple[str, Optional[Tuple[str, int]]]) -> bool:
+        """Tambah satu post ke session yang sudah memegang slot
+        
+        Hanya token platform yang dipakai; token akun sudah dibayar sekali oleh try_acquire.
+        """
+        platform, _ = slot
+        with self._lock:
+            platform_bucket = self._platform_bucket_locked(platform)
+            if not platform_bucket.available():
+                return False
+            platform_bucket.consume()
+            return True
+
+    def release(self, slot: Tuple[str, Optional[Tuple[str, int]]]):
+        """Lepaskan slot publish"""
+        platform, target = slot
+        with self._lock:
+            self._platform_active[platform] = max(0, self._platform_active.get(platform, 0) - 1)
+            if target:
+                self._active_targets.discard(target)
+
+    def blocked(self) -> Dict:
+        """Platform/akun yang saat ini tidak bisa menerima publish baru (untuk filter lease)"""
+        with self._lock:
+            self._refresh_limits_locked()
+            platforms = [
+                platform for platform in set(self._platform_active) | set(self._platform_buckets)
+                if not self._platform_ready_locked(platform)
+            ]
+            targets = [
+                target for target in self._active_targets | set(self._target_buckets)
+                if not self._target_ready_locked(target)
+            ]
+
+        return {
+            'platforms': platforms,
+            'account_ids': [target_id for kind, target_id in targets if kind == 'account'],
+            'guest_site_ids': [target_id for kind, target_id in targets if kind == 'guest_site']
+        }
+
+    def next_available_in(self) -> float:
+        """Perkiraan detik sampai ada bucket yang kembali punya token"""
+        with self._lock:
+            waits = [bucket.wait_time() for bucket in self._platform_buckets.values()]
+            waits += [bucket.wait_time() for bucket in self._target_buckets.values()]
+        waits = [wait for wait in waits if wait > 0]
+        return min(waits) if waits else 0.0
+
+    def get_status(self) -> Dict:
+        """Status scheduler untuk monitoring"""
+        with self._lock:
+            return {
+                'platform_active': dict(self._platform_active),
+                'active_accounts': len(self._active_targets),
+                'platform_tokens': {
+                    platform: round(bucket.tokens, 2) for platform, bucket in self._platform_buckets.items()
+                }
+            }
+
+    # Internal helpers (dipanggil saat lock dipegang)
+    def _platform_limit_locked(self, platform: str) -> Dict:
+        limits = dict(self._platform_limits.get('default', DEFAULT_PLATFORM_LIMITS['default']))
+        limits.update(self._platform_limits.get(platform, {}))
+        return limits
+
+    def _platform_ready_locked(self, platform: str) -> bool:
+        limits = self._platform_limit_locked(platform)
+        if self._platform_active.get(platform, 0) >= limits['concurrency']:
+            return False
+        return self._platform_bucket_locked(platform).available()
+
+    def _target_ready_locked(self, target: Tuple[str, int]) -> bool:
+        # Satu akun tidak pernah dipakai oleh dua session sekaligus
+        if target in self._active_targets:
+            return False
+        return self._target_bucket_locked(target).available()
+
+    def _platform_bucket_locked(self, platform: str) -> TokenBucket:
+        limits = self._platform_limit_locked(platform)
+        bucket = self._platform_buckets.get(platform)
+        if bucket is None:
+            bucket = self._platform_buckets[platform] = TokenBucket(limits['rate_per_hour'], limits['burst'])
+        return bucket
+
+    def _target_bucket_locked(self, target: Tuple[str, int]) -> TokenBucket:
+        bucket = self._target_buckets.get(target)
+        if bucket is None:
+            bucket = self._target_buckets[target] = TokenBucket(
+                self._account_limits['rate_per_hour'], self._account_limits['burst']
+            )
+        return bucket
+
+    def _refresh_limits_locked(self):
+        now = time.monotonic()
+        if self._loaded_at and now - self._loaded_at < self.refresh_interval:
+            return
+        self._loaded_at = now
+
+        platform_limits = {key: dict(value) for key, value in DEFAULT_PLATFORM_LIMITS.items()}
+        for platform, limits in self._load_setting(PLATFORM_LIMITS_SETTING).items():
+            platform_limits.setdefault(platform.lower(), {}).update(limits)
+        account_limits = dict(DEFAULT_ACCOUNT_LIMITS)
+        account_limits.update(self._load_setting(ACCOUNT_LIMITS_SETTING))
+
+        self._platform_limits = platform_limits
+        self._account_limits = account_limits
+
+        for platform, bucket in self._platform_buckets.items():
+            limits = self._platform_limit_locked(platform)
+            bucket.configure(limits['rate_per_hour'], limits['burst'])
+        for bucket in self._target_buckets.values():
+            bucket.configure(account_limits['rate_per_hour'], account_limits['burst'])
+
+    def _load_setting(self, key: str) -> Dict:
+        try:
+            value = self.db_manager.get_setting(key)
+            return json.loads(value) if value else {}
+        except Exception as e:
+            print(f"⚠️  Invalid scheduler setting {key}: {e}")
+            return {}
@@ -0,0 +1,306 @@
+"""
+Batch Scraper untuk Social Media Automation V2
+Fetch banyak URL (atau sitemap) secara concurrent lewat satu HTTP session yang di-pool
+(keep-alive + kompresi), parse di thread pool, lalu simpan ke scraped_content secara bulk.
+Dengan HttpCache, halaman yang tidak berubah (304 / hash sama) tidak di-parse dan tidak disimpan ulang.
+"""
+
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401  (backend parser BeautifulSoup yang jauh lebih cepat dari html.parser)
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+PARSER_BACKENDS = ('lxml', 'html.parser', 'html5lib')
+
+# Dengan strainer hanya subtree ini yang di-parse; title dan isi artikel hampir selalu ada di dalamnya
+STRAINED_TAGS = ['article', 'main', 'h1', 'title', 'p']
+
+CONTENT_SELECTORS = [
+    'article', '.post-content', '.entry-content',
+    '.content', 'main', '.post', '.article-content'
+]
+# Elemen (div/section/...) dengan class ini juga di-parse, walaupun tidak berada di dalam article/main
+CONTENT_CLASSES = {selector[1:] for selector in CONTENT_SELECTORS if selector.startswith('.')}
+MAX_CONTENT_LENGTH = 2000
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+_SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+def create_http_session(pool_size: int = 16) -> requests.Session:
+    """Session dengan connection pool (keep-alive) dan header kompresi"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def resolve_parser(parser: str = None) -> str:
+    """Nama backend BeautifulSoup: lxml jika terpasang, selain itu html.parser"""
+    if not parser or parser == 'auto' or parser not in PARSER_BACKENDS:
+        return DEFAULT_PARSER
+    return parser
+
+
+def is_content_tag(name: str, attrs: Dict = None) -> bool:
+    """Tag yang disimpan strainer: STRAINED_TAGS atau tag dengan class dari CONTENT_SELECTORS"""
+    if name in STRAINED_TAGS:
+        return True
+    classes = (attrs or {}).get('class') or ''
+    if isinstance(classes, str):
+        classes = classes.split()
+    return not CONTENT_CLASSES.isdisjoint(classes)
+
+
+class ContentStrainer(SoupStrainer):
+    """SoupStrainer yang memilih tag lewat is_content_tag (nama atau class)"""
+
+    def __init__(self):
+        super().__init__(STRAINED_TAGS)
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        # beautifulsoup4 >= 4.13
+        return is_content_tag(name, attrs)
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # beautifulsoup4 4.12: dipanggil dengan nama + atribut mentah sebelum Tag dibuat
+        if isinstance(markup_name, str):
+            return markup_name if is_content_tag(markup_name, markup_attrs) else None
+        return super().search_tag(markup_name, markup_attrs)
+
+
+def extract_content(html: bytes, url: str, parser: str = None, strained: bool = True) -> Dict:
+    """Ambil title dan isi artikel dari HTML (strained: hanya parse title, h1, p dan elemen content)"""
+    parse_only = ContentStrainer() if strained else None
+    soup = BeautifulSoup(html, resolve_parser(parser), parse_only=parse_only)
+
+    # Extract title
+    title = ''
+    title_tags = soup.find_all(['h1', 'title'])
+    if title_tags:
+        title = title_tags[0].get_text().strip()
+
+    # Extract content
+    content = ''
+    for selector in CONTENT_SELECTORS:
+        content_elem = soup.select_one(selector)
+        if content_elem:
+            # Remove script and style elements
+            for script in content_elem(["script", "style"]):
+                script.decompose()
+            content = content_elem.get_text().strip()
+            break
+
+    if not content:
+        # Fallback: get all paragraph text
+        paragraphs = soup.find_all('p')
+        content = ' '.join([p.get_text().strip() for p in paragraphs])
+
+    return {
+        'success': True,
+        'title': title,
+        'content': content[:MAX_CONTENT_LENGTH],
+        'url': url
+    }
+
+
+class BatchScraper:
+    """Scraper concurrent dengan batas koneksi per host"""
+
+    def __init__(self, db_manager=None, max_workers: int = 16, per_host: int = 4,
+                 parse_workers: int = 4, timeout: float = 30, insert_batch_size: int = 100,
+                 http_cache=None, parser: str = None, strained: bool = True):
+        self.db_manager = db_manager
+        self.http_cache = http_cache
+        self.parser = resolve_parser(parser)
+        self.strained = strained
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self.parse_workers = max(1, parse_workers)
+        self.timeout = timeout
+        self.insert_batch_size = max(1, insert_batch_size)
+
+        self.session = create_http_session(self.max_workers)
+        self._host_lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    def fetch(self, url: str, headers: Dict[str, str] = None) -> requests.Response:
+        """GET dengan batas concurrency per host"""
+        with self._host_slot(url):
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+
+    def fetch_page(self, url: str) -> Tuple[str, requests.Response]:
+        """Fetch dengan conditional request; status 'not_modified', 'unchanged', atau 'changed'"""
+        if not self.http_cache:
+            return 'changed', self.fetch(url)
+        response = self.fetch(url, headers=self.http_cache.conditional_headers(url))
+        return self.http_cache.check(url, response), response
+
+    def scrape_url(self, url: str) -> Dict:
+        """Scrape satu URL (dipakai oleh SocialMediaBot.scrape_content)"""
+        try:
+            status, response = self.fetch_page(url)
+            if status != 'changed':
+                return {
+                    'success': True,
+                    'unchanged': True,
+                    'cache_status': status,
+                    'message': 'Content not modified since last scrape',
+                    'url': url
+                }
+
+            result = extract_content(response.content, url, self.parser, self.strained)
+            # Validator disimpan oleh pemanggil setelah content berhasil masuk database,
+            # supaya halaman yang gagal disimpan tidak dianggap 'unchanged' di scrape berikutnya
+            if self.http_cache and result['success']:
+                result['cache_validators'] = self.http_cache.validators(response)
+            return result
+        except Exception as e:
+            return {'success': False, 'message': f'Content scraping failed: {str(e)}', 'url': url}
+
+    def sitemap_urls(self, sitemap_url: str, limit: int = None, max_depth: int = 2) -> List[str]:
+        """Daftar URL dari sitemap.xml (sitemap index diikuti sampai max_depth)"""
+        urls = []
+        pending = [(sitemap_url, 0)]
+        while pending and (limit is None or len(urls) < limit):
+            current, depth = pending.pop(0)
+            try:
+                root = ET.fromstring(self.fetch(current).content)
+            except Exception as e:
+                print(f"⚠️  Error reading sitemap {current}: {e}")
+                continue
+
+            locations = [loc.text.strip() for loc in root.iter(f'{_SITEMAP_NS}loc') if loc.text]
+            if root.tag == f'{_SITEMAP_NS}sitemapindex':
+                if depth < max_depth:
+                    pending.extend((location, depth + 1) for location in locations)
+            else:
+                urls.extend(locations)
+
+        return urls[:limit] if limit else urls
+
+    def scrape(self, urls: List[str] = None, sitemap_url: str = None, limit: int = None,
+               save: bool = True) -> Dict:
+        """Scrape banyak URL; hasil disimpan bertahap (bulk insert) selama fetch masih berjalan"""
+        targets = list(urls or [])
+        if sitemap_url:
+            targets.extend(self.sitemap_urls(sitemap_url, limit=limit))
+        targets = list(dict.fromkeys(url for url in targets if url))
+        if limit:
+            targets = targets[:limit]
+
+        stats = {'total': len(targets), 'scraped': 0, 'unchanged': 0, 'saved': 0, 'duplicates': 0, 'failed': 0}
+        errors = []
+        content_ids = []
+        pending_rows = []
+        pending_responses = []
+
+        def flush():
+            rows, responses = list(pending_rows), list(pending_responses)
+            pending_rows.clear()
+            pending_responses.clear()
+            if not (save and self.db_manager and rows):
+                return
+            result = self.db_manager.add_content_bulk(rows)
+            if result['success']:
+                content_ids.extend(result['content_ids'])
+                stats['saved'] += len(result['content_ids'])
+                stats['duplicates'] += len(result['duplicates'])
+                # Baris duplikat juga: kontennya sudah ada di DB, jadi validator tetap disimpan
+                if self.http_cache:
+                    for response, row in zip(responses, rows):
+                        self.http_cache.store(row['source_url'], response)
+            else:
+                errors.append({'url': None, 'message': result['message']})
+
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix='scrape-fetch') as fetchers, \
+                ThreadPoolExecutor(self.parse_workers, thread_name_prefix='scrape-parse') as parsers:
+            # Fetch dan parse berjalan bersamaan; setiap hasil parse langsung masuk antrian insert
+            pending = {fetchers.submit(self.fetch_page, url): ('fetch', url) for url in targets}
+            responses = {}
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, url = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        stats['failed'] += 1
+                        message = str(e) if stage == 'fetch' else f'Parse failed: {str(e)}'
+                        errors.append({'url': url, 'message': message})
+                        responses.pop(url, None)
+                        continue
+
+                    if stage == 'fetch':
+                        status, response = result
+                        if status != 'changed':
+                            stats['unchanged'] += 1
+                            continue
+                        responses[url] = response
+                        pending[parsers.submit(
+                            extract_content, response.content, url, self.parser, self.strained
+                        )] = ('parse', url)
+                        continue
+
+                    response = responses.pop(url)
+
+                    if not result['content']:
+                        stats['failed'] += 1
+                        errors.append({'url': url, 'message': 'No content found'})
+                        continue
+
+                    stats['scraped'] += 1
+                    pending_rows.append({
+                        'title': result['title'] or url,
+                        'content': result['content'],
+                        'source_url': url,
+                        'scraped_at': datetime.now().isoformat()
+                    })
+                    pending_responses.append(response)
+                    if len(pending_rows) >= self.insert_batch_size:
+                        flush()
+
+            flush()
+
+        return {
+            'success': stats['scraped'] + stats['unchanged'] > 0,
+            'message': f"Scraped {stats['scraped']} of {stats['total']} URLs "
+                       f"({stats['unchanged']} unchanged, {stats['duplicates']} duplicates)",
+            **stats,
+            'content_ids': content_ids,
+            'errors': errors[:50]
+        }
+
+    def close(self):
+        self.session.close()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
@@ -0,0 +1,128 @@
+"""
+Token Budget untuk OpenAIService
+Menghitung token prompt (tiktoken jika terpasang, selain itu perkiraan offline), menentukan
+max_tokens per platform + panjang, dan memotong input yang terlalu panjang sebelum dikirim.
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Perkiraan offline dipakai tanpa tiktoken
+    tiktoken = None
+
+# Overhead format chat per message dan per balasan (sesuai cookbook OpenAI untuk gpt-3.5-turbo)
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+# max_tokens output per platform dan panjang (twitter < 280 karakter tidak butuh 1000 token)
+OUTPUT_TOKEN_BUDGETS = {
+    'twitter': {'short': 80, 'medium': 110, 'long': 140},
+    'facebook': {'short': 150, 'medium': 320, 'long': 600},
+    'instagram': {'short': 150, 'medium': 300, 'long': 500},
+    'linkedin': {'short': 250, 'medium': 550, 'long': 900},
+    'medium': {'short': 600, 'medium': 1200, 'long': 2000},
+    'guest_post': {'short': 700, 'medium': 1400, 'long': 2500}
+}
+DEFAULT_OUTPUT_BUDGET = OUTPUT_TOKEN_BUDGETS['facebook']
+
+# Batas token input per operasi; teks yang lebih panjang dipotong
+INPUT_TOKEN_LIMITS = {
+    'hashtags': 600,
+    'title': 300,
+    'improve': 1200
+}
+
+_TOKEN_RE = re.compile(r'\w+|[^\w\s]', re.UNICODE)
+_encodings = {}
+_encodings_lock = threading.Lock()
+
+
+def _encoding(model: str):
+    """Encoding tiktoken untuk model (None jika tiktoken tidak ada / encoding tidak bisa di-load)"""
+    if tiktoken is None:
+        return None
+    with _encodings_lock:
+        if model not in _encodings:
+            try:
+                try:
+                    _encodings[model] = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    # Model lokal / tidak dikenal: encoding gpt-3.5/gpt-4 sebagai perkiraan terdekat
+                    _encodings[model] = tiktoken.get_encoding('cl100k_base')
+            except Exception as e:
+                # File BPE di-download sekali; tanpa jaringan pakai perkiraan
+                print(f"⚠️  tiktoken encoding unavailable, using estimate: {e}")
+                _encodings[model] = None
+        return _encodings[model]
+
+
+def is_exact(model: str) -> bool:
+    return _encoding(model) is not None
+
+
+def count_tokens(text: str, model: str) -> int:
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text or ''))
+    # Perkiraan: kata panjang dipecah per ~4 karakter, tanda baca 1 token
+    return sum(max(1, (len(piece) + 3) // 4) for piece in _TOKEN_RE.findall(text or ''))
+
+
+def count_message_tokens(messages: List[Dict], model: str) -> int:
+    return sum(TOKENS_PER_MESSAGE + count_tokens(message['content'], model) for message in messages) + TOKENS_PER_REPLY
+
+
+def output_budget(platform: str, length: str = 'medium') -> int:
+    budgets = OUTPUT_TOKEN_BUDGETS.get((platform or '').lower(), DEFAULT_OUTPUT_BUDGET)
+    return budgets.get(length, budgets['medium'])
+
+
+def truncate_to_tokens(text: str, limit: int, model: str) -> str:
+    """Potong teks ke maksimal `limit` token, di batas kalimat/kata jika memungkinkan"""
+    text = text or ''
+    if count_tokens(text, model) <= limit:
+        return text
+
+    encoding = _encoding(model)
+    if encoding is not None:
+        cut = encoding.decode(encoding.encode(text)[:limit])
+    else:
+        cut = ''
+        used = 0
+        for match in _TOKEN_RE.finditer(text):
+            used += count_tokens(match.group(), model)
+            if used > limit:
+                break
+            cut = text[:match.end()]
+
+    # Mundur ke akhir kalimat (atau spasi) terakhir supaya tidak berhenti di tengah kata
+    boundary = max(cut.rfind('. '), cut.rfind('.\n'), cut.rfind('! '), cut.rfind('? '))
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary + 1]
+    elif ' ' in cut:
+        cut = cut[:cut.rfind(' ')]
+    return cut.rstrip() + ' …'
+
+
+def improve_budget(original_tokens: int, minimum: int = 64, maximum: int = 2000) -> int:
+    """max_tokens untuk improve_content: panjang asli + ruang 50%"""
+    return max(minimum, min(maximum, int(original_tokens * 1.5) + 32))
+
+
+def usage_counts(response, messages: List[Dict], completion: str, model: str) -> Dict[str, Optional[int]]:
+    """Token prompt/completion dari response.usage, atau dihitung lokal jika tidak ada (stream/cache)"""
+    usage = getattr(response, 'usage', None) if response is not None else None
+    if usage is not None and getattr(usage, 'prompt_tokens', None) is not None:
+        return {
+            'prompt_tokens': usage.prompt_tokens,
+            'completion_tokens': usage.completion_tokens,
+            'estimated': False
+        }
+    return {
+        'prompt_tokens': count_message_tokens(messages, model),
+        'completion_tokens': count_tokens(completion, model),
+        'estimated': not is_exact(model)
+    }
@@ -330,9 +330,9 @@ class SocialMediaApp {
     async handleGenerate(element) {
         const type = element.dataset.generateType || 'content';
         const target = element.dataset.target;
+        const targetElement = target ? document.getElementById(target) : null;
 
         try {
-            this.showLoading();
             element.disabled = true;
             element.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Generating...';
             
@@ -346,23 +346,35 @@ class SocialMediaApp {
                     type: type,
                     topic: document.getElementById('topic')?.value || '',
                     platform: document.getElementById('platform')?.value || '',
-                    tone: document.getElementById('tone')?.value || 'professional'
+                    tone: document.getElementById('tone')?.value || 'professional',
+                    stream: true
                 })
             });
 
-            const result = await response.json();
+            let result;
+            if ((response.headers.get('Content-Type') || '').includes('text/event-stream')) {
+                // Render text into the target field as tokens arrive
+                if (targetElement) {
+                    targetElement.value = '';
+                }
+                result = await this.readEventStream(response, (delta) => {
+                    if (targetElement) {
+                        targetElement.value += delta;
+                        targetElement.scrollTop = targetElement.scrollHeight;
+                    }
+                });
+            } else {
+                result = await response.json();
+            }
             
             if (result.success || result.content) {
                 this.showToast('Success', 'Content generated successfully', 'success');
                 
-                // Fill the target field with generated content
-                if (target) {
-                    const targetElement = document.getElementById(target);
-                    if (targetElement) {
-                        targetElement.value = result.content;
-                        // Trigger input event for any listeners
-                        targetElement.dispatchEvent(new Event('input'));
-                    }
+                // Fill the target field with the final generated content
+                if (targetElement) {
+                    targetElement.value = result.content;
+                    // Trigger input event for any listeners
+                    targetElement.dispatchEvent(new Event('input'));
                 }
             } else {
                 this.showToast('Error', result.message || 'Failed to generate content', 'error');
@@ -371,12 +383,57 @@ class SocialMediaApp {
             console.error('Generate error:', error);
             this.showToast('Error', 'An error occurred while generating content', 'error');
         } finally {
-            this.hideLoading();
             element.disabled = false;
             element.innerHTML = '<i class="fas fa-magic"></i> Generate';
         }
     }
 
+    async readEventStream(response, onDelta) {
+        // Parse Server-Sent Events from a fetch body (EventSource cannot POST)
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let result = { success: false, message: 'Stream ended unexpectedly' };
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const block = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let event = 'message';
+                const data = [];
+                block.split('\n').forEach((line) => {
+                    if (line.startsWith('event:')) {
+                        event = line.slice(6).trim();
+                    } else if (line.startsWith('data:')) {
+                        data.push(line.slice(5).trim());
+                    }
+                });
+                if (!data.length) {
+                    continue;
+                }
+
+                const payload = JSON.parse(data.join('\n'));
+                if (event === 'done') {
+                    result = { success: true, content: payload.content };
+                } else if (event === 'error') {
+                    result = { success: false, message: payload.message };
+                } else if (payload.delta) {
+                    onDelta(payload.delta);
+                }
+            }
+        }
+
+        return result;
+    }
+
     handleKeyboardShortcuts(e) {
         // Ctrl/Cmd + K for global search
         if ((e.ctrlKey || e.metaKey) && e.key === 'k') {
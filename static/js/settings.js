@@ -207,6 +207,7 @@ class SettingsManager {
             'generalSettingsForm': 'general',
             'contentSettingsForm': 'content',
             'openaiSettingsForm': 'openai',
+            'generationSettingsForm': 'generation',
             'otherApiSettingsForm': 'api',
             'emailNotificationForm': 'email',
             'browserNotificationForm': 'browser',
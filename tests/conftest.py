@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# Repo belum di-package: import `database.` / `services.` dari root repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """DatabaseManager dengan database baru yang sudah menjalankan semua migration"""
+    manager = DatabaseManager(str(tmp_path / 'test.db'))
+    manager.init_database()
+    yield manager
+    manager.close_connection()
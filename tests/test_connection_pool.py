@@ -0,0 +1,53 @@
+"""Koneksi dikembalikan ke pool per request dan dipakai ulang oleh thread lain"""
+
+import threading
+
+from database.db_manager import DatabaseManager
+
+
+def connection_in_thread(db, release: bool = True):
+    """Jalankan satu 'request' di thread baru, seperti server threaded Werkzeug"""
+    used = []
+
+    def handle():
+        conn = db.get_connection()
+        conn.execute('SELECT COUNT(*) FROM posts').fetchone()
+        used.append(conn)
+        if release:
+            db.release_connection()
+
+    thread = threading.Thread(target=handle)
+    thread.start()
+    thread.join()
+    return used[0]
+
+
+def test_released_connection_is_reused_by_next_thread(db):
+    db.release_connection()
+
+    first = connection_in_thread(db)
+    second = connection_in_thread(db)
+
+    assert first is second
+
+
+def test_pool_keeps_at_most_pool_size_idle_connections(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'pool.db'), pool_size=1)
+    db.init_database()
+    db.release_connection()
+    held = [db.get_connection()]
+    barrier = threading.Barrier(2)
+
+    def hold():
+        held.append(db.get_connection())
+        barrier.wait()
+        db.release_connection()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    barrier.wait()
+    thread.join()
+    db.release_connection()
+
+    assert held[0] is not held[1]
+    assert db._pool.qsize() == 1
@@ -0,0 +1,85 @@
+"""Batch publish per akun lewat AutomationWorkerPool + PublishScheduler"""
+
+import pytest
+
+from services.job_queue import AutomationWorkerPool
+from services.scheduler import DEFAULT_ACCOUNT_LIMITS, DEFAULT_PLATFORM_LIMITS, PublishScheduler
+
+
+class RecordingBot:
+    """Bot palsu: mencatat setiap panggilan publish_posts dan selalu berhasil"""
+
+    def __init__(self):
+        self.calls = []
+
+    def publish_posts(self, posts, account=None, site=None, tabs=1):
+        self.calls.append([post['id'] for post in posts])
+        return [{'success': True, 'message': 'Published'} for _ in posts]
+
+
+def queue_account_posts(db, count: int, platform: str = 'twitter'):
+    account_id = db.add_account(platform, 'user', 'user@example.com', 'secret')['account_id']
+    post_ids = db.add_posts_bulk([
+        {'platform': platform, 'account_id': account_id, 'status': 'pending',
+         'content': f'Queued post number {index} ' + 'x' * index}
+        for index in range(count)
+    ])['post_ids']
+    db.create_automation_job(post_ids)
+    return post_ids
+
+
+def run_once(pool: AutomationWorkerPool, bot, worker_id: str = 'worker-1'):
+    tasks = pool.db_manager.lease_job_tasks(worker_id, limit=1, lease_seconds=60)
+    for task in tasks:
+        pool._process_task(bot, worker_id, task)
+    return tasks
+
+
+def task_statuses(db):
+    return [row[0] for row in db.get_connection().execute('SELECT status FROM job_tasks ORDER BY id')]
+
+
+def test_same_account_tasks_share_one_session(db):
+    batch_size = 10
+    # Batch dibatasi burst platform; token akun dibayar sekali per session, bukan per post
+    assert DEFAULT_PLATFORM_LIMITS['twitter']['burst'] >= batch_size > DEFAULT_ACCOUNT_LIMITS['burst']
+    post_ids = queue_account_posts(db, batch_size)
+    pool = AutomationWorkerPool(db, bot_factory=RecordingBot, scheduler=PublishScheduler(db), batch_size=batch_size)
+    bot = RecordingBot()
+
+    run_once(pool, bot)
+
+    assert bot.calls == [post_ids]
+    assert task_statuses(db) == ['done'] * batch_size
+
+
+def test_pending_posts_are_claimed_once(db):
+    post_ids = queue_account_posts(db, 3)
+
+    again = db.create_automation_job(post_ids)
+    everything = db.create_automation_job()
+
+    assert again['job_id'] is None and everything['job_id'] is None
+    assert task_statuses(db) == ['queued'] * 3
+    assert db.has_open_job_tasks()
+
+
+def test_account_token_is_charged_once_per_session(db):
+    scheduler = PublishScheduler(db)
+    post = {'platform': 'twitter', 'account_id': 1}
+    slot = scheduler.try_acquire(post)
+
+    assert all(scheduler.try_extend(slot) for _ in range(5))
+    account_bucket = scheduler._target_buckets[('account', 1)]
+    assert account_bucket.tokens == pytest.approx(DEFAULT_ACCOUNT_LIMITS['burst'] - 1, abs=0.01)
+
+
+def test_batch_stops_at_batch_size(db):
+    post_ids = queue_account_posts(db, 6)
+    pool = AutomationWorkerPool(db, bot_factory=RecordingBot, scheduler=PublishScheduler(db), batch_size=4)
+    bot = RecordingBot()
+
+    run_once(pool, bot)
+
+    assert bot.calls == [post_ids[:4]]
+    assert task_statuses(db) == ['done'] * 4 + ['queued'] * 2
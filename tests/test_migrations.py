@@ -0,0 +1,137 @@
+"""Schema migrations (PRAGMA user_version) dan index untuk query yang sering dipanggil"""
+
+import sqlite3
+
+import pytest
+
+from database.db_manager import SCHEMA_MIGRATIONS, DatabaseManager, encode_cursor
+
+LATEST_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+
+def user_version(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def query_plans(db: DatabaseManager, method, **kwargs) -> list:
+    """EXPLAIN QUERY PLAN untuk setiap SELECT yang benar-benar dijalankan oleh method"""
+    conn = db.get_connection()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        method(**kwargs)
+    finally:
+        conn.set_trace_callback(None)
+    selects = [sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]
+    assert selects, f'{method.__name__} did not run a SELECT'
+    return [
+        '\n'.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}'))
+        for sql in selects
+    ]
+
+
+# Tabel ringkasan kecil (satu baris per platform + status) boleh di-scan penuh
+SUMMARY_TABLES = ('post_stats',)
+
+
+def full_scans(plan: str) -> list:
+    """Baris plan yang membaca seluruh tabel tanpa index"""
+    return [
+        line for line in plan.splitlines()
+        if line.startswith('SCAN') and 'USING' not in line and line.split()[1] not in SUMMARY_TABLES
+    ]
+
+
+def test_versions_are_increasing():
+    versions = [version for version, _ in SCHEMA_MIGRATIONS]
+    assert versions == sorted(set(versions))
+    assert versions[0] == 1
+
+
+def test_init_database_applies_all_migrations(db):
+    assert user_version(db.db_path) == LATEST_VERSION
+
+    conn = db.get_connection()
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {
+        'idx_posts_created_at', 'idx_posts_status_created_at', 'idx_scraped_content_scraped_at',
+        'idx_social_accounts_created_at', 'idx_job_tasks_status'
+    } <= indexes
+
+
+def test_init_database_is_idempotent(db):
+    db.init_database()
+    assert user_version(db.db_path) == LATEST_VERSION
+
+
+def test_migrates_database_from_older_version(tmp_path, monkeypatch):
+    path = str(tmp_path / 'old.db')
+    manager = DatabaseManager(path)
+    # Database dari sebelum fingerprint (versi 9) ada, dengan satu post lama
+    monkeypatch.setattr('database.db_manager.SCHEMA_MIGRATIONS', SCHEMA_MIGRATIONS[:8])
+    monkeypatch.setattr(manager, 'backfill_fingerprints', lambda: 0)
+    manager.init_database()
+    conn = manager.get_connection()
+    conn.execute("INSERT INTO posts (platform, content) VALUES ('twitter', 'Old post before fingerprints')")
+    conn.commit()
+    assert user_version(path) == 8
+
+    monkeypatch.undo()
+    manager.init_database()
+
+    assert user_version(path) == LATEST_VERSION
+    row = manager.get_connection().execute('SELECT content_hash, simhash FROM posts').fetchone()
+    assert row['content_hash'] and row['simhash'] is not None
+    manager.close_connection()
+
+
+@pytest.mark.parametrize('method, index', [
+    ('get_all_posts', 'idx_posts_created_at'),
+    ('get_content', 'idx_scraped_content_scraped_at'),
+    ('get_all_accounts', 'idx_social_accounts_created_at'),
+])
+@pytest.mark.parametrize('cursor', [None, encode_cursor('2024-01-01T00:00:00', 100)])
+def test_listing_queries_use_index(db, method, index, cursor):
+    plan = query_plans(db, getattr(db, method), limit=50, cursor=cursor)[0]
+
+    # Urutan dari index, bukan full scan + sort
+    assert f'USING INDEX {index}' in plan
+    assert 'TEMP B-TREE' not in plan
+    if cursor:
+        assert plan.splitlines()[0].startswith('SEARCH')
+
+
+def test_guest_sites_listing_uses_index(db):
+    plan = query_plans(db, db.get_guest_sites)[0]
+    assert 'USING INDEX idx_guest_sites_created_at' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_posts_by_status_uses_status_index(db):
+    plan = query_plans(db, db.get_posts_by_status, status='draft')[0]
+    assert 'USING INDEX idx_posts_status_created_at' in plan
+
+
+def test_dashboard_stats_do_not_scan_tables(db):
+    plans = query_plans(db, db.get_dashboard_stats)
+    for plan in plans:
+        assert not full_scans(plan), plan
+    # Counter dashboard dibaca dari post_stats, bukan dihitung ulang dari posts
+    assert not any(' posts ' in f'{line} ' for plan in plans for line in plan.splitlines())
+
+
+@pytest.mark.parametrize('cursor', [None, encode_cursor([-1.5, 'post'], 3)])
+def test_search_uses_fts_index(db, cursor):
+    plans = query_plans(db, db.search_content, query='hello wor', limit=20, cursor=cursor)
+    # Statement internal FTS5 (tabel *_config) ikut ter-trace; yang dicek hanya query search
+    plan = next(plan for plan in plans if 'VIRTUAL TABLE' in plan)
+
+    assert 'SCAN scraped_content_fts VIRTUAL TABLE INDEX' in plan
+    assert 'SCAN posts_fts VIRTUAL TABLE INDEX' in plan
+    # Baris asli diambil per rowid hasil MATCH, bukan dengan scan scraped_content / posts
+    assert 'SEARCH sc USING INTEGER PRIMARY KEY' in plan
+    assert 'SEARCH p USING INTEGER PRIMARY KEY' in plan
@@ -0,0 +1,37 @@
+"""extract_content dengan ContentStrainer harus sama dengan parse seluruh dokumen"""
+
+import pytest
+
+pytest.importorskip('requests')
+pytest.importorskip('bs4')
+
+from services.scraper import extract_content  # noqa: E402
+
+BODY = '<p>First <a href="/x">paragraph</a> with <em>markup</em>.</p><p>Second paragraph.</p><script>track();</script>'
+PAGE = (
+    '<html><head><title>{title} | Blog</title><script src="/app.js"></script></head>'
+    '<body><nav><ul><li><a href="/">Home</a></li></ul></nav>{layout}'
+    '<aside class="sidebar"><p>Sidebar text</p></aside><footer><p>Footer</p></footer></body></html>'
+)
+LAYOUTS = [
+    '<article class="post"><h1>{title}</h1><div class="entry-content">{body}</div></article>',
+    '<main><h1>{title}</h1><div class="post-content">{body}</div></main>',
+    # Content hanya di div dengan class content, di luar article/main
+    '<div class="container"><h1>{title}</h1><div class="entry-content">{body}</div></div>',
+    '<div id="page"><section class="article-content"><h2>{title}</h2>{body}</section></div>',
+    '<div class="layout"><div class="text">{body}</div></div>',
+]
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+@pytest.mark.parametrize('parser', ['html.parser', 'lxml'])
+def test_strained_extraction_matches_full_document(layout, parser):
+    if parser == 'lxml':
+        pytest.importorskip('lxml')
+    html = PAGE.format(title='Post title', layout=layout.format(title='Post title', body=BODY)).encode('utf-8')
+
+    full = extract_content(html, 'https://example.com/post', parser, strained=False)
+    strained = extract_content(html, 'https://example.com/post', parser, strained=True)
+
+    assert (strained['title'], strained['content']) == (full['title'], full['content'])
+    assert full['content']